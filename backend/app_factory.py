@@ -0,0 +1,117 @@
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from pymongo.errors import PyMongoError
+
+import importlib
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional
+import logging
+
+import database
+from middleware import CompressionMiddleware, CustomJSONResponse, IdempotencyMiddleware, LoadSheddingMiddleware, RequestActorMiddleware, compression_stats, idempotency_stats, load_stats
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Domain routers, in mount order. Order matters where paths overlap, so it
+# follows the order the routes were originally declared in.
+ROUTERS = {
+    "system": "routers.system",
+    "networking": "routers.networking",
+    "feed": "routers.feed",
+    "jobs": "routers.jobs",
+    "crowdfunding": "routers.crowdfunding",
+    "civic": "routers.civic",
+    "learning": "routers.learning",
+    "messaging": "routers.messaging",
+    "notifications": "routers.notifications",
+}
+
+# The Mongo client lives exactly as long as the app: created before the first
+# request is accepted and closed (returning its pooled sockets) on shutdown.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.connect()
+    
+    from caching import organization_directory
+    from notifications import notification_dispatcher
+    from outbox import outbox_worker
+    from read_models import rebuild_connection_counts, rebuild_course_catalog, rebuild_endorsement_counts, rebuild_mentor_index
+    from scheduler import deadline_scheduler
+    
+    database.ensure_indexes()
+    organization_directory.load()
+    deadline_scheduler.start()
+    notification_dispatcher.start()
+    
+    # Backfill the course catalog read model on first deploy
+    if database.course_catalog_collection.estimated_document_count() == 0 and database.courses_collection.estimated_document_count() > 0:
+        rebuild_course_catalog()
+    
+    if database.mentor_index_collection.estimated_document_count() == 0 and database.users_collection.estimated_document_count() > 0:
+        rebuild_mentor_index()
+    
+    if database.endorsement_counts_collection.estimated_document_count() == 0 and database.endorsements_collection.estimated_document_count() > 0:
+        rebuild_endorsement_counts()
+    
+    if database.users_collection.find_one({"connection_count": {"$exists": False}}, {"_id": 1}):
+        rebuild_connection_counts()
+    
+    # After the backfills, so a first-run projector rebuild sees complete data
+    outbox_worker.start()
+    
+    try:
+        yield
+    finally:
+        await deadline_scheduler.stop()
+        await notification_dispatcher.stop()
+        await outbox_worker.stop()
+        database.close()
+
+# Routers are imported here rather than at module level, so tests and tools can
+# build an app with only the domains they exercise and skip importing the rest.
+def create_app(domains: Optional[Iterable[str]] = None) -> FastAPI:
+    domains = list(ROUTERS) if domains is None else [domain for domain in ROUTERS if domain in set(domains)]
+    
+    app = FastAPI(
+        title="AfriCore - Pan-African Youth Network, Employment & Funding Platform",
+        default_response_class=CustomJSONResponse,
+        lifespan=lifespan
+    )
+    
+    # Request actor slot for read-your-own-writes (innermost, so every endpoint sees it)
+    app.add_middleware(RequestActorMiddleware)
+    
+    # Idempotency keys (inside load shedding, so shed requests never claim a key)
+    app.add_middleware(IdempotencyMiddleware, stats=idempotency_stats)
+    
+    # Load shedding middleware (inside CORS so rejections still carry CORS headers)
+    app.add_middleware(LoadSheddingMiddleware, stats=load_stats)
+    
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    
+    # Compression middleware
+    app.add_middleware(CompressionMiddleware, stats=compression_stats)
+    
+    # Database errors
+    @app.exception_handler(PyMongoError)
+    async def database_error_handler(request: Request, exc: PyMongoError):
+        if exc.timeout:
+            load_stats["deadline_exceeded"] += 1
+            return CustomJSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+        
+        logger.error(f"Database error on {request.url.path}: {exc}")
+        return CustomJSONResponse(status_code=500, content={"detail": "Database error"})
+    
+    for domain in domains:
+        app.include_router(importlib.import_module(ROUTERS[domain]).router)
+    
+    return app
@@ -0,0 +1,181 @@
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pymongo import ReturnDocument
+from passlib.context import CryptContext
+from jose import JWTError, jwt
+
+from datetime import datetime, timedelta
+import hmac
+import ipaddress
+import math
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from config import ALGORITHM, METRICS_TOKEN, RATE_LIMITS, RATE_LIMIT_BACKEND, SECRET_KEY, TRUSTED_PROXIES
+from database import rate_limits_collection, request_actor, users_collection
+
+# Security
+security = HTTPBearer()
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Auth functions
+def verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+def get_password_hash(password):
+    return pwd_context.hash(password)
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.utcnow() + expires_delta
+    else:
+        expire = datetime.utcnow() + timedelta(minutes=15)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: str = payload.get("sub")
+        if user_id is None:
+            raise credentials_exception
+    except JWTError:
+        raise credentials_exception
+    
+    user = users_collection.find_one({"user_id": user_id})
+    if user is None:
+        raise credentials_exception
+    
+    # Attribute this request's writes to the user for read-your-own-writes
+    actor = request_actor.get()
+    if actor is not None:
+        actor["user_id"] = user_id
+    return user
+
+# Internal endpoints
+# Answers 404 rather than 401/403 so the endpoint is not advertised to callers
+# without the token
+def require_metrics_token(request: Request):
+    token = request.headers.get("x-metrics-token", "")
+    if not METRICS_TOKEN or not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+# Rate limiting
+# Token buckets keyed by route class and caller (user id from the bearer token,
+# otherwise client IP). The in-memory backend is per worker; the Mongo backend
+# shares buckets across workers with one atomic pipeline update per request.
+class InMemoryRateLimitBackend:
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self.buckets = OrderedDict()
+    
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+        
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / refill_per_second
+        
+        self.buckets[key] = (tokens, now)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+class MongoRateLimitBackend:
+    def __init__(self, collection):
+        self.collection = collection
+    
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.time()
+        bucket = self.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [capacity, {"$add": [
+                        {"$ifNull": ["$tokens", capacity]},
+                        {"$multiply": [{"$max": [0, {"$subtract": [now, {"$ifNull": ["$updated_at", now]}]}]}, refill_per_second]}
+                    ]}]},
+                    "updated_at": now
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                    # A full refill makes the bucket indistinguishable from a new one
+                    "expires_at": datetime.utcnow() + timedelta(seconds=capacity / refill_per_second)
+                }}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / refill_per_second
+
+def parse_rate_limit(limit: str):
+    burst, seconds = limit.split("/")
+    return int(burst), int(burst) / float(seconds)
+
+rate_limiter = MongoRateLimitBackend(rate_limits_collection) if RATE_LIMIT_BACKEND == "mongo" else InMemoryRateLimitBackend()
+rate_limit_rules = {route_class: parse_rate_limit(limit) for route_class, limit in RATE_LIMITS.items()}
+
+trusted_proxy_networks = [ipaddress.ip_network(proxy, strict=False) for proxy in TRUSTED_PROXIES]
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxy_networks)
+
+# X-Forwarded-For is written by the client first and appended to by each proxy,
+# so only the hops added by our own proxies can be believed: walk it from the
+# right and take the first address that is not one of them. A request that did
+# not come through a trusted proxy is keyed on its peer address.
+def client_address(request: Request) -> str:
+    peer = request.client.host if request.client else "unknown"
+    if not is_trusted_proxy(peer):
+        return peer
+    
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+def caller_identity(request: Request) -> str:
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            user_id = jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+            if user_id:
+                return f"user:{user_id}"
+        except JWTError:
+            pass
+    
+    return f"ip:{client_address(request)}"
+
+def rate_limit(route_class: str):
+    capacity, refill_per_second = rate_limit_rules[route_class]
+    
+    async def check_rate_limit(request: Request):
+        retry_after = rate_limiter.take(f"{route_class}:{caller_identity(request)}", capacity, refill_per_second)
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+    
+    return check_rate_limit
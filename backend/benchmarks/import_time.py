@@ -0,0 +1,46 @@
+# Import-time benchmark
+# Measures cold import/app construction time in fresh interpreters, the cost
+# paid by every uvicorn worker spawn and every test session.
+#
+#   cd backend && python benchmarks/import_time.py [--runs 10]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import models": "import models",
+    "import app_factory": "import app_factory",
+    "create_app()": "import app_factory; app_factory.create_app()",
+    "import server": "import server",
+}
+for domain in ["networking", "feed", "jobs", "crowdfunding", "civic", "learning", "messaging", "notifications"]:
+    SCENARIOS[f"create_app(['{domain}'])"] = f"import app_factory; app_factory.create_app(['{domain}'])"
+
+TIMER = "import time; started = time.perf_counter(); {code}; print(time.perf_counter() - started)"
+
+def measure(code: str, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", TIMER.format(code=code)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    
+    print(f"{'scenario':<32} {'median ms':>10} {'min ms':>10} {'max ms':>10}")
+    for name, code in SCENARIOS.items():
+        timings = measure(code, args.runs)
+        print(f"{name:<32} {statistics.median(timings):>10.1f} {min(timings):>10.1f} {max(timings):>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Transaction cost benchmark
+# Replays the contribute write path (insert a contribution, then bump the
+# project's totals) against a scratch database, with and without a transaction,
+# across concurrent threads. "hot" sends every write to one project, which is
+# where transactions hit write conflicts and with_transaction retries;
+# "spread" spreads writes over many projects. Needs a replica set.
+#
+#   cd backend && MONGO_URL=mongodb://localhost:27017/?replicaSet=rs0 \
+#       python benchmarks/transactions.py [--ops 2000] [--threads 16]
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo import MongoClient
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
+
+PROJECT_COUNT = 1000
+
+def contribute(db, project_id: str, session=None):
+    db.contributions.insert_one({
+        "contribution_id": str(uuid.uuid4()),
+        "project_id": project_id,
+        "amount": 10.0
+    }, session=session)
+    db.projects.update_one(
+        {"project_id": project_id},
+        {"$inc": {"current_funding": 10.0, "contributor_count": 1}},
+        session=session
+    )
+
+def contribute_in_transaction(client, db, project_id: str):
+    with client.start_session() as session:
+        session.with_transaction(
+            lambda session: contribute(db, project_id, session),
+            read_concern=ReadConcern("snapshot"),
+            write_concern=WriteConcern("majority")
+        )
+
+def run(client, db, mode: str, placement: str, ops: int, threads: int) -> dict:
+    db.contributions.delete_many({})
+    db.projects.update_many({}, {"$set": {"current_funding": 0.0, "contributor_count": 0}})
+    
+    def one(_):
+        project_id = "project-0" if placement == "hot" else f"project-{random.randrange(PROJECT_COUNT)}"
+        started = time.perf_counter()
+        if mode == "transaction":
+            contribute_in_transaction(client, db, project_id)
+        else:
+            contribute(db, project_id)
+        return (time.perf_counter() - started) * 1000
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = sorted(executor.map(one, range(ops)))
+    elapsed = time.perf_counter() - started
+    
+    # Totals must match the contributions written, in every mode
+    funded = sum(project.get("contributor_count", 0) for project in db.projects.find({}, {"contributor_count": 1}))
+    assert funded == db.contributions.count_documents({}) == ops
+    
+    return {
+        "ops_per_second": ops / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1]
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+    
+    client = MongoClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017/?replicaSet=rs0"), w="majority")
+    db = client.africore_benchmark
+    db.projects.drop()
+    db.contributions.drop()
+    db.projects.create_index("project_id", unique=True)
+    db.projects.insert_many([{"project_id": f"project-{i}"} for i in range(PROJECT_COUNT)])
+    
+    print(f"{'mode':<12} {'placement':<8} {'ops/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for placement in ["spread", "hot"]:
+        for mode in ["plain", "transaction"]:
+            result = run(client, db, mode, placement, args.ops, args.threads)
+            print(f"{mode:<12} {placement:<8} {result['ops_per_second']:>10.0f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}")
+    
+    client.drop_database("africore_benchmark")
+
+if __name__ == "__main__":
+    main()
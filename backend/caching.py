@@ -0,0 +1,190 @@
+from fastapi import Request
+from fastapi.responses import Response
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional
+import logging
+
+from config import ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL_SECONDS, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS
+from database import courses_collection, jobs_collection, organizations_collection, policies_collection, projects_collection
+from middleware import CustomJSONResponse, decoded_etag
+
+logger = logging.getLogger(__name__)
+
+# Response cache
+# LRU of rendered JSON bodies with strong ETags. Entries are tagged with the
+# entities they were built from and dropped by the write endpoints touching
+# those entities; the TTL bounds staleness from indirect changes (e.g. a
+# creator renaming themselves) and from writes handled by other workers.
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.tags = {}
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(request: Request, user_id: Optional[str] = None) -> tuple:
+        return (request.url.path, tuple(sorted(request.query_params.multi_items())), user_id)
+    
+    def lookup(self, request: Request, key: tuple) -> Optional[Response]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        etag, body, expires_at, tags, private = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return self._respond(request, etag, body, private)
+    
+    def store(self, request: Request, key: tuple, content: Any, tags: List[str], private: bool = False) -> Response:
+        body = CustomJSONResponse(content).body
+        etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        
+        self._remove(key)
+        self.entries[key] = (etag, body, time.monotonic() + self.ttl_seconds, tags, private)
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+        
+        return self._respond(request, etag, body, private)
+    
+    def invalidate(self, *tags: str):
+        for tag in tags:
+            for key in self.tags.pop(tag, set()):
+                self._remove(key)
+    
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+    
+    def _remove(self, key: tuple):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[3]:
+            keys = self.tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag]
+    
+    @staticmethod
+    def _respond(request: Request, etag: str, body: bytes, private: bool) -> Response:
+        # Responses to authenticated requests must stay out of shared caches
+        # even when the body is the same for every caller (get_job, get_project)
+        private = private or "authorization" in request.headers
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache" if private else "public, no-cache"
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        # Clients revalidate with the tag they were sent, which may carry the
+        # compression suffix; the 304 echoes that tag back
+        matched = next(
+            (tag.strip() for tag in if_none_match.split(",") if decoded_etag(tag.strip().removeprefix("W/")) == etag),
+            None
+        )
+        if if_none_match.strip() == "*" or matched:
+            return Response(status_code=304, headers={**headers, "ETag": matched or etag})
+        return Response(content=body, media_type="application/json", headers=headers)
+
+response_cache = ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS)
+
+# Entity cache
+# Bounded, TTL'd cache of parent documents fetched by id. Callers get a shallow
+# copy, so they must not mutate nested lists/dicts in place.
+class EntityCache:
+    def __init__(self, name: str, collection, id_field: str, max_entries: int, ttl_seconds: int):
+        self.name = name
+        self.collection = collection
+        self.id_field = id_field
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, entity_id: str) -> Optional[dict]:
+        entry = self.entries.get(entity_id)
+        if entry is not None and entry[1] >= time.monotonic():
+            self.entries.move_to_end(entity_id)
+            self.hits += 1
+            return dict(entry[0])
+        
+        self.misses += 1
+        doc = self.collection.find_one({self.id_field: entity_id})
+        if doc is None:
+            self.entries.pop(entity_id, None)
+            return None
+        
+        self.entries[entity_id] = (doc, time.monotonic() + self.ttl_seconds)
+        self.entries.move_to_end(entity_id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return dict(doc)
+    
+    def invalidate(self, entity_id: str):
+        self.entries.pop(entity_id, None)
+    
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+job_cache = EntityCache("job", jobs_collection, "job_id", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL_SECONDS)
+project_cache = EntityCache("project", projects_collection, "project_id", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL_SECONDS)
+policy_cache = EntityCache("policy", policies_collection, "policy_id", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL_SECONDS)
+course_cache = EntityCache("course", courses_collection, "course_id", ENTITY_CACHE_SIZE, ENTITY_CACHE_TTL_SECONDS)
+entity_caches = {cache.name: cache for cache in [job_cache, project_cache, policy_cache, course_cache]}
+
+# Organization directory
+# Organizations are few and nearly static, so every worker keeps all of them in
+# memory. Entries registered by another worker are picked up on first miss.
+class OrganizationDirectory:
+    def __init__(self):
+        self.by_id = {}
+        self.by_owner = {}
+    
+    def load(self):
+        self.by_id = {}
+        self.by_owner = {}
+        for org in organizations_collection.find({}, {"_id": 0}):
+            self.add(org)
+        logger.info(f"Loaded {len(self.by_id)} organizations into the directory")
+    
+    def add(self, org: dict):
+        self.by_id[org["organization_id"]] = org
+        # Owners act through their first registered organization
+        self.by_owner.setdefault(org["owner_id"], org)
+    
+    def get(self, organization_id: str) -> Optional[dict]:
+        org = self.by_id.get(organization_id)
+        if org is None:
+            org = organizations_collection.find_one({"organization_id": organization_id}, {"_id": 0})
+            if org:
+                self.add(org)
+        return org
+    
+    def get_by_owner(self, owner_id: str) -> Optional[dict]:
+        org = self.by_owner.get(owner_id)
+        if org is None:
+            org = organizations_collection.find_one({"owner_id": owner_id}, {"_id": 0})
+            if org:
+                self.add(org)
+        return org
+
+organization_directory = OrganizationDirectory()
+
+def invalidate_entity(kind: str, entity_id: str):
+    # Every write path calls this so cached documents and rendered responses go together
+    entity_caches[kind].invalidate(entity_id)
+    response_cache.invalidate(f"{kind}:{entity_id}")
@@ -0,0 +1,65 @@
+import os
+
+# JWT settings
+SECRET_KEY = "your-secret-key-change-in-production"
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+# Certificate signing
+CERTIFICATE_SIGNING_KEY = os.environ.get("CERTIFICATE_SIGNING_KEY", SECRET_KEY)
+CERTIFICATE_CACHE_SIZE = int(os.environ.get("CERTIFICATE_CACHE_SIZE", "100000"))
+
+# Metrics
+# Token internal scrapers send in X-Metrics-Token; /api/metrics is disabled while unset
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Response cache
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "5000"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "60"))
+
+# Entity cache
+ENTITY_CACHE_SIZE = int(os.environ.get("ENTITY_CACHE_SIZE", "10000"))
+ENTITY_CACHE_TTL_SECONDS = int(os.environ.get("ENTITY_CACHE_TTL_SECONDS", "30"))
+
+# Deadline scheduler
+DEADLINE_BATCH_SIZE = int(os.environ.get("DEADLINE_BATCH_SIZE", "500"))
+DEADLINE_MAX_SLEEP_SECONDS = int(os.environ.get("DEADLINE_MAX_SLEEP_SECONDS", "60"))
+DEADLINE_RELOAD_SECONDS = int(os.environ.get("DEADLINE_RELOAD_SECONDS", "900"))
+
+# Rate limiting
+RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+# Comma-separated proxy addresses or CIDR ranges whose X-Forwarded-For is trusted
+TRUSTED_PROXIES = [proxy.strip() for proxy in os.environ.get("TRUSTED_PROXIES", "").split(",") if proxy.strip()]
+# Route class -> "burst/seconds": a bucket of `burst` tokens refilled over `seconds`
+RATE_LIMITS = {
+    route_class: os.environ.get(f"RATE_LIMIT_{route_class.upper()}", default)
+    for route_class, default in {
+        "auth": "10/60",
+        "search": "60/60",
+        "messaging": "60/60",
+        "bulk": "10/60"
+    }.items()
+}
+
+# Mentorship
+MENTOR_CAPACITY = int(os.environ.get("MENTOR_CAPACITY", "5"))
+
+# Activity feed
+FEED_TIMELINE_SIZE = int(os.environ.get("FEED_TIMELINE_SIZE", "500"))
+FEED_FANOUT_LIMIT = int(os.environ.get("FEED_FANOUT_LIMIT", "1000"))
+FEED_FANOUT_BATCH_SIZE = int(os.environ.get("FEED_FANOUT_BATCH_SIZE", "500"))
+
+# Notifications
+NOTIFICATION_BATCH_SIZE = int(os.environ.get("NOTIFICATION_BATCH_SIZE", "1000"))
+NOTIFICATION_DISPATCH_INTERVAL_SECONDS = float(os.environ.get("NOTIFICATION_DISPATCH_INTERVAL_SECONDS", "5"))
+NOTIFICATION_CLAIM_TIMEOUT_SECONDS = int(os.environ.get("NOTIFICATION_CLAIM_TIMEOUT_SECONDS", "300"))
+NOTIFICATION_DIGEST_THRESHOLD = int(os.environ.get("NOTIFICATION_DIGEST_THRESHOLD", "20"))
+NOTIFICATION_DIGEST_SAMPLE_SIZE = int(os.environ.get("NOTIFICATION_DIGEST_SAMPLE_SIZE", "5"))
+
+# Outbox
+OUTBOX_BATCH_SIZE = int(os.environ.get("OUTBOX_BATCH_SIZE", "500"))
+OUTBOX_POLL_INTERVAL_SECONDS = float(os.environ.get("OUTBOX_POLL_INTERVAL_SECONDS", "2"))
+OUTBOX_GAP_TIMEOUT_SECONDS = int(os.environ.get("OUTBOX_GAP_TIMEOUT_SECONDS", "10"))
+OUTBOX_LEASE_SECONDS = int(os.environ.get("OUTBOX_LEASE_SECONDS", "30"))
+OUTBOX_RETENTION_DAYS = int(os.environ.get("OUTBOX_RETENTION_DAYS", "7"))
+OUTBOX_CHANGE_STREAMS = os.environ.get("OUTBOX_CHANGE_STREAMS", "true").lower() == "true"
@@ -0,0 +1,483 @@
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from pymongo.monitoring import CommandListener, ConnectionPoolListener
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+from pymongo.write_concern import WriteConcern
+
+import os
+import time
+from datetime import datetime, timedelta
+import threading
+from contextvars import ContextVar
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# MongoDB connection
+# The client is created by the app lifespan rather than at import time, so
+# importing the app or a router never blocks on (or requires) a reachable
+# server. Collections are proxies resolved against the live database on first
+# use, which also covers scripts that touch them without running the app.
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
+
+# Client tuning, sized per worker: every uvicorn worker holds its own pool of
+# up to MONGO_MAX_POOL_SIZE connections. MONGO_MAX_CONNECTING caps how many new
+# connections a pool opens at once, which keeps a deploy from stampeding the
+# server; MONGO_MIN_POOL_SIZE keeps a warm floor so traffic after a restart does
+# not pay for connection setup. zstd and snappy compression need the optional
+# zstandard / python-snappy packages and are skipped by the driver without them.
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_CONNECTING = int(os.environ.get("MONGO_MAX_CONNECTING", "2"))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.environ.get("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+MONGO_COMPRESSORS = os.environ.get("MONGO_COMPRESSORS", "")
+MONGO_READ_PREFERENCE = os.environ.get("MONGO_READ_PREFERENCE", "primary")
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxConnecting": MONGO_MAX_CONNECTING,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_SOCKET_TIMEOUT_MS,
+        "readPreference": MONGO_READ_PREFERENCE,
+        "event_listeners": [pool_metrics, causal_tokens],
+    }
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+# Connection pool metrics
+# Fed by the driver's CMAP events. Wait time is measured from check-out start to
+# checked-out on the requesting thread, so a growing average with utilization
+# near 1.0 means the pool is too small for the worker's concurrency.
+class PoolMetrics(ConnectionPoolListener):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkout_started = threading.local()
+        self.pools = {}
+    
+    def pool(self, address) -> dict:
+        key = f"{address[0]}:{address[1]}"
+        if key not in self.pools:
+            self.pools[key] = {
+                "open": 0,
+                "checked_out": 0,
+                "checkouts": 0,
+                "checkout_failures": {},
+                "checkout_wait_ms_total": 0.0,
+                "checkout_wait_ms_max": 0.0,
+                "cleared": 0
+            }
+        return self.pools[key]
+    
+    def pool_created(self, event):
+        with self.lock:
+            self.pool(event.address)
+    
+    def pool_ready(self, event):
+        pass
+    
+    def pool_cleared(self, event):
+        with self.lock:
+            self.pool(event.address)["cleared"] += 1
+    
+    def pool_closed(self, event):
+        with self.lock:
+            self.pools.pop(f"{event.address[0]}:{event.address[1]}", None)
+    
+    def connection_created(self, event):
+        with self.lock:
+            self.pool(event.address)["open"] += 1
+    
+    def connection_ready(self, event):
+        pass
+    
+    def connection_closed(self, event):
+        with self.lock:
+            self.pool(event.address)["open"] -= 1
+    
+    def connection_check_out_started(self, event):
+        self.checkout_started.at = time.perf_counter()
+    
+    def connection_check_out_failed(self, event):
+        with self.lock:
+            failures = self.pool(event.address)["checkout_failures"]
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+    
+    def connection_checked_out(self, event):
+        started_at = getattr(self.checkout_started, "at", None)
+        wait_ms = (time.perf_counter() - started_at) * 1000 if started_at is not None else 0.0
+        with self.lock:
+            pool = self.pool(event.address)
+            pool["checked_out"] += 1
+            pool["checkouts"] += 1
+            pool["checkout_wait_ms_total"] += wait_ms
+            pool["checkout_wait_ms_max"] = max(pool["checkout_wait_ms_max"], wait_ms)
+    
+    def connection_checked_in(self, event):
+        with self.lock:
+            self.pool(event.address)["checked_out"] -= 1
+    
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                address: {
+                    **pool,
+                    "checkout_failures": dict(pool["checkout_failures"]),
+                    "checkout_wait_ms_total": round(pool["checkout_wait_ms_total"], 2),
+                    "checkout_wait_ms_max": round(pool["checkout_wait_ms_max"], 2),
+                    "checkout_wait_ms_avg": round(pool["checkout_wait_ms_total"] / pool["checkouts"], 2) if pool["checkouts"] else None,
+                    "max_pool_size": MONGO_MAX_POOL_SIZE,
+                    "utilization": round(pool["checked_out"] / MONGO_MAX_POOL_SIZE, 2)
+                }
+                for address, pool in self.pools.items()
+            }
+
+pool_metrics = PoolMetrics()
+
+# Read routing
+# List endpoints that tolerate slightly stale data can be served by secondaries,
+# configured per route with READ_PREFERENCE_<ROUTE> (e.g. secondaryPreferred)
+# and bounded by READ_MAX_STALENESS_SECONDS (the server minimum is 90). Writes
+# always go to the primary. So a user still reads their own writes, the
+# operationTime/$clusterTime of every write reply is remembered per acting user,
+# and that user's routed reads run in a causally consistent session advanced to
+# it: a lagging secondary then waits until it has applied the write.
+READ_ROUTES = ["jobs", "projects", "policies", "courses", "users"]
+READ_MAX_STALENESS_SECONDS = int(os.environ.get("READ_MAX_STALENESS_SECONDS", "90"))
+READ_PREFERENCE_CLASSES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest
+}
+WRITE_COMMANDS = {"insert", "update", "delete", "findAndModify", "commitTransaction"}
+
+def build_read_preference(mode: str):
+    if mode == "primary":
+        return Primary()
+    return READ_PREFERENCE_CLASSES[mode](max_staleness=READ_MAX_STALENESS_SECONDS)
+
+read_preferences = {
+    route: build_read_preference(os.environ.get(f"READ_PREFERENCE_{route.upper()}", MONGO_READ_PREFERENCE))
+    for route in READ_ROUTES
+}
+# With every route on the primary no read needs a causal token, so none are kept
+causal_reads_enabled = any(not isinstance(read_preference, Primary) for read_preference in read_preferences.values())
+
+# Per-request slot naming the acting user, set up by RequestActorMiddleware and
+# filled in by get_current_user
+request_actor = ContextVar("request_actor", default=None)
+
+# Latest write timestamps per user. The listener keeps the newest one a request
+# produced in its request_actor slot, and RequestActorMiddleware saves it to the
+# causal_tokens collection before the response starts, so the user's next read
+# finds it whichever worker serves it. Rows expire after the staleness bound:
+# secondaries further behind than that are no longer eligible for routed reads
+# anyway.
+class CausalTokens(CommandListener):
+    def started(self, event):
+        pass
+    
+    def failed(self, event):
+        pass
+    
+    def succeeded(self, event):
+        if not causal_reads_enabled or event.command_name not in WRITE_COMMANDS:
+            return
+        actor = request_actor.get()
+        if not actor or not actor.get("user_id"):
+            return
+        operation_time = event.reply.get("operationTime")
+        cluster_time = event.reply.get("$clusterTime")
+        if operation_time is None or cluster_time is None:
+            return
+        
+        existing = actor.get("causal_token")
+        if not existing or existing[0] < operation_time:
+            actor["causal_token"] = (operation_time, cluster_time)
+
+causal_tokens = CausalTokens()
+
+def save_causal_token(actor: dict):
+    token = actor.pop("causal_token", None)
+    # Dropping the user also keeps this write from being recorded in turn
+    user_id = actor.pop("user_id", None)
+    if not token or not user_id:
+        return
+    try:
+        causal_tokens_collection.update_one(
+            {"user_id": user_id, "operation_time": {"$lt": token[0]}},
+            {"$set": {
+                "operation_time": token[0],
+                "cluster_time": token[1],
+                "expires_at": datetime.utcnow() + timedelta(seconds=READ_MAX_STALENESS_SECONDS)
+            }},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # A newer write of this user is already saved
+        pass
+    except PyMongoError as e:
+        logger.warning(f"Could not save causal token for {user_id}: {e}")
+
+def load_causal_token(user_id: str):
+    try:
+        token = causal_tokens_collection.with_options(read_preference=Primary()).find_one(
+            {"user_id": user_id},
+            {"_id": 0, "operation_time": 1, "cluster_time": 1}
+        )
+    except PyMongoError as e:
+        logger.warning(f"Could not load causal token for {user_id}: {e}")
+        return None
+    return (token["operation_time"], token["cluster_time"]) if token else None
+
+# Routes the reads of one request: collection() applies the route's read
+# preference, and session is a causal session when the user has a recent write
+# (None otherwise, which pymongo treats as an implicit session).
+class RoutedReads:
+    def __init__(self, route: str, user_id: Optional[str] = None):
+        self.read_preference = read_preferences[route]
+        self.session = None
+        token = load_causal_token(user_id) if user_id and not isinstance(self.read_preference, Primary) else None
+        if token:
+            self.session = connect().client.start_session(causal_consistency=True)
+            self.session.advance_cluster_time(token[1])
+            self.session.advance_operation_time(token[0])
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        if self.session:
+            self.session.end_session()
+    
+    def collection(self, collection):
+        return collection.with_options(read_preference=self.read_preference)
+
+client = None
+db = None
+
+def connect():
+    global client, db
+    if client is None:
+        try:
+            logger.info(f"Connecting to MongoDB at: {MONGO_URL}")
+            client = MongoClient(MONGO_URL, **client_options())
+            db = client.africore
+            logger.info("MongoDB connected successfully")
+        except Exception as e:
+            logger.error(f"Failed to connect to MongoDB: {e}")
+            raise
+    return db
+
+def close():
+    global client, db, transactions_supported
+    if client is not None:
+        client.close()
+        client = None
+        db = None
+        transactions_supported = None
+        logger.info("MongoDB client closed")
+
+# Multi-document writes
+# run_in_transaction(callback) calls callback(session) inside a transaction,
+# retried as a whole on transient errors such as write conflicts, so callbacks
+# must not have side effects outside Mongo. Transactions need a replica set or
+# sharded cluster; against a standalone server (local development) the callback
+# runs once with session=None and the writes are applied without atomicity.
+transactions_supported = None
+
+def supports_transactions() -> bool:
+    global transactions_supported
+    if transactions_supported is None:
+        hello = connect().client.admin.command("hello")
+        transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+    return transactions_supported
+
+def run_in_transaction(callback):
+    if not supports_transactions():
+        return callback(None)
+    
+    with connect().client.start_session() as session:
+        return session.with_transaction(
+            callback,
+            read_concern=ReadConcern("snapshot"),
+            write_concern=WriteConcern("majority")
+        )
+
+class LazyCollection:
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __getattr__(self, attr):
+        return getattr(connect()[self.name], attr)
+    
+    def __repr__(self):
+        return f"LazyCollection({self.name!r})"
+
+users_collection = LazyCollection("users")
+connections_collection = LazyCollection("connections")
+messages_collection = LazyCollection("messages")
+organizations_collection = LazyCollection("organizations")
+jobs_collection = LazyCollection("jobs")
+applications_collection = LazyCollection("applications")
+endorsements_collection = LazyCollection("endorsements")
+projects_collection = LazyCollection("projects")
+contributions_collection = LazyCollection("contributions")
+project_updates_collection = LazyCollection("project_updates")
+project_comments_collection = LazyCollection("project_comments")
+policies_collection = LazyCollection("policies")
+policy_feedback_collection = LazyCollection("policy_feedback")
+policy_votes_collection = LazyCollection("policy_votes")
+civic_forums_collection = LazyCollection("civic_forums")
+forum_posts_collection = LazyCollection("forum_posts")
+civic_achievements_collection = LazyCollection("civic_achievements")
+participation_points_collection = LazyCollection("participation_points")
+courses_collection = LazyCollection("courses")
+course_modules_collection = LazyCollection("course_modules")
+course_lessons_collection = LazyCollection("course_lessons")
+enrollments_collection = LazyCollection("enrollments")
+certificates_collection = LazyCollection("certificates")
+mentorships_collection = LazyCollection("mentorships")
+learning_progress_collection = LazyCollection("learning_progress")
+course_reviews_collection = LazyCollection("course_reviews")
+skill_assessments_collection = LazyCollection("skill_assessments")
+rate_limits_collection = LazyCollection("rate_limits")
+course_catalog_collection = LazyCollection("course_catalog")
+mentor_index_collection = LazyCollection("mentor_index")
+endorsement_counts_collection = LazyCollection("endorsement_counts")
+idempotency_keys_collection = LazyCollection("idempotency_keys")
+activities_collection = LazyCollection("activities")
+feed_timelines_collection = LazyCollection("feed_timelines")
+notification_events_collection = LazyCollection("notification_events")
+notifications_collection = LazyCollection("notifications")
+notification_counters_collection = LazyCollection("notification_counters")
+outbox_collection = LazyCollection("outbox")
+outbox_checkpoints_collection = LazyCollection("outbox_checkpoints")
+counters_collection = LazyCollection("counters")
+leases_collection = LazyCollection("leases")
+causal_tokens_collection = LazyCollection("causal_tokens")
+
+# Indexes backing the hot read paths
+INDEXES = [
+    (course_catalog_collection, [("course_id", ASCENDING)], {"unique": True}),
+    (course_catalog_collection, [("status", ASCENDING), ("created_at", DESCENDING)], {}),
+    (course_catalog_collection, [("status", ASCENDING), ("category", ASCENDING), ("level", ASCENDING), ("created_at", DESCENDING)], {}),
+    (course_catalog_collection, [("instructor_id", ASCENDING)], {}),
+    (enrollments_collection, [("student_id", ASCENDING), ("course_id", ASCENDING)], {}),
+    (course_modules_collection, [("course_id", ASCENDING), ("order_index", ASCENDING)], {}),
+    (course_lessons_collection, [("module_id", ASCENDING), ("order_index", ASCENDING)], {}),
+    (course_lessons_collection, [("course_id", ASCENDING), ("lesson_id", ASCENDING)], {}),
+    (course_lessons_collection, [("course_id", ASCENDING), ("bit_index", ASCENDING)], {}),
+    (learning_progress_collection, [("enrollment_id", ASCENDING)], {"unique": True}),
+    (certificates_collection, [("certificate_id", ASCENDING)], {"unique": True}),
+    (certificates_collection, [("enrollment_id", ASCENDING)], {"unique": True}),
+    (certificates_collection, [("student_id", ASCENDING), ("issued_at", DESCENDING)], {}),
+    (mentor_index_collection, [("user_id", ASCENDING)], {"unique": True}),
+    (mentor_index_collection, [("skill_keys", ASCENDING), ("active_mentorships", ASCENDING)], {}),
+    (mentor_index_collection, [("language_keys", ASCENDING), ("active_mentorships", ASCENDING)], {}),
+    (mentor_index_collection, [("active_mentorships", ASCENDING), ("full_name", ASCENDING)], {}),
+    (mentorships_collection, [("mentor_id", ASCENDING), ("status", ASCENDING)], {}),
+    (endorsements_collection, [("user_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    (endorsements_collection, [("user_id", ASCENDING), ("skill", ASCENDING), ("created_at", DESCENDING)], {}),
+    (endorsement_counts_collection, [("user_id", ASCENDING), ("skill", ASCENDING)], {"unique": True}),
+    (endorsement_counts_collection, [("user_id", ASCENDING), ("count", DESCENDING)], {}),
+    (users_collection, [("user_id", ASCENDING)], {}),
+    (organizations_collection, [("owner_id", ASCENDING)], {}),
+    (jobs_collection, [("organization_id", ASCENDING)], {}),
+    (applications_collection, [("job_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    (applications_collection, [("job_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)], {}),
+    (applications_collection, [("application_id", ASCENDING)], {}),
+    (contributions_collection, [("project_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    (policy_feedback_collection, [("policy_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    (enrollments_collection, [("course_id", ASCENDING), ("enrolled_at", ASCENDING)], {}),
+    (jobs_collection, [("active", ASCENDING), ("deadline", ASCENDING)], {}),
+    (projects_collection, [("status", ASCENDING), ("deadline", ASCENDING)], {}),
+    (policies_collection, [("status", ASCENDING), ("feedback_deadline", ASCENDING)], {}),
+    # Looked up by the deadline scheduler to publish the outcomes of one expiry pass
+    (policies_collection, [("expiry_batch_id", ASCENDING)], {"sparse": True}),
+    (rate_limits_collection, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    # One row per natural key, so duplicate submissions fail on insert
+    (applications_collection, [("job_id", ASCENDING), ("applicant_id", ASCENDING)], {"unique": True}),
+    (enrollments_collection, [("course_id", ASCENDING), ("student_id", ASCENDING)], {"unique": True}),
+    (course_reviews_collection, [("course_id", ASCENDING), ("reviewer_id", ASCENDING)], {"unique": True}),
+    (policy_votes_collection, [("policy_id", ASCENDING), ("voter_id", ASCENDING)], {"unique": True}),
+    (endorsements_collection, [("endorser_id", ASCENDING), ("user_id", ASCENDING), ("skill", ASCENDING)], {"unique": True}),
+    (idempotency_keys_collection, [("key", ASCENDING), ("caller", ASCENDING), ("path", ASCENDING)], {"unique": True}),
+    (idempotency_keys_collection, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    (connections_collection, [("requester_id", ASCENDING), ("status", ASCENDING)], {}),
+    (connections_collection, [("target_id", ASCENDING), ("status", ASCENDING)], {}),
+    (activities_collection, [("activity_id", ASCENDING)], {"unique": True}),
+    (activities_collection, [("actor_id", ASCENDING), ("audience", ASCENDING), ("position", DESCENDING)], {}),
+    (feed_timelines_collection, [("user_id", ASCENDING)], {"unique": True}),
+    (notification_events_collection, [("event_id", ASCENDING)], {"unique": True}),
+    (notification_events_collection, [("status", ASCENDING), ("created_at", ASCENDING)], {}),
+    (notifications_collection, [("notification_id", ASCENDING)], {"unique": True}),
+    (notifications_collection, [("user_id", ASCENDING), ("updated_at", DESCENDING)], {}),
+    (notifications_collection, [("user_id", ASCENDING), ("read", ASCENDING), ("updated_at", DESCENDING)], {}),
+    # At most one open (unread) digest per user, which new events are folded into
+    (notifications_collection, [("user_id", ASCENDING), ("type", ASCENDING)], {"unique": True, "partialFilterExpression": {"type": "digest", "read": False}}),
+    (notification_counters_collection, [("user_id", ASCENDING)], {"unique": True}),
+    (outbox_collection, [("seq", ASCENDING)], {"unique": True, "partialFilterExpression": {"seq": {"$exists": True}}}),
+    (outbox_collection, [("pending", ASCENDING), ("_id", ASCENDING)], {"partialFilterExpression": {"pending": True}}),
+    (outbox_collection, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    (outbox_checkpoints_collection, [("projector", ASCENDING)], {"unique": True}),
+    (causal_tokens_collection, [("user_id", ASCENDING)], {"unique": True}),
+    (causal_tokens_collection, [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+]
+
+# Unique indexes are what stop duplicate applications, votes and so on (the
+# handlers no longer check first), so the app refuses to start without them.
+# A build fails when rows duplicated before the index existed are still there:
+# those have to be merged by hand, since counters were derived from them.
+def ensure_indexes():
+    for collection, keys, options in INDEXES:
+        try:
+            collection.create_index(keys, **options)
+        except PyMongoError as e:
+            if not options.get("unique"):
+                logger.warning(f"Could not create index {keys} on {collection.name}: {e}")
+                continue
+            duplicates = find_duplicate_keys(collection, [field for field, _ in keys], options.get("partialFilterExpression"))
+            raise RuntimeError(
+                f"Could not create unique index {keys} on {collection.name}: {e}. "
+                f"Duplicate keys (first {len(duplicates)}): {duplicates}"
+            ) from e
+
+def find_duplicate_keys(collection, fields, partial_filter: Optional[dict] = None, limit: int = 20) -> list:
+    try:
+        return [
+            {**row["_id"], "count": row["count"]}
+            for row in collection.aggregate([
+                {"$match": partial_filter or {}},
+                {"$group": {"_id": {field: f"${field}" for field in fields}, "count": {"$sum": 1}}},
+                {"$match": {"count": {"$gt": 1}}},
+                {"$limit": limit}
+            ], allowDiskUse=True)
+        ]
+    except PyMongoError:
+        return []
+
+# Batched lookups
+def get_users_by_ids(user_ids, fields=("full_name", "country")) -> dict:
+    user_ids = list(set(user_ids))
+    if not user_ids:
+        return {}
+    
+    projection = {"_id": 0, "user_id": 1, **{field: 1 for field in fields}}
+    return {
+        user["user_id"]: user
+        for user in users_collection.find({"user_id": {"$in": user_ids}}, projection)
+    }
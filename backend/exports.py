@@ -0,0 +1,70 @@
+from fastapi.responses import StreamingResponse
+
+from datetime import datetime
+import json
+import csv
+import io
+from typing import List
+from enum import Enum
+from bson import ObjectId
+
+from models import ExportFormat
+
+# Export helpers
+# Rows are read from a Mongo cursor in batches, hydrated per batch and written
+# out as NDJSON or CSV chunks, so memory stays constant regardless of row count.
+EXPORT_BATCH_SIZE = 500
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+def iter_export_batches(cursor, hydrate=None):
+    batch = []
+    for doc in cursor.batch_size(EXPORT_BATCH_SIZE):
+        batch.append(doc)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield hydrate(batch) if hydrate else batch
+            batch = []
+    if batch:
+        yield hydrate(batch) if hydrate else batch
+
+def export_response(batches, columns: List[str], export_format: ExportFormat, filename: str) -> StreamingResponse:
+    def generate_ndjson():
+        for batch in batches:
+            yield "".join(
+                json.dumps({column: row.get(column) for column in columns}, default=export_value) + "\n"
+                for row in batch
+            )
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for batch in batches:
+            for row in batch:
+                writer.writerow([
+                    ";".join(map(str, value)) if isinstance(value, list) else export_value(value)
+                    for value in (row.get(column) for column in columns)
+                ])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    if export_format == ExportFormat.CSV:
+        content, media_type = generate_csv(), "text/csv"
+    else:
+        content, media_type = generate_ndjson(), "application/x-ndjson"
+    
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'}
+    )
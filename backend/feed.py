@@ -0,0 +1,185 @@
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import PyMongoError
+
+from datetime import datetime, timezone
+import uuid
+from typing import Dict, List, Optional
+import logging
+
+from config import FEED_FANOUT_BATCH_SIZE, FEED_FANOUT_LIMIT, FEED_TIMELINE_SIZE
+from database import activities_collection, connections_collection, feed_timelines_collection, get_users_by_ids, policy_votes_collection, users_collection
+
+logger = logging.getLogger(__name__)
+
+# Activity feed
+# Every activity is stored once in `activities` and copied into the capped,
+# newest-first timeline of each recipient when it is published (fan-out on
+# write), so a feed page is read from one timeline document. Broadcasts from
+# actors with FEED_FANOUT_LIMIT or more connections are not copied: their
+# connections keep them in pull_actors and merge their activities in at read
+# time (fan-out on read), which bounds the cost of a single publish.
+#
+# Entries are ordered by `position`, "<created_at epoch ms>:<activity_id>",
+# which is unique and sorts chronologically as a string; it doubles as the
+# pagination cursor.
+FEED_ENTRY_PROJECTION = {"_id": 0, "audience": 0}
+
+def activity_position(created_at: datetime, activity_id: str) -> str:
+    epoch_ms = int(created_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return f"{epoch_ms:013d}:{activity_id}"
+
+def build_activity(activity_type: str, actor_id: str, actor_name: str, object_type: str,
+                   object_id: str, data: dict, audience: str = "direct") -> dict:
+    activity_id = str(uuid.uuid4())
+    created_at = datetime.utcnow()
+    return {
+        "activity_id": activity_id,
+        "position": activity_position(created_at, activity_id),
+        "type": activity_type,
+        "actor_id": actor_id,
+        "actor_name": actor_name,
+        "object_type": object_type,
+        "object_id": object_id,
+        "data": data,
+        "audience": audience,
+        "created_at": created_at
+    }
+
+def connection_ids(user_id: str) -> List[str]:
+    return [
+        connection["target_id"] if connection["requester_id"] == user_id else connection["requester_id"]
+        for connection in connections_collection.find(
+            {"$or": [{"requester_id": user_id}, {"target_id": user_id}], "status": "accepted"},
+            {"_id": 0, "requester_id": 1, "target_id": 1}
+        )
+    ]
+
+def fan_out(deliveries: Dict[str, List[dict]]):
+    operations = [
+        UpdateOne(
+            {"user_id": user_id},
+            {
+                "$push": {"entries": {
+                    "$each": [{key: value for key, value in entry.items() if key not in ("_id", "audience")} for entry in entries],
+                    "$sort": {"position": -1},
+                    "$slice": FEED_TIMELINE_SIZE
+                }},
+                "$setOnInsert": {"pull_actors": []}
+            },
+            upsert=True
+        )
+        for user_id, entries in deliveries.items()
+    ]
+    for start in range(0, len(operations), FEED_FANOUT_BATCH_SIZE):
+        feed_timelines_collection.bulk_write(operations[start:start + FEED_FANOUT_BATCH_SIZE], ordered=False)
+
+# Publishes activities addressed to specific users, given as (activity, recipient ids)
+def publish_activities(deliveries: List[tuple]):
+    if not deliveries:
+        return
+    try:
+        activities_collection.insert_many([dict(activity) for activity, _ in deliveries], ordered=False)
+        by_recipient = {}
+        for activity, recipient_ids in deliveries:
+            for recipient_id in set(recipient_ids):
+                by_recipient.setdefault(recipient_id, []).append(activity)
+        fan_out(by_recipient)
+    except PyMongoError as e:
+        logger.warning(f"Could not publish {len(deliveries)} activities: {e}")
+
+# Publishes an activity to all of the actor's connections
+def publish_to_connections(actor: dict, activity_type: str, object_type: str, object_id: str, data: dict):
+    activity = build_activity(activity_type, actor["user_id"], actor["full_name"], object_type, object_id, data, audience="connections")
+    try:
+        activities_collection.insert_one(dict(activity))
+        if actor.get("connection_count", 0) < FEED_FANOUT_LIMIT:
+            fan_out({recipient_id: [activity] for recipient_id in connection_ids(actor["user_id"])})
+    except PyMongoError as e:
+        logger.warning(f"Could not publish {activity_type} activity for {object_type} {object_id}: {e}")
+
+# Called when a connection is accepted, with each side's connection count
+# after the accept. An actor reaching FEED_FANOUT_LIMIT switches to fan-out on
+# read for all of its connections; past the limit, new connections just add it.
+def register_connection(user_id: str, user_connection_count: int, other_id: str, other_connection_count: int):
+    for actor_id, actor_connection_count, reader_id in [
+        (user_id, user_connection_count, other_id),
+        (other_id, other_connection_count, user_id)
+    ]:
+        if actor_connection_count == FEED_FANOUT_LIMIT:
+            add_pull_actor(actor_id, connection_ids(actor_id))
+        elif actor_connection_count > FEED_FANOUT_LIMIT:
+            add_pull_actor(actor_id, [reader_id])
+
+def add_pull_actor(actor_id: str, reader_ids: List[str]):
+    operations = [
+        UpdateOne(
+            {"user_id": reader_id},
+            {"$addToSet": {"pull_actors": actor_id}, "$setOnInsert": {"entries": []}},
+            upsert=True
+        )
+        for reader_id in reader_ids
+    ]
+    for start in range(0, len(operations), FEED_FANOUT_BATCH_SIZE):
+        feed_timelines_collection.bulk_write(operations[start:start + FEED_FANOUT_BATCH_SIZE], ordered=False)
+
+# Tells a policy's creator and voters that its feedback window closed
+def publish_policy_outcomes(policies: List[dict]):
+    if not policies:
+        return
+    recipients = {policy["policy_id"]: {policy["creator_id"]} for policy in policies}
+    for vote in policy_votes_collection.find(
+        {"policy_id": {"$in": list(recipients)}},
+        {"_id": 0, "policy_id": 1, "voter_id": 1}
+    ):
+        recipients[vote["policy_id"]].add(vote["voter_id"])
+    
+    creators = get_users_by_ids(policy["creator_id"] for policy in policies)
+    publish_activities([
+        (
+            build_activity(
+                "policy_outcome", policy["creator_id"],
+                creators.get(policy["creator_id"], {}).get("full_name", "Unknown"),
+                "policy", policy["policy_id"], {
+                    "title": policy["title"],
+                    "status": policy["status"],
+                    "support_votes": policy.get("support_votes", 0),
+                    "oppose_votes": policy.get("oppose_votes", 0),
+                    "neutral_votes": policy.get("neutral_votes", 0),
+                    "feedback_count": policy.get("feedback_count", 0)
+                }
+            ),
+            recipients[policy["policy_id"]]
+        )
+        for policy in policies
+    ])
+
+def increment_connection_count(user_id: str) -> int:
+    user = users_collection.find_one_and_update(
+        {"user_id": user_id},
+        {"$inc": {"connection_count": 1}},
+        projection={"_id": 0, "connection_count": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    return user["connection_count"] if user else 0
+
+def read_feed(user_id: str, cursor: Optional[str], limit: int) -> tuple:
+    entries = {"$filter": {"input": "$entries", "cond": {"$lt": ["$$this.position", cursor]}}} if cursor else "$entries"
+    timeline = next(feed_timelines_collection.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$project": {"_id": 0, "pull_actors": 1, "entries": {"$slice": [entries, limit + 1]}}}
+    ]), None) or {}
+    page = timeline.get("entries", [])
+    
+    # Merge in broadcasts from high-degree connections
+    if timeline.get("pull_actors"):
+        query = {"actor_id": {"$in": timeline["pull_actors"]}, "audience": "connections"}
+        if cursor:
+            query["position"] = {"$lt": cursor}
+        pulled = activities_collection.find(query, FEED_ENTRY_PROJECTION).sort("position", -1).limit(limit + 1)
+        merged = {entry["position"]: entry for entry in page}
+        for entry in pulled:
+            merged.setdefault(entry["position"], entry)
+        page = sorted(merged.values(), key=lambda entry: entry["position"], reverse=True)
+    
+    next_cursor = page[limit - 1]["position"] if len(page) > limit else None
+    return page[:limit], next_cursor
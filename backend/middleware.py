@@ -0,0 +1,499 @@
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+import pymongo
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from datetime import datetime, timedelta
+import os
+import hashlib
+import json
+import time
+import uuid
+import gzip
+import zlib
+from typing import Any, Optional
+import logging
+from bson import ObjectId
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from auth import caller_identity
+from database import idempotency_keys_collection, request_actor, save_causal_token
+
+logger = logging.getLogger(__name__)
+
+# Custom JSON Response to handle MongoDB ObjectId serialization
+class CustomJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return super().render(jsonable_encoder(content, custom_encoder={ObjectId: str}))
+
+# Response compression
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_THREADPOOL_SIZE = int(os.environ.get("COMPRESSION_THREADPOOL_SIZE", "65536"))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_CONTENT_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# An encoded body is a different representation, so a strong ETag gets the
+# encoding appended ("<hash>-gzip"); validators coming back from clients are
+# compared with it stripped again.
+COMPRESSION_ENCODINGS = ("br", "gzip")
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    return f'{etag[:-1]}-{encoding}"'
+
+def decoded_etag(etag: str) -> str:
+    for encoding in COMPRESSION_ENCODINGS:
+        if etag.endswith(f'-{encoding}"'):
+            return etag[:-len(encoding) - 2] + '"'
+    return etag
+
+# Negotiates br/gzip per request. Bodies below COMPRESSION_MIN_SIZE are sent
+# as-is, bodies above COMPRESSION_THREADPOOL_SIZE are compressed off the event
+# loop, and streamed bodies are compressed chunk by chunk. Byte counts and CPU
+# time are accumulated per route in compression_stats.
+class CompressionMiddleware:
+    def __init__(self, app, stats: dict, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 threadpool_size: int = COMPRESSION_THREADPOOL_SIZE):
+        self.app = app
+        self.stats = stats
+        self.minimum_size = minimum_size
+        self.threadpool_size = threadpool_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = self.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        stream = None
+        
+        async def send_compressed(message):
+            nonlocal start_message, stream
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            
+            if start_message is not None:
+                start, start_message = start_message, None
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                if (
+                    "content-encoding" in headers
+                    or not content_type.startswith(COMPRESSIBLE_CONTENT_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    await send(start)
+                    await send(message)
+                    return
+                
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and etag.startswith('"'):
+                    headers["ETag"] = encoded_etag(etag, encoding)
+                
+                if not more_body:
+                    if len(body) >= self.threadpool_size:
+                        compressed, cpu_seconds = await run_in_threadpool(self.compress, encoding, body)
+                    else:
+                        compressed, cpu_seconds = self.compress(encoding, body)
+                    self.record(scope, len(body), len(compressed), cpu_seconds)
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                
+                # Streaming response: compress incrementally
+                del headers["Content-Length"]
+                stream = {"compressor": self.compressor(encoding), "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0}
+                await send(start)
+            
+            if stream is None:
+                await send(message)
+                return
+            
+            cpu_started = time.thread_time()
+            chunk = stream["compressor"].compress(body) if body else b""
+            chunk += stream["compressor"].flush() if not more_body else b""
+            stream["cpu_seconds"] += time.thread_time() - cpu_started
+            stream["bytes_in"] += len(body)
+            stream["bytes_out"] += len(chunk)
+            if not more_body:
+                self.record(scope, stream["bytes_in"], stream["bytes_out"], stream["cpu_seconds"])
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        
+        await self.app(scope, receive, send_compressed)
+    
+    @staticmethod
+    def negotiate(accept_encoding: str) -> Optional[str]:
+        accepted = {}
+        for part in accept_encoding.split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.strip().lower()] = quality
+        
+        if brotli is not None and accepted.get("br", 0) > 0:
+            return "br"
+        if accepted.get("gzip", 0) > 0:
+            return "gzip"
+        return None
+    
+    @staticmethod
+    def compress(encoding: str, body: bytes):
+        cpu_started = time.thread_time()
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+        else:
+            compressed = gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL)
+        return compressed, time.thread_time() - cpu_started
+    
+    @staticmethod
+    def compressor(encoding: str):
+        if encoding == "br":
+            return BrotliStreamCompressor()
+        return zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    
+    def record(self, scope, bytes_in: int, bytes_out: int, cpu_seconds: float):
+        route = scope.get("route")
+        route_key = f"{scope['method']} {route.path if route else scope['path']}"
+        route_stats = self.stats.setdefault(route_key, {
+            "responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0
+        })
+        route_stats["responses"] += 1
+        route_stats["bytes_in"] += bytes_in
+        route_stats["bytes_out"] += bytes_out
+        route_stats["cpu_seconds"] += cpu_seconds
+
+# Gives brotli's streaming compressor the same compress()/flush() interface as zlib
+class BrotliStreamCompressor:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self.compressor.finish()
+
+compression_stats = {}
+
+# Load shedding
+MAX_IN_FLIGHT_REQUESTS = int(os.environ.get("MAX_IN_FLIGHT_REQUESTS", "200"))
+MAX_QUEUE_LATENCY_MS = int(os.environ.get("MAX_QUEUE_LATENCY_MS", "2000"))
+REQUEST_TIMEOUT_SECONDS = float(os.environ.get("REQUEST_TIMEOUT_SECONDS", "10"))
+LOAD_SHEDDING_EXEMPT_PATHS = ("/api/health", "/api/metrics")
+# Streaming exports legitimately outlive the request deadline
+DEADLINE_EXEMPT_PATH_PREFIXES = ("/api/export/",)
+
+# Rejects work early with 503 when too many requests are in flight or when the
+# proxy-reported queue time (X-Request-Start) is already too long, and runs
+# admitted requests under a pymongo timeout so every Mongo call they make gets
+# maxTimeMS from the remaining budget instead of outliving the client.
+class LoadSheddingMiddleware:
+    def __init__(self, app, stats: dict):
+        self.app = app
+        self.stats = stats
+        self.stats.update({
+            "in_flight": 0,
+            "peak_in_flight": 0,
+            "shed_in_flight": 0,
+            "shed_queue_latency": 0,
+            "deadline_exceeded": 0,
+            "queue_latency_ms_ewma": 0.0
+        })
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in LOAD_SHEDDING_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        queue_latency_ms = self.queue_latency_ms(Headers(scope=scope).get("x-request-start"))
+        if queue_latency_ms is not None:
+            self.stats["queue_latency_ms_ewma"] = 0.9 * self.stats["queue_latency_ms_ewma"] + 0.1 * queue_latency_ms
+        
+        if self.stats["in_flight"] >= MAX_IN_FLIGHT_REQUESTS:
+            self.stats["shed_in_flight"] += 1
+            await self.reject(send)
+            return
+        if queue_latency_ms is not None and queue_latency_ms > MAX_QUEUE_LATENCY_MS:
+            self.stats["shed_queue_latency"] += 1
+            await self.reject(send)
+            return
+        
+        self.stats["in_flight"] += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.stats["in_flight"])
+        try:
+            if scope["path"].startswith(DEADLINE_EXEMPT_PATH_PREFIXES):
+                await self.app(scope, receive, send)
+            else:
+                budget = REQUEST_TIMEOUT_SECONDS - (queue_latency_ms or 0) / 1000
+                with pymongo.timeout(max(budget, 0.001)):
+                    await self.app(scope, receive, send)
+        finally:
+            self.stats["in_flight"] -= 1
+    
+    @staticmethod
+    def queue_latency_ms(request_start: Optional[str]) -> Optional[float]:
+        # Accepts "t=<epoch>" or "<epoch>" in seconds, milliseconds or microseconds
+        if not request_start:
+            return None
+        try:
+            started = float(request_start.strip().removeprefix("t="))
+        except ValueError:
+            return None
+        if started > 1e14:
+            started /= 1e6
+        elif started > 1e11:
+            started /= 1e3
+        return max((time.time() - started) * 1000, 0.0)
+    
+    @staticmethod
+    async def reject(send):
+        body = json.dumps({"detail": "Server is overloaded, please retry shortly"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"1")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+load_stats = {}
+
+# Idempotency keys
+# POSTs carrying an Idempotency-Key header run at most once per key, caller and
+# path. The first request claims the key (unique index) before running; a retry
+# while it is still running gets 409, a retry after it finished gets the stored
+# response replayed, and reusing the key for a different body gets 422. Keys of
+# requests that failed with 5xx, or with a 4xx that asks the client to retry
+# (timeout, conflict, rate limited), are released so the retry runs again.
+# Stored responses expire after IDEMPOTENCY_KEY_TTL_SECONDS.
+#
+# A claim is a lease: a worker killed mid-request never completes or releases
+# it, so once IDEMPOTENCY_CLAIM_LEASE_SECONDS have passed the next request with
+# the key takes it over. Each claim carries its own id, and the original
+# request, if it was only slow, can then no longer store or release the key.
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.environ.get("IDEMPOTENCY_KEY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_RETRYABLE_STATUSES = {408, 409, 425, 429}
+IDEMPOTENCY_CLAIM_LEASE_SECONDS = float(os.environ.get("IDEMPOTENCY_CLAIM_LEASE_SECONDS", str(REQUEST_TIMEOUT_SECONDS * 3)))
+
+class IdempotencyMiddleware:
+    def __init__(self, app, stats: dict):
+        self.app = app
+        self.stats = stats
+        self.stats.update({
+            "claimed": 0,
+            "replayed": 0,
+            "in_progress_conflicts": 0,
+            "payload_mismatches": 0,
+            "released": 0,
+            "taken_over": 0
+        })
+    
+    async def __call__(self, scope, receive, send):
+        key = Headers(scope=scope).get("idempotency-key") if scope["type"] == "http" and scope["method"] == "POST" else None
+        if not key:
+            await self.app(scope, receive, send)
+            return
+        if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            await self.respond(send, 400, {"detail": "Idempotency-Key is too long"})
+            return
+        
+        # Buffer the body so it can be fingerprinted and then replayed to the app
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body = b"".join(chunks)
+        request_hash = hashlib.sha256(
+            scope["path"].encode() + b"?" + scope.get("query_string", b"") + b"\n" + body
+        ).hexdigest()
+        
+        record_id = {"key": key, "caller": caller_identity(Request(scope)), "path": scope["path"]}
+        claim = self.claim(record_id, request_hash)
+        if claim is None:
+            await self.replay(record_id, request_hash, send)
+            return
+        
+        body_sent = False
+        async def replay_body():
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        response = {"status": 500, "headers": [], "body": []}
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+        
+        try:
+            await self.app(scope, replay_body, capture)
+        except Exception:
+            self.release(claim)
+            raise
+        
+        if not self.storable(response["status"]):
+            self.release(claim)
+            return
+        try:
+            idempotency_keys_collection.update_one(claim, {"$set": {
+                "state": "completed",
+                "status_code": response["status"],
+                "headers": [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in response["headers"]
+                    if name.lower() in (b"content-type", b"location")
+                ],
+                "body": b"".join(response["body"])
+            }})
+        except PyMongoError as e:
+            # The response is already sent; without a stored copy, let a retry run again
+            logger.warning(f"Could not store response for idempotency key {key}: {e}")
+            self.release(claim)
+    
+    # Returns the filter that identifies this request's claim, or None when the
+    # key is held by another live claim or already completed
+    def claim(self, record_id: dict, request_hash: str) -> Optional[dict]:
+        now = datetime.utcnow()
+        claim_id = str(uuid.uuid4())
+        lease = {"claim_id": claim_id, "lease_expires_at": now + timedelta(seconds=IDEMPOTENCY_CLAIM_LEASE_SECONDS)}
+        try:
+            idempotency_keys_collection.insert_one({
+                **record_id,
+                **lease,
+                "request_hash": request_hash,
+                "state": "in_progress",
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=IDEMPOTENCY_KEY_TTL_SECONDS)
+            })
+            self.stats["claimed"] += 1
+            return {**record_id, "claim_id": claim_id}
+        except DuplicateKeyError:
+            pass
+        
+        # Take over an abandoned claim for the same request
+        taken_over = idempotency_keys_collection.find_one_and_update(
+            {**record_id, "state": "in_progress", "request_hash": request_hash, "lease_expires_at": {"$lte": now}},
+            {"$set": lease}
+        )
+        if taken_over is None:
+            return None
+        self.stats["taken_over"] += 1
+        return {**record_id, "claim_id": claim_id}
+    
+    async def replay(self, record_id: dict, request_hash: str, send):
+        record = idempotency_keys_collection.find_one(record_id)
+        if record is None:
+            # Released or expired between our insert and this read
+            self.stats["in_progress_conflicts"] += 1
+            await self.respond(send, 409, {"detail": "A request with this Idempotency-Key is in progress"}, retry_after=True)
+            return
+        if record["request_hash"] != request_hash:
+            self.stats["payload_mismatches"] += 1
+            await self.respond(send, 422, {"detail": "Idempotency-Key was already used for a different request"})
+            return
+        if record["state"] != "completed":
+            self.stats["in_progress_conflicts"] += 1
+            await self.respond(send, 409, {"detail": "A request with this Idempotency-Key is in progress"}, retry_after=True)
+            return
+        
+        self.stats["replayed"] += 1
+        body = bytes(record["body"])
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]]
+        await send({
+            "type": "http.response.start",
+            "status": record["status_code"],
+            "headers": headers + [
+                (b"content-length", str(len(body)).encode()),
+                (b"idempotent-replayed", b"true")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+    
+    @staticmethod
+    def storable(status_code: int) -> bool:
+        return status_code < 500 and status_code not in IDEMPOTENCY_RETRYABLE_STATUSES
+    
+    def release(self, claim: dict):
+        self.stats["released"] += 1
+        try:
+            idempotency_keys_collection.delete_one(claim)
+        except PyMongoError as e:
+            logger.warning(f"Could not release idempotency key {claim['key']}: {e}")
+    
+    @staticmethod
+    async def respond(send, status_code: int, content: dict, retry_after: bool = False):
+        body = json.dumps(content).encode()
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        if retry_after:
+            headers.append((b"retry-after", b"1"))
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+idempotency_stats = {}
+
+# Request actor
+# Gives each request its own mutable slot in request_actor. get_current_user runs
+# in the threadpool with a copy of the request context, so it cannot set a
+# context variable the endpoint would see, but it can fill in this shared slot.
+# The causal token of the request's writes is saved before the response starts,
+# so a read the client sends after seeing it is already routed with it.
+class RequestActorMiddleware:
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        actor = {"user_id": None}
+        token = request_actor.set(actor)
+        
+        async def send_saving_token(message):
+            if message["type"] == "http.response.start":
+                save_causal_token(actor)
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_saving_token)
+        finally:
+            request_actor.reset(token)
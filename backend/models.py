@@ -0,0 +1,387 @@
+from pydantic import BaseModel, EmailStr
+
+from datetime import datetime
+from typing import List, Optional
+from enum import Enum
+from bson import ObjectId
+
+# Enums
+class JobType(str, Enum):
+    FULL_TIME = "full_time"
+    PART_TIME = "part_time"
+    INTERNSHIP = "internship"
+    GIG_WORK = "gig_work"
+    PROJECT = "project"
+    VOLUNTEER = "volunteer"
+
+class JobCategory(str, Enum):
+    TECHNOLOGY = "technology"
+    AGRICULTURE = "agriculture"
+    EDUCATION = "education"
+    HEALTH = "health"
+    ENVIRONMENT = "environment"
+    FINANCE = "finance"
+    ARTS = "arts"
+    BUSINESS = "business"
+    ENGINEERING = "engineering"
+    SOCIAL_WORK = "social_work"
+
+class LocationType(str, Enum):
+    REMOTE = "remote"
+    ON_SITE = "on_site"
+    HYBRID = "hybrid"
+
+class ApplicationStatus(str, Enum):
+    APPLIED = "applied"
+    REVIEWED = "reviewed"
+    SHORTLISTED = "shortlisted"
+    INTERVIEWED = "interviewed"
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+
+class OrganizationType(str, Enum):
+    STARTUP = "startup"
+    NGO = "ngo"
+    GOVERNMENT = "government"
+    CORPORATION = "corporation"
+    UNIVERSITY = "university"
+    COOPERATIVE = "cooperative"
+
+class ProjectCategory(str, Enum):
+    EDUCATION = "education"
+    TECHNOLOGY = "technology"
+    AGRICULTURE = "agriculture"
+    HEALTH = "health"
+    ENVIRONMENT = "environment"
+    ARTS_CULTURE = "arts_culture"
+    SOCIAL_IMPACT = "social_impact"
+    ENTREPRENEURSHIP = "entrepreneurship"
+    INFRASTRUCTURE = "infrastructure"
+    CLIMATE_ACTION = "climate_action"
+
+class ProjectStatus(str, Enum):
+    DRAFT = "draft"
+    PENDING_APPROVAL = "pending_approval"
+    ACTIVE = "active"
+    FUNDED = "funded"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    CLOSED = "closed"  # funding window over with money raised
+
+class FundingGoalType(str, Enum):
+    FIXED = "fixed"
+    FLEXIBLE = "flexible"
+
+class PolicyCategory(str, Enum):
+    EDUCATION = "education"
+    HEALTHCARE = "healthcare"
+    ECONOMY = "economy"
+    ENVIRONMENT = "environment"
+    YOUTH_DEVELOPMENT = "youth_development"
+    INFRASTRUCTURE = "infrastructure"
+    TECHNOLOGY = "technology"
+    AGRICULTURE = "agriculture"
+    GOVERNANCE = "governance"
+    SOCIAL_JUSTICE = "social_justice"
+
+class PolicyStatus(str, Enum):
+    DRAFT = "draft"
+    OPEN_FOR_FEEDBACK = "open_for_feedback"
+    UNDER_REVIEW = "under_review"
+    APPROVED = "approved"
+    IMPLEMENTED = "implemented"
+    REJECTED = "rejected"
+
+class ProposalType(str, Enum):
+    GOVERNMENT_POLICY = "government_policy"
+    YOUTH_INITIATIVE = "youth_initiative"
+    COMMUNITY_PROJECT = "community_project"
+    POLICY_SUGGESTION = "policy_suggestion"
+
+class VoteType(str, Enum):
+    SUPPORT = "support"
+    OPPOSE = "oppose"
+    NEUTRAL = "neutral"
+
+class ParticipationLevel(str, Enum):
+    BRONZE = "bronze"
+    SILVER = "silver"
+    GOLD = "gold"
+    PLATINUM = "platinum"
+
+class CourseCategory(str, Enum):
+    TECHNOLOGY = "technology"
+    BUSINESS = "business"
+    DESIGN = "design"
+    MARKETING = "marketing"
+    AGRICULTURE = "agriculture"
+    HEALTH = "health"
+    EDUCATION = "education"
+    ARTS = "arts"
+    LANGUAGES = "languages"
+    PERSONAL_DEVELOPMENT = "personal_development"
+
+class CourseLevel(str, Enum):
+    BEGINNER = "beginner"
+    INTERMEDIATE = "intermediate"
+    ADVANCED = "advanced"
+    EXPERT = "expert"
+
+class CourseStatus(str, Enum):
+    DRAFT = "draft"
+    PUBLISHED = "published"
+    ARCHIVED = "archived"
+
+class EnrollmentStatus(str, Enum):
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    DROPPED = "dropped"
+
+class CertificateType(str, Enum):
+    COMPLETION = "completion"
+    ACHIEVEMENT = "achievement"
+    SKILL_BADGE = "skill_badge"
+    MICRO_CREDENTIAL = "micro_credential"
+
+class MentorshipStatus(str, Enum):
+    PENDING = "pending"
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+# Pydantic models with ObjectId handling
+class UserRegister(BaseModel):
+    email: EmailStr
+    password: str
+    full_name: str
+    country: str
+    age: int
+
+    class Config:
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+class UserLogin(BaseModel):
+    email: EmailStr
+    password: str
+
+    class Config:
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+class UserProfile(BaseModel):
+    full_name: str
+    country: str
+    age: int
+    bio: Optional[str] = ""
+    skills: List[str] = []
+    interests: List[str] = []
+    education: Optional[str] = ""
+    goals: Optional[str] = ""
+    current_projects: Optional[str] = ""
+    languages: List[str] = []
+    phone: Optional[str] = ""
+    linkedin: Optional[str] = ""
+    work_experience: Optional[str] = ""
+    portfolio_url: Optional[str] = ""
+    availability: Optional[str] = ""
+
+    class Config:
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+class OrganizationProfile(BaseModel):
+    name: str
+    description: str
+    organization_type: OrganizationType
+    country: str
+    website: Optional[str] = ""
+    contact_email: EmailStr
+    contact_phone: Optional[str] = ""
+    size: Optional[str] = ""
+    founded_year: Optional[int] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+class JobPost(BaseModel):
+    title: str
+    description: str
+    requirements: List[str]
+    job_type: JobType
+    job_category: JobCategory
+    location_type: LocationType
+    location: str
+    salary_range: Optional[str] = ""
+    deadline: Optional[datetime] = None
+    skills_required: List[str]
+    experience_level: Optional[str] = ""
+    benefits: Optional[str] = ""
+
+class JobApplication(BaseModel):
+    job_id: str
+    cover_letter: Optional[str] = ""
+    portfolio_links: Optional[str] = ""
+
+class BulkApplicationStatusUpdate(BaseModel):
+    application_ids: List[str]
+    status: ApplicationStatus
+
+class ConnectionRequest(BaseModel):
+    target_user_id: str
+    message: Optional[str] = ""
+
+class NotificationReadRequest(BaseModel):
+    notification_ids: Optional[List[str]] = None  # None marks all as read
+
+class Message(BaseModel):
+    recipient_id: str
+    content: str
+
+class SkillEndorsement(BaseModel):
+    user_id: str
+    skill: str
+    endorsement_message: Optional[str] = ""
+
+class ProjectProposal(BaseModel):
+    title: str
+    description: str
+    category: ProjectCategory
+    funding_goal: float
+    funding_goal_type: FundingGoalType
+    duration_months: int
+    location: str
+    impact_description: str
+    budget_breakdown: str
+    milestones: List[str]
+    images: List[str] = []
+    team_members: Optional[str] = ""
+    risks_challenges: Optional[str] = ""
+    sustainability_plan: Optional[str] = ""
+
+class ProjectContribution(BaseModel):
+    project_id: str
+    amount: float
+    anonymous: bool = False
+    message: Optional[str] = ""
+
+class ProjectUpdate(BaseModel):
+    project_id: str
+    title: str
+    content: str
+    images: List[str] = []
+    milestone_completed: Optional[str] = None
+
+class ProjectComment(BaseModel):
+    project_id: str
+    content: str
+    reply_to: Optional[str] = None
+
+class PolicyProposal(BaseModel):
+    title: str
+    description: str
+    category: PolicyCategory
+    proposal_type: ProposalType
+    target_location: str
+    expected_impact: str
+    implementation_timeline: Optional[str] = ""
+    resources_needed: Optional[str] = ""
+    supporting_documents: List[str] = []
+
+class PolicyFeedback(BaseModel):
+    policy_id: str
+    feedback_type: str  # "comment", "suggestion", "concern", "support"
+    content: str
+    impact_assessment: Optional[str] = ""
+    alternative_suggestion: Optional[str] = ""
+
+class PolicyVote(BaseModel):
+    policy_id: str
+    vote_type: VoteType
+    comment: Optional[str] = ""
+
+class ForumPost(BaseModel):
+    forum_id: str
+    title: str
+    content: str
+    tags: List[str] = []
+
+class ForumReply(BaseModel):
+    post_id: str
+    content: str
+    reply_to: Optional[str] = None
+
+class CivicForum(BaseModel):
+    title: str
+    description: str
+    category: PolicyCategory
+    location: str
+    moderators: List[str] = []
+
+class Course(BaseModel):
+    title: str
+    description: str
+    category: CourseCategory
+    level: CourseLevel
+    duration_hours: int
+    price: float = 0.0  # 0 for free courses
+    thumbnail_url: Optional[str] = ""
+    learning_objectives: List[str]
+    prerequisites: List[str] = []
+    skills_gained: List[str] = []
+    certificate_type: CertificateType = CertificateType.COMPLETION
+
+class CourseModule(BaseModel):
+    course_id: str
+    title: str
+    description: str
+    order_index: int
+    duration_minutes: int
+
+class CourseLesson(BaseModel):
+    module_id: str
+    title: str
+    description: str
+    content: str
+    lesson_type: str  # "video", "text", "assignment", "quiz"
+    content_url: Optional[str] = ""
+    order_index: int
+    duration_minutes: int
+
+class CourseEnrollment(BaseModel):
+    course_id: str
+
+class CourseReview(BaseModel):
+    course_id: str
+    rating: int  # 1-5 stars
+    review_text: str
+
+class LessonProgressEvent(BaseModel):
+    lesson_id: str
+    completed_at: Optional[datetime] = None
+
+class LessonProgressBatch(BaseModel):
+    events: List[LessonProgressEvent]
+
+class MentorshipRequest(BaseModel):
+    mentor_id: str
+    skill_area: str
+    goals: str
+    duration_weeks: int
+    message: str
+
+class SkillAssessment(BaseModel):
+    skill_name: str
+    assessment_type: str  # "self_assessment", "peer_review", "test"
+    score: int  # 1-100
+    notes: Optional[str] = ""
+
+class Token(BaseModel):
+    access_token: str
+    token_type: str
@@ -0,0 +1,198 @@
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+
+from datetime import datetime, timedelta
+import asyncio
+import uuid
+from typing import List
+import logging
+
+from config import NOTIFICATION_BATCH_SIZE, NOTIFICATION_CLAIM_TIMEOUT_SECONDS, NOTIFICATION_DIGEST_SAMPLE_SIZE, NOTIFICATION_DIGEST_THRESHOLD, NOTIFICATION_DISPATCH_INTERVAL_SECONDS
+from database import notification_counters_collection, notification_events_collection, notifications_collection
+
+logger = logging.getLogger(__name__)
+
+# Notifications
+# Request handlers only append events to the notification_events outbox. The
+# dispatcher drains it in batches in the background, groups the events by
+# recipient and writes the notification rows and unread counters with one bulk
+# write each. A recipient with NOTIFICATION_DIGEST_THRESHOLD or more events in
+# a batch, or who already has an unread digest, gets them folded into a single
+# digest row (per-type counts plus a few recent samples) instead of one row
+# per event.
+#
+# Delivery is at least once: events claimed by a worker that died are
+# reclaimed after NOTIFICATION_CLAIM_TIMEOUT_SECONDS. Individual rows use the
+# event id as notification_id, so a redelivery is dropped on insert.
+def notification_event(user_id: str, notification_type: str, title: str, data: dict) -> dict:
+    return {
+        "event_id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "type": notification_type,
+        "title": title,
+        "data": data,
+        "status": "pending",
+        "created_at": datetime.utcnow()
+    }
+
+def enqueue_notifications(events: List[dict]):
+    if not events:
+        return
+    try:
+        notification_events_collection.insert_many(events, ordered=False)
+    except PyMongoError as e:
+        logger.warning(f"Could not enqueue {len(events)} notifications: {e}")
+
+def notification_entry(event: dict) -> dict:
+    return {
+        "event_id": event["event_id"],
+        "type": event["type"],
+        "title": event["title"],
+        "data": event["data"],
+        "created_at": event["created_at"]
+    }
+
+class NotificationDispatcher:
+    def __init__(self):
+        self.task = None
+        self.stats = {"dispatched_events": 0, "notifications": 0, "digested_events": 0, "batches": 0}
+    
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+    
+    async def run(self):
+        while True:
+            try:
+                dispatched = self.dispatch_batch()
+            except PyMongoError as e:
+                logger.error(f"Notification dispatcher failed: {e}")
+                dispatched = 0
+            
+            # Keep draining while batches come back full
+            await asyncio.sleep(0 if dispatched >= NOTIFICATION_BATCH_SIZE else NOTIFICATION_DISPATCH_INTERVAL_SECONDS)
+    
+    def claim(self, now: datetime) -> List[dict]:
+        claimable = {"$or": [
+            {"status": "pending"},
+            {"status": "claimed", "claimed_at": {"$lte": now - timedelta(seconds=NOTIFICATION_CLAIM_TIMEOUT_SECONDS)}}
+        ]}
+        event_ids = [
+            event["event_id"]
+            for event in notification_events_collection.find(claimable, {"_id": 0, "event_id": 1}).sort("created_at", 1).limit(NOTIFICATION_BATCH_SIZE)
+        ]
+        if not event_ids:
+            return []
+        
+        # Another worker may claim some of the same events; only rows tagged
+        # with this claim id are ours
+        claim_id = str(uuid.uuid4())
+        notification_events_collection.update_many(
+            {"event_id": {"$in": event_ids}, **claimable},
+            {"$set": {"status": "claimed", "claim_id": claim_id, "claimed_at": now}}
+        )
+        return list(notification_events_collection.find({"event_id": {"$in": event_ids}, "claim_id": claim_id}).sort("created_at", 1))
+    
+    def dispatch_batch(self) -> int:
+        now = datetime.utcnow()
+        events = self.claim(now)
+        if not events:
+            return 0
+        
+        by_user = {}
+        for event in events:
+            by_user.setdefault(event["user_id"], []).append(event)
+        open_digests = {
+            digest["user_id"]
+            for digest in notifications_collection.find(
+                {"user_id": {"$in": list(by_user)}, "type": "digest", "read": False},
+                {"_id": 0, "user_id": 1}
+            )
+        }
+        
+        rows = []
+        unread = {}
+        digested = 0
+        for user_id, user_events in by_user.items():
+            if user_id in open_digests or len(user_events) >= NOTIFICATION_DIGEST_THRESHOLD:
+                if self.fold_into_digest(user_id, user_events, now):
+                    unread[user_id] = unread.get(user_id, 0) + 1
+                digested += len(user_events)
+                continue
+            for event in user_events:
+                rows.append({
+                    "notification_id": event["event_id"],
+                    "user_id": user_id,
+                    "type": event["type"],
+                    "title": event["title"],
+                    "data": event["data"],
+                    "read": False,
+                    "created_at": event["created_at"],
+                    "updated_at": event["created_at"]
+                })
+        
+        if rows:
+            skipped = set()
+            try:
+                notifications_collection.insert_many(rows, ordered=False)
+            except BulkWriteError as e:
+                # Redelivered events are already stored; anything else is a real failure
+                errors = e.details.get("writeErrors", [])
+                if any(error["code"] != 11000 for error in errors):
+                    raise
+                skipped = {error["index"] for error in errors}
+            for index, row in enumerate(rows):
+                if index not in skipped:
+                    unread[row["user_id"]] = unread.get(row["user_id"], 0) + 1
+        
+        if unread:
+            notification_counters_collection.bulk_write([
+                UpdateOne({"user_id": user_id}, {"$inc": {"unread": count}, "$set": {"updated_at": now}}, upsert=True)
+                for user_id, count in unread.items()
+            ], ordered=False)
+        
+        notification_events_collection.delete_many({"event_id": {"$in": [event["event_id"] for event in events]}})
+        
+        self.stats["batches"] += 1
+        self.stats["dispatched_events"] += len(events)
+        self.stats["notifications"] += sum(unread.values())
+        self.stats["digested_events"] += digested
+        return len(events)
+    
+    # Returns True when a new digest row was created (and so adds to the unread count)
+    @staticmethod
+    def fold_into_digest(user_id: str, events: List[dict], now: datetime) -> bool:
+        counts = {}
+        for event in events:
+            counts[f"counts.{event['type']}"] = counts.get(f"counts.{event['type']}", 0) + 1
+        query = {"user_id": user_id, "type": "digest", "read": False}
+        update = {
+            "$inc": {"count": len(events), **counts},
+            "$push": {"latest": {
+                "$each": [notification_entry(event) for event in events[-NOTIFICATION_DIGEST_SAMPLE_SIZE:]],
+                "$slice": -NOTIFICATION_DIGEST_SAMPLE_SIZE
+            }},
+            "$set": {"updated_at": now},
+            "$setOnInsert": {"notification_id": str(uuid.uuid4()), "created_at": now}
+        }
+        try:
+            result = notifications_collection.update_one(query, update, upsert=True)
+        except DuplicateKeyError:
+            # Another dispatcher opened the digest first
+            notifications_collection.update_one(query, update)
+            return False
+        return result.upserted_id is not None
+
+notification_dispatcher = NotificationDispatcher()
+
+def unread_count(user_id: str) -> int:
+    counter = notification_counters_collection.find_one({"user_id": user_id}, {"_id": 0, "unread": 1})
+    # Marking read can briefly overtake a dispatch that is still counting
+    return max(counter["unread"], 0) if counter else 0
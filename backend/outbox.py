@@ -0,0 +1,312 @@
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, PyMongoError
+from starlette.concurrency import run_in_threadpool
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import asyncio
+import uuid
+from typing import Iterable, List, Optional
+import logging
+
+from config import OUTBOX_BATCH_SIZE, OUTBOX_CHANGE_STREAMS, OUTBOX_GAP_TIMEOUT_SECONDS, OUTBOX_LEASE_SECONDS, OUTBOX_POLL_INTERVAL_SECONDS, OUTBOX_RETENTION_DAYS
+from database import counters_collection, leases_collection, outbox_checkpoints_collection, outbox_collection, supports_transactions
+
+logger = logging.getLogger(__name__)
+
+# Outbox
+# Mutations append a change record ({entity, entity_id, operation, fields})
+# to the outbox. Inside a transaction the record commits or aborts with the
+# change; elsewhere it is written right after it. Records are written pending
+# and only get their seq, a position in one total order, from the worker once
+# they are visible (committed): an aborted or retried transaction leaves
+# nothing behind, and a record can never become visible behind a seq the
+# worker has already passed.
+#
+# Denormalized read models are maintained by projectors, which the outbox
+# worker feeds in seq order and checkpoints per projector. A record only says
+# which entity changed: projectors re-read the current state from the source
+# collections, so applying a change twice, replaying from an older
+# checkpoint, or a full rebuild all converge on the same result.
+#
+# Every app process runs a worker, but only the one holding the lease document
+# (renewed each loop, OUTBOX_LEASE_SECONDS long) applies changes; the others
+# stand by to take over. Checkpoints also only ever move forward, except when
+# a replay or rebuild moves them on purpose.
+def record_changes(entity: str, entity_ids: Iterable[str], operation: str, fields: Iterable[str] = (), session=None):
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    try:
+        now = datetime.utcnow()
+        outbox_collection.insert_many([
+            {
+                "pending": True,
+                "entity": entity,
+                "entity_id": entity_id,
+                "operation": operation,
+                "fields": list(fields),
+                "created_at": now,
+                "expires_at": now + timedelta(days=OUTBOX_RETENTION_DAYS)
+            }
+            for entity_id in entity_ids
+        ], session=session)
+    except PyMongoError as e:
+        if session is not None:
+            raise
+        # The change itself is already committed; a rebuild will pick it up
+        logger.warning(f"Could not record {operation} of {len(entity_ids)} {entity} rows: {e}")
+
+def record_change(entity: str, entity_id: str, operation: str, fields: Iterable[str] = (), session=None):
+    record_changes(entity, [entity_id], operation, fields, session)
+
+class Projector(ABC):
+    name = ""
+    entities = ()
+    
+    @abstractmethod
+    def apply(self, changes: List[dict]):
+        pass
+    
+    @abstractmethod
+    def rebuild(self):
+        pass
+
+class OutboxWorker:
+    def __init__(self):
+        self.projectors = {}
+        self.task = None
+        self.stream = None
+        self.worker_id = str(uuid.uuid4())
+        self.leader = False
+        self.stats = {"mode": "polling", "batches": 0, "changes": 0, "skipped_seqs": 0, "errors": 0}
+    
+    def register(self, projector: Projector):
+        self.projectors[projector.name] = projector
+    
+    def head(self) -> int:
+        counter = counters_collection.find_one({"_id": "outbox"})
+        return counter["seq"] if counter else 0
+    
+    def checkpoints(self) -> dict:
+        return {
+            checkpoint["projector"]: checkpoint["seq"]
+            for checkpoint in outbox_checkpoints_collection.find({"projector": {"$in": list(self.projectors)}})
+        }
+    
+    def save_checkpoint(self, name: str, seq: int, force: bool = False):
+        query = {"projector": name} if force else {"projector": name, "seq": {"$lt": seq}}
+        try:
+            outbox_checkpoints_collection.update_one(
+                query,
+                {"$set": {"seq": seq, "updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # Already at or past seq
+            pass
+    
+    def acquire_lease(self) -> bool:
+        now = datetime.utcnow()
+        try:
+            leases_collection.update_one(
+                {"_id": "outbox_worker", "$or": [{"holder": self.worker_id}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"holder": self.worker_id, "expires_at": now + timedelta(seconds=OUTBOX_LEASE_SECONDS)}},
+                upsert=True
+            )
+            self.leader = True
+        except DuplicateKeyError:
+            # Held by another live worker
+            self.leader = False
+        return self.leader
+    
+    def release_lease(self):
+        if self.leader:
+            self.leader = False
+            try:
+                leases_collection.delete_one({"_id": "outbox_worker", "holder": self.worker_id})
+            except PyMongoError as e:
+                logger.warning(f"Could not release the outbox lease: {e}")
+    
+    def bootstrap(self):
+        # A projector without a checkpoint has never run: build it from scratch
+        checkpoints = self.checkpoints()
+        for name in self.projectors:
+            if name not in checkpoints:
+                self.rebuild(name)
+    
+    # Rebuilds from the source collections and resumes after everything
+    # recorded before the rebuild started. Changes recorded while it runs are
+    # applied again afterwards, which projectors tolerate.
+    def rebuild(self, name: str):
+        head = self.head()
+        self.projectors[name].rebuild()
+        self.save_checkpoint(name, head, force=True)
+        logger.info(f"Read model {name} rebuilt at outbox seq {head}")
+    
+    def replay(self, name: str, from_seq: int):
+        oldest = outbox_collection.find_one({"seq": {"$exists": True}}, {"_id": 0, "seq": 1}, sort=[("seq", 1)])
+        if oldest and from_seq < oldest["seq"] - 1:
+            raise ValueError(f"Outbox changes before seq {oldest['seq']} have expired, rebuild {name} instead")
+        self.save_checkpoint(name, from_seq, force=True)
+    
+    def status(self) -> dict:
+        head = self.head()
+        checkpoints = self.checkpoints()
+        return {
+            **self.stats,
+            "leader": self.leader,
+            "head": head,
+            "projectors": {
+                name: {
+                    "checkpoint": checkpoints.get(name),
+                    "lag": head - checkpoints[name] if name in checkpoints else None
+                }
+                for name in self.projectors
+            }
+        }
+    
+    def start(self):
+        if self.acquire_lease():
+            self.bootstrap()
+        
+        if OUTBOX_CHANGE_STREAMS and supports_transactions():
+            try:
+                self.stream = outbox_collection.watch(
+                    [{"$match": {"operationType": "insert"}}],
+                    max_await_time_ms=int(OUTBOX_POLL_INTERVAL_SECONDS * 1000)
+                )
+                self.stats["mode"] = "change_stream"
+            except PyMongoError as e:
+                logger.warning(f"Outbox change stream unavailable, polling instead: {e}")
+        self.task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.close_stream()
+        self.release_lease()
+    
+    def close_stream(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+            self.stats["mode"] = "polling"
+    
+    async def run(self):
+        while True:
+            processed = 0
+            try:
+                if self.acquire_lease():
+                    processed = self.poll()
+            except PyMongoError as e:
+                logger.error(f"Outbox worker failed: {e}")
+            
+            if processed >= OUTBOX_BATCH_SIZE:
+                await asyncio.sleep(0)
+            elif self.leader:
+                await self.wait_for_changes()
+            else:
+                await asyncio.sleep(OUTBOX_POLL_INTERVAL_SECONDS)
+    
+    # The change stream is only a wakeup: changes are always read back from the
+    # outbox in seq order, so checkpoints mean the same thing in both modes
+    async def wait_for_changes(self):
+        if self.stream is None:
+            await asyncio.sleep(OUTBOX_POLL_INTERVAL_SECONDS)
+            return
+        try:
+            await run_in_threadpool(self.stream.try_next)
+        except PyMongoError as e:
+            logger.warning(f"Outbox change stream failed, polling instead: {e}")
+            self.close_stream()
+    
+    # Numbers committed pending records in the order they are seen. Only the
+    # lease holder runs this, so seqs are handed out by one writer at a time.
+    def sequence(self) -> int:
+        pending = list(outbox_collection.find({"pending": True}, {"_id": 1}).sort("_id", 1).limit(OUTBOX_BATCH_SIZE))
+        if not pending:
+            return 0
+        counter = counters_collection.find_one_and_update(
+            {"_id": "outbox"},
+            {"$inc": {"seq": len(pending)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        first_seq = counter["seq"] - len(pending) + 1
+        now = datetime.utcnow()
+        outbox_collection.bulk_write([
+            UpdateOne(
+                {"_id": record["_id"], "pending": True},
+                {"$set": {"seq": first_seq + index, "sequenced_at": now}, "$unset": {"pending": ""}}
+            )
+            for index, record in enumerate(pending)
+        ], ordered=True)
+        return len(pending)
+    
+    def poll(self) -> int:
+        self.sequence()
+        checkpoints = self.checkpoints()
+        if len(checkpoints) < len(self.projectors):
+            # Taking over from a leader that stopped before bootstrapping
+            self.bootstrap()
+            checkpoints = self.checkpoints()
+        if not checkpoints:
+            return 0
+        after = min(checkpoints.values())
+        changes = self.contiguous(after, list(
+            outbox_collection.find({"seq": {"$gt": after}}, {"_id": 0}).sort("seq", 1).limit(OUTBOX_BATCH_SIZE)
+        ))
+        if not changes:
+            return 0
+        
+        last_seq = changes[-1]["seq"]
+        for name, projector in self.projectors.items():
+            checkpoint = checkpoints.get(name)
+            if checkpoint is None or checkpoint >= last_seq:
+                continue
+            pending = [change for change in changes if change["seq"] > checkpoint and change["entity"] in projector.entities]
+            try:
+                if pending:
+                    projector.apply(pending)
+            except PyMongoError as e:
+                # Left at its checkpoint and retried on the next poll
+                logger.error(f"Projector {name} failed at outbox seq {pending[0]['seq']}: {e}")
+                self.stats["errors"] += 1
+                continue
+            self.save_checkpoint(name, last_seq)
+        
+        self.stats["batches"] += 1
+        self.stats["changes"] += len(changes)
+        return len(changes)
+    
+    # Seqs are only handed out to committed records, so a hole means a sequence
+    # step that was cut short (the leader died between taking seqs from the
+    # counter and numbering the records) or one still running on a leader whose
+    # lease just ran out. Stop at the hole until the record after it was
+    # numbered OUTBOX_GAP_TIMEOUT_SECONDS ago, then give up on it.
+    def contiguous(self, after: int, changes: List[dict]) -> List[dict]:
+        cutoff = datetime.utcnow() - timedelta(seconds=OUTBOX_GAP_TIMEOUT_SECONDS)
+        expected = after + 1
+        for index, change in enumerate(changes):
+            if change["seq"] != expected:
+                if change["sequenced_at"] > cutoff:
+                    return changes[:index]
+                logger.warning(f"Skipping missing outbox seqs {expected}-{change['seq'] - 1}")
+                self.stats["skipped_seqs"] += change["seq"] - expected
+            expected = change["seq"] + 1
+        return changes
+
+outbox_worker = OutboxWorker()
+
+def changed_ids(changes: List[dict], entity: str, fields: Optional[Iterable[str]] = None) -> List[str]:
+    fields = set(fields) if fields is not None else None
+    return list({
+        change["entity_id"]
+        for change in changes
+        if change["entity"] == entity and (fields is None or change["operation"] != "updated" or fields & set(change["fields"]))
+    })
@@ -0,0 +1,295 @@
+from pymongo import ReplaceOne, UpdateMany, UpdateOne
+
+import argparse
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+from config import FEED_FANOUT_LIMIT
+from database import connect, connections_collection, course_catalog_collection, courses_collection, endorsement_counts_collection, endorsements_collection, get_users_by_ids, mentor_index_collection, mentorships_collection, projects_collection, users_collection
+from feed import add_pull_actor, connection_ids
+from models import CourseStatus, MentorshipStatus
+from outbox import Projector, changed_ids, outbox_worker
+
+logger = logging.getLogger(__name__)
+
+# Endorsement counts read model
+# Per (user, skill) counters maintained by endorse_skill; rebuilt from the
+# endorsements collection on first deploy.
+def rebuild_endorsement_counts():
+    counts = endorsements_collection.aggregate([
+        {"$group": {
+            "_id": {"user_id": "$user_id", "skill": "$skill"},
+            "count": {"$sum": 1},
+            "last_endorsed_at": {"$max": "$created_at"}
+        }}
+    ])
+    
+    batch = []
+    for row in counts:
+        batch.append(ReplaceOne(
+            {"user_id": row["_id"]["user_id"], "skill": row["_id"]["skill"]},
+            {
+                "user_id": row["_id"]["user_id"],
+                "skill": row["_id"]["skill"],
+                "count": row["count"],
+                "last_endorsed_at": row["last_endorsed_at"]
+            },
+            upsert=True
+        ))
+        if len(batch) >= 500:
+            endorsement_counts_collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        endorsement_counts_collection.bulk_write(batch, ordered=False)
+    
+    logger.info("Endorsement counts rebuilt")
+
+# Course catalog read model
+# Denormalized course cards (course fields plus instructor name/country) so the
+# catalog page is served without per-course instructor lookups.
+CATALOG_COURSE_DEFAULTS = {
+    "course_id": None,
+    "instructor_id": None,
+    "title": "",
+    "description": "",
+    "category": None,
+    "level": None,
+    "duration_hours": 0,
+    "price": 0.0,
+    "thumbnail_url": "",
+    "learning_objectives": [],
+    "skills_gained": [],
+    "status": CourseStatus.DRAFT,
+    "enrollment_count": 0,
+    "average_rating": 0.0,
+    "review_count": 0,
+    "created_at": None
+}
+
+def build_catalog_entry(course: dict, instructor: Optional[dict]) -> dict:
+    entry = {field: course.get(field, default) for field, default in CATALOG_COURSE_DEFAULTS.items()}
+    entry["instructor_name"] = instructor["full_name"] if instructor else "Unknown"
+    entry["instructor_country"] = instructor["country"] if instructor else "Unknown"
+    return entry
+
+def refresh_course_catalog_entry(course_id: str):
+    course = courses_collection.find_one({"course_id": course_id})
+    if not course:
+        course_catalog_collection.delete_one({"course_id": course_id})
+        return
+    
+    instructor = users_collection.find_one(
+        {"user_id": course["instructor_id"]},
+        {"full_name": 1, "country": 1}
+    )
+    course_catalog_collection.replace_one(
+        {"course_id": course_id},
+        build_catalog_entry(course, instructor),
+        upsert=True
+    )
+
+def rebuild_course_catalog(batch_size: int = 500):
+    batch = []
+    
+    def flush(courses):
+        instructor_ids = list({course["instructor_id"] for course in courses})
+        instructors = {
+            user["user_id"]: user
+            for user in users_collection.find(
+                {"user_id": {"$in": instructor_ids}},
+                {"user_id": 1, "full_name": 1, "country": 1}
+            )
+        }
+        course_catalog_collection.bulk_write([
+            ReplaceOne(
+                {"course_id": course["course_id"]},
+                build_catalog_entry(course, instructors.get(course["instructor_id"])),
+                upsert=True
+            )
+            for course in courses
+        ], ordered=False)
+    
+    for course in courses_collection.find():
+        batch.append(course)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    
+    logger.info("Course catalog rebuilt")
+
+# Mentor directory index
+# One entry per user with skills, keyed by lowercased skill and language, with
+# active_mentorships kept as a counter by update_mentorship_status.
+def build_mentor_index_entry(user: dict) -> dict:
+    skills = user.get("skills", [])
+    languages = user.get("languages", [])
+    return {
+        "user_id": user["user_id"],
+        "full_name": user["full_name"],
+        "country": user["country"],
+        "bio": user.get("bio", ""),
+        "skills": skills,
+        "skill_keys": sorted({skill.strip().lower() for skill in skills if skill.strip()}),
+        "work_experience": user.get("work_experience", ""),
+        "languages": languages,
+        "language_keys": sorted({language.strip().lower() for language in languages if language.strip()}),
+        "updated_at": datetime.utcnow()
+    }
+
+def refresh_mentor_index_entry(user: dict):
+    if not user.get("skills"):
+        mentor_index_collection.delete_one({"user_id": user["user_id"]})
+        return
+    
+    existing_entry = mentor_index_collection.find_one({"user_id": user["user_id"]}, {"_id": 1})
+    update = {"$set": build_mentor_index_entry(user)}
+    if not existing_entry:
+        update["$setOnInsert"] = {
+            "active_mentorships": mentorships_collection.count_documents({
+                "mentor_id": user["user_id"],
+                "status": MentorshipStatus.ACTIVE
+            })
+        }
+    mentor_index_collection.update_one({"user_id": user["user_id"]}, update, upsert=True)
+
+def rebuild_mentor_index(batch_size: int = 500):
+    active_counts = {
+        row["_id"]: row["count"]
+        for row in mentorships_collection.aggregate([
+            {"$match": {"status": MentorshipStatus.ACTIVE}},
+            {"$group": {"_id": "$mentor_id", "count": {"$sum": 1}}}
+        ])
+    }
+    
+    batch = []
+    for user in users_collection.find({"skills.0": {"$exists": True}}, {"hashed_password": 0}):
+        entry = build_mentor_index_entry(user)
+        entry["active_mentorships"] = active_counts.get(user["user_id"], 0)
+        batch.append(ReplaceOne({"user_id": user["user_id"]}, entry, upsert=True))
+        if len(batch) >= batch_size:
+            mentor_index_collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        mentor_index_collection.bulk_write(batch, ordered=False)
+    
+    logger.info("Mentor index rebuilt")
+
+# Connection counts
+# users.connection_count is maintained by accept_connection and decides whether
+# an actor's broadcasts are fanned out on write or pulled at read time (see
+# feed.py); rebuilt from accepted connections on first deploy.
+def rebuild_connection_counts(batch_size: int = 500):
+    counts = connections_collection.aggregate([
+        {"$match": {"status": "accepted"}},
+        {"$project": {"user_ids": ["$requester_id", "$target_id"]}},
+        {"$unwind": "$user_ids"},
+        {"$group": {"_id": "$user_ids", "count": {"$sum": 1}}}
+    ])
+    
+    batch = []
+    high_degree = []
+    for row in counts:
+        batch.append(UpdateOne({"user_id": row["_id"]}, {"$set": {"connection_count": row["count"]}}))
+        if row["count"] >= FEED_FANOUT_LIMIT:
+            high_degree.append(row["_id"])
+        if len(batch) >= batch_size:
+            users_collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        users_collection.bulk_write(batch, ordered=False)
+    users_collection.update_many({"connection_count": {"$exists": False}}, {"$set": {"connection_count": 0}})
+    
+    for user_id in high_degree:
+        add_pull_actor(user_id, connection_ids(user_id))
+    
+    logger.info(f"Connection counts rebuilt ({len(high_degree)} high-degree users)")
+
+# Outbox projectors
+# Denormalized copies of user details, kept current by the outbox worker when
+# a profile changes instead of on the profile update request itself.
+CREATOR_FIELDS = ("full_name", "country")
+
+class ProjectCreatorProjector(Projector):
+    name = "project_creators"
+    entities = ("user",)
+    
+    def apply(self, changes: List[dict]):
+        self.refresh(changed_ids(changes, "user", CREATOR_FIELDS))
+    
+    def rebuild(self, batch_size: int = 500):
+        creator_ids = [row["_id"] for row in projects_collection.aggregate([{"$group": {"_id": "$creator_id"}}])]
+        for start in range(0, len(creator_ids), batch_size):
+            self.refresh(creator_ids[start:start + batch_size])
+    
+    @staticmethod
+    def refresh(user_ids: List[str]):
+        users = get_users_by_ids(user_ids)
+        operations = [
+            UpdateMany({"creator_id": user_id}, {"$set": {
+                "creator_name": users[user_id]["full_name"] if user_id in users else "Unknown",
+                "creator_country": users[user_id]["country"] if user_id in users else "Unknown"
+            }})
+            for user_id in user_ids
+        ]
+        if operations:
+            projects_collection.bulk_write(operations, ordered=False)
+
+class InstructorCatalogProjector(Projector):
+    name = "course_catalog_instructors"
+    entities = ("user",)
+    
+    def apply(self, changes: List[dict]):
+        user_ids = changed_ids(changes, "user", CREATOR_FIELDS)
+        users = get_users_by_ids(user_ids)
+        operations = [
+            UpdateMany({"instructor_id": user_id}, {"$set": {
+                "instructor_name": users[user_id]["full_name"],
+                "instructor_country": users[user_id]["country"]
+            }})
+            for user_id in user_ids
+            if user_id in users
+        ]
+        if operations:
+            course_catalog_collection.bulk_write(operations, ordered=False)
+    
+    def rebuild(self):
+        rebuild_course_catalog()
+
+outbox_worker.register(ProjectCreatorProjector())
+outbox_worker.register(InstructorCatalogProjector())
+
+# Maintenance entry point for the outbox read models:
+#
+#   cd backend && python read_models.py status
+#   cd backend && python read_models.py replay project_creators --from-seq 1200
+#   cd backend && python read_models.py rebuild course_catalog_instructors
+#
+# replay and rebuild only move the checkpoint or rewrite the read model; a
+# running app picks up from the new checkpoint on its next poll.
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["status", "replay", "rebuild"])
+    parser.add_argument("projector", nargs="?", choices=list(outbox_worker.projectors))
+    parser.add_argument("--from-seq", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.command != "status" and not args.projector:
+        parser.error(f"{args.command} needs a projector")
+    
+    connect()
+    if args.command == "status":
+        print(outbox_worker.status())
+    elif args.command == "replay":
+        try:
+            outbox_worker.replay(args.projector, args.from_seq)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"{args.projector} will replay from outbox seq {args.from_seq}")
+    else:
+        outbox_worker.rebuild(args.projector)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from datetime import datetime, timedelta
+import uuid
+from typing import Optional
+
+from database import RoutedReads, contributions_collection, get_users_by_ids, project_comments_collection, project_updates_collection, projects_collection, run_in_transaction, users_collection
+from models import ExportFormat, ProjectComment, ProjectContribution, ProjectProposal, ProjectStatus, ProjectUpdate
+from auth import get_current_user, rate_limit
+from shapes import PROJECT_CARD_SHAPE
+from caching import invalidate_entity, project_cache, response_cache
+from feed import publish_to_connections
+from outbox import record_change
+from scheduler import days_left, deadline_scheduler, to_naive_utc
+from exports import export_response, iter_export_batches
+
+# Crowdfunding: projects, contributions, updates and comments
+router = APIRouter()
+
+# Project endpoints
+@router.post("/api/projects")
+async def create_project(project: ProjectProposal, current_user: dict = Depends(get_current_user)):
+    project_id = str(uuid.uuid4())
+    project_doc = {
+        "project_id": project_id,
+        "creator_id": current_user["user_id"],
+        "creator_name": current_user["full_name"],
+        "creator_country": current_user["country"],
+        "title": project.title,
+        "description": project.description,
+        "category": project.category,
+        "funding_goal": project.funding_goal,
+        "funding_goal_type": project.funding_goal_type,
+        "current_funding": 0.0,
+        "funding_percentage": 0.0,
+        "contributor_count": 0,
+        "duration_months": project.duration_months,
+        "location": project.location,
+        "impact_description": project.impact_description,
+        "budget_breakdown": project.budget_breakdown,
+        "milestones": project.milestones,
+        "completed_milestones": [],
+        "images": project.images,
+        "team_members": project.team_members,
+        "risks_challenges": project.risks_challenges,
+        "sustainability_plan": project.sustainability_plan,
+        "status": ProjectStatus.PENDING_APPROVAL,
+        "featured": False,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+        "deadline": datetime.utcnow() + timedelta(days=90)  # 90 days funding period
+    }
+    
+    projects_collection.insert_one(project_doc)
+    record_change("project", project_id, "created")
+    invalidate_entity("project", project_id)
+    deadline_scheduler.schedule("project", project_id, project_doc["deadline"])
+    publish_to_connections(current_user, "project_created", "project", project_id, {
+        "title": project.title,
+        "category": project.category,
+        "location": project.location,
+        "funding_goal": project.funding_goal
+    })
+    return {"message": "Project proposal submitted successfully", "project_id": project_id}
+
+@router.get("/api/projects")
+async def get_projects(skip: int = 0, limit: int = 20, category: Optional[str] = None,
+                      status: Optional[str] = None, featured: Optional[bool] = None,
+                      location: Optional[str] = None, fields: Optional[str] = None,
+                      current_user: dict = Depends(get_current_user)):
+    selected = PROJECT_CARD_SHAPE.select(fields)
+    
+    query = {}
+    if category:
+        query["category"] = category
+    if status:
+        query["status"] = status
+    else:
+        query["status"] = {"$in": ["active", "funded", "in_progress", "completed"]}
+    if featured is not None:
+        query["featured"] = featured
+    if location:
+        query["location"] = {"$regex": location, "$options": "i"}
+    
+    with RoutedReads("projects", current_user["user_id"]) as reads:
+        projects_page = list(
+            reads.collection(projects_collection).find(query, PROJECT_CARD_SHAPE.projection(selected), session=reads.session)
+            .skip(skip).limit(limit).sort("created_at", -1)
+        )
+    
+    # Creator details are denormalized onto projects (see read_models); look up
+    # only projects written before that, in one query for the page
+    include_creator = "creator_name" in selected or "creator_country" in selected
+    creators = get_users_by_ids(
+        project["creator_id"] for project in projects_page if "creator_name" not in project
+    ) if include_creator else {}
+    
+    projects = []
+    for project in projects_page:
+        project_data = PROJECT_CARD_SHAPE.render(project, selected)
+        
+        creator = creators.get(project.get("creator_id"))
+        if "creator_name" in selected:
+            project_data["creator_name"] = project["creator_name"] if "creator_name" in project else (creator["full_name"] if creator else "Unknown")
+        if "creator_country" in selected:
+            project_data["creator_country"] = project["creator_country"] if "creator_country" in project else (creator["country"] if creator else "Unknown")
+        if "days_left" in selected:
+            project_data["days_left"] = days_left(project.get("deadline"))
+        
+        projects.append(project_data)
+    
+    return {"projects": projects}
+
+@router.get("/api/projects/{project_id}")
+async def get_project(project_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    cache_key = response_cache.key(request)
+    cached_response = response_cache.lookup(request, cache_key)
+    if cached_response:
+        return cached_response
+    
+    project = project_cache.get(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    # Get creator info
+    creator = users_collection.find_one({"user_id": project["creator_id"]})
+    
+    # Get recent contributions
+    recent_contributions = list(contributions_collection.find({
+        "project_id": project_id,
+        "anonymous": False
+    }).sort("created_at", -1).limit(10))
+    
+    for contribution in recent_contributions:
+        contributor = users_collection.find_one({"user_id": contribution["contributor_id"]})
+        contribution["contributor_name"] = contributor["full_name"] if contributor else "Anonymous"
+        contribution["contributor_country"] = contributor["country"] if contributor else ""
+    
+    # Get project updates
+    updates = list(project_updates_collection.find({
+        "project_id": project_id
+    }).sort("created_at", -1))
+    
+    project_data = {
+        "project_id": project["project_id"],
+        "title": project["title"],
+        "description": project["description"],
+        "category": project["category"],
+        "funding_goal": project["funding_goal"],
+        "funding_goal_type": project["funding_goal_type"],
+        "current_funding": project.get("current_funding", 0.0),
+        "funding_percentage": project.get("funding_percentage", 0.0),
+        "contributor_count": project.get("contributor_count", 0),
+        "duration_months": project["duration_months"],
+        "location": project["location"],
+        "impact_description": project["impact_description"],
+        "budget_breakdown": project["budget_breakdown"],
+        "milestones": project["milestones"],
+        "completed_milestones": project.get("completed_milestones", []),
+        "images": project.get("images", []),
+        "team_members": project.get("team_members", ""),
+        "risks_challenges": project.get("risks_challenges", ""),
+        "sustainability_plan": project.get("sustainability_plan", ""),
+        "status": project["status"],
+        "featured": project.get("featured", False),
+        "created_at": project["created_at"],
+        "deadline": project.get("deadline"),
+        "creator_id": project["creator_id"],
+        "creator_name": creator["full_name"] if creator else "Unknown",
+        "creator_country": creator["country"] if creator else "Unknown",
+        "creator_bio": creator.get("bio", "") if creator else "",
+        "days_left": days_left(project.get("deadline")),
+        "recent_contributions": recent_contributions,
+        "updates": updates
+    }
+    
+    return response_cache.store(request, cache_key, project_data, tags=[f"project:{project_id}"])
+
+@router.get("/api/projects/my")
+async def get_my_projects(current_user: dict = Depends(get_current_user)):
+    projects_cursor = projects_collection.find({
+        "creator_id": current_user["user_id"]
+    }).sort("created_at", -1)
+    
+    projects = []
+    for project in projects_cursor:
+        project_data = {
+            "project_id": project["project_id"],
+            "title": project["title"],
+            "category": project["category"],
+            "funding_goal": project["funding_goal"],
+            "current_funding": project.get("current_funding", 0.0),
+            "funding_percentage": project.get("funding_percentage", 0.0),
+            "contributor_count": project.get("contributor_count", 0),
+            "status": project["status"],
+            "created_at": project["created_at"],
+            "deadline": project.get("deadline"),
+            "days_left": days_left(project.get("deadline"))
+        }
+        projects.append(project_data)
+    
+    return {"projects": projects}
+
+@router.post("/api/projects/{project_id}/contribute")
+async def contribute_to_project(project_id: str, contribution: ProjectContribution, current_user: dict = Depends(get_current_user)):
+    # Get project
+    project = project_cache.get(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    deadline = to_naive_utc(project.get("deadline"))
+    if project["status"] not in ["active", "funded"] or (deadline and deadline <= datetime.utcnow()):
+        raise HTTPException(status_code=400, detail="Project is not accepting contributions")
+    
+    # Create contribution record
+    contribution_id = str(uuid.uuid4())
+    contribution_doc = {
+        "contribution_id": contribution_id,
+        "project_id": project_id,
+        "contributor_id": current_user["user_id"],
+        "amount": contribution.amount,
+        "anonymous": contribution.anonymous,
+        "message": contribution.message,
+        "created_at": datetime.utcnow()
+    }
+    
+    # Record the contribution and the project totals together. The funding
+    # update is a single pipeline that also derives the percentage and status,
+    # and it re-checks the status so a project closed since it was cached is
+    # not funded.
+    def record_contribution(session):
+        updated = projects_collection.update_one(
+            {
+                "project_id": project_id,
+                "status": {"$in": ["active", "funded"]},
+                # Past the deadline counts as closed even before the scheduler runs
+                "deadline": {"$not": {"$lte": contribution_doc["created_at"]}}
+            },
+            [
+                {"$set": {
+                    "current_funding": {"$add": ["$current_funding", contribution.amount]},
+                    "contributor_count": {"$add": [{"$ifNull": ["$contributor_count", 0]}, 1]},
+                    "updated_at": contribution_doc["created_at"]
+                }},
+                {"$set": {
+                    "funding_percentage": {"$cond": [
+                        {"$gt": ["$funding_goal", 0]},
+                        {"$multiply": [{"$divide": ["$current_funding", "$funding_goal"]}, 100]},
+                        0
+                    ]},
+                    "status": {"$cond": [
+                        {"$and": [
+                            {"$eq": ["$funding_goal_type", "fixed"]},
+                            {"$gte": ["$current_funding", "$funding_goal"]}
+                        ]},
+                        "funded",
+                        "$status"
+                    ]}
+                }}
+            ],
+            session=session
+        )
+        if not updated.matched_count:
+            raise HTTPException(status_code=400, detail="Project is not accepting contributions")
+        contributions_collection.insert_one(contribution_doc, session=session)
+        record_change("project", project_id, "updated", ["current_funding", "contributor_count", "funding_percentage", "status"], session=session)
+    
+    run_in_transaction(record_contribution)
+    invalidate_entity("project", project_id)
+    
+    return {"message": "Contribution successful", "contribution_id": contribution_id}
+
+@router.get("/api/contributions/my")
+async def get_my_contributions(current_user: dict = Depends(get_current_user)):
+    contributions_cursor = contributions_collection.find({
+        "contributor_id": current_user["user_id"]
+    }).sort("created_at", -1)
+    
+    contributions = []
+    for contribution in contributions_cursor:
+        # Get project info
+        project = projects_collection.find_one({"project_id": contribution["project_id"]})
+        
+        contribution_data = {
+            "contribution_id": contribution["contribution_id"],
+            "project_id": contribution["project_id"],
+            "project_title": project["title"] if project else "Unknown",
+            "project_status": project["status"] if project else "Unknown",
+            "amount": contribution["amount"],
+            "message": contribution.get("message", ""),
+            "created_at": contribution["created_at"]
+        }
+        contributions.append(contribution_data)
+    
+    return {"contributions": contributions}
+
+@router.post("/api/projects/{project_id}/updates")
+async def add_project_update(project_id: str, update: ProjectUpdate, current_user: dict = Depends(get_current_user)):
+    # Check if user owns the project
+    project = project_cache.get(project_id)
+    if not project or project["creator_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to update this project")
+    
+    update_id = str(uuid.uuid4())
+    update_doc = {
+        "update_id": update_id,
+        "project_id": project_id,
+        "title": update.title,
+        "content": update.content,
+        "images": update.images,
+        "milestone_completed": update.milestone_completed,
+        "created_at": datetime.utcnow()
+    }
+    
+    project_updates_collection.insert_one(update_doc)
+    
+    # Update completed milestones if specified
+    if update.milestone_completed:
+        projects_collection.update_one(
+            {"project_id": project_id},
+            {
+                "$addToSet": {"completed_milestones": update.milestone_completed},
+                "$set": {"updated_at": datetime.utcnow()}
+            }
+        )
+        record_change("project", project_id, "updated", ["completed_milestones"])
+    invalidate_entity("project", project_id)
+    
+    return {"message": "Project update added successfully", "update_id": update_id}
+
+@router.post("/api/projects/{project_id}/comments")
+async def add_project_comment(project_id: str, comment: ProjectComment, current_user: dict = Depends(get_current_user)):
+    # Check if project exists
+    project = project_cache.get(project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    comment_id = str(uuid.uuid4())
+    comment_doc = {
+        "comment_id": comment_id,
+        "project_id": project_id,
+        "commenter_id": current_user["user_id"],
+        "content": comment.content,
+        "reply_to": comment.reply_to,
+        "created_at": datetime.utcnow()
+    }
+    
+    project_comments_collection.insert_one(comment_doc)
+    return {"message": "Comment added successfully", "comment_id": comment_id}
+
+@router.get("/api/projects/{project_id}/comments")
+async def get_project_comments(project_id: str, current_user: dict = Depends(get_current_user)):
+    comments_cursor = project_comments_collection.find({
+        "project_id": project_id
+    }).sort("created_at", 1)
+    
+    comments = []
+    for comment in comments_cursor:
+        commenter = users_collection.find_one({"user_id": comment["commenter_id"]})
+        comment_data = {
+            "comment_id": comment["comment_id"],
+            "content": comment["content"],
+            "reply_to": comment.get("reply_to"),
+            "created_at": comment["created_at"],
+            "commenter_name": commenter["full_name"] if commenter else "Unknown",
+            "commenter_country": commenter["country"] if commenter else "Unknown"
+        }
+        comments.append(comment_data)
+    
+    return {"comments": comments}
+
+# Export endpoints
+@router.get("/api/export/projects/{project_id}/contributions", dependencies=[Depends(rate_limit("bulk"))])
+async def export_project_contributions(project_id: str, format: ExportFormat = ExportFormat.NDJSON,
+                                       current_user: dict = Depends(get_current_user)):
+    project = project_cache.get(project_id)
+    if not project or project["creator_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to export this project")
+    
+    def hydrate(contributions):
+        for contribution in contributions:
+            if contribution.get("anonymous"):
+                contribution["contributor_id"] = ""
+        return contributions
+    
+    cursor = contributions_collection.find({"project_id": project_id}, {"_id": 0}).sort("created_at", 1)
+    columns = ["contribution_id", "contributor_id", "amount", "anonymous", "message", "created_at"]
+    return export_response(iter_export_batches(cursor, hydrate), columns, format, f"contributions-{project_id}")
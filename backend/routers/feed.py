@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from typing import Optional
+
+from auth import get_current_user
+from feed import read_feed
+
+# Activity feed
+router = APIRouter()
+
+MAX_FEED_PAGE_SIZE = 50
+
+@router.get("/api/feed")
+async def get_feed(cursor: Optional[str] = None, limit: int = 20, current_user: dict = Depends(get_current_user)):
+    if limit < 1 or limit > MAX_FEED_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_FEED_PAGE_SIZE}")
+    
+    activities, next_cursor = read_feed(current_user["user_id"], cursor, limit)
+    return {"activities": activities, "next_cursor": next_cursor}
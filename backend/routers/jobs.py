@@ -0,0 +1,630 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from datetime import datetime
+import uuid
+import json
+import csv
+import io
+import itertools
+from typing import Optional, Tuple
+
+from database import RoutedReads, applications_collection, get_users_by_ids, jobs_collection, organizations_collection
+from models import ApplicationStatus, BulkApplicationStatusUpdate, ExportFormat, JobApplication, JobPost, OrganizationProfile
+from auth import get_current_user, rate_limit
+from shapes import JOB_CARD_SHAPE
+from caching import invalidate_entity, job_cache, organization_directory, response_cache
+from feed import build_activity, publish_activities
+from notifications import enqueue_notifications, notification_event
+from outbox import record_change, record_changes
+from scheduler import deadline_scheduler, to_naive_utc
+from exports import export_response, iter_export_batches
+
+# Jobs: organizations, job posts and applications
+router = APIRouter()
+
+# Organization endpoints
+@router.post("/api/organization/register")
+async def register_organization(org: OrganizationProfile, current_user: dict = Depends(get_current_user)):
+    # Check if organization already exists
+    if organizations_collection.find_one({"name": org.name, "contact_email": org.contact_email}):
+        raise HTTPException(status_code=400, detail="Organization already registered")
+    
+    org_id = str(uuid.uuid4())
+    org_doc = {
+        "organization_id": org_id,
+        "owner_id": current_user["user_id"],
+        "name": org.name,
+        "description": org.description,
+        "organization_type": org.organization_type,
+        "country": org.country,
+        "website": org.website,
+        "contact_email": org.contact_email,
+        "contact_phone": org.contact_phone,
+        "size": org.size,
+        "founded_year": org.founded_year,
+        "verified": False,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    
+    organizations_collection.insert_one(org_doc)
+    record_change("organization", org_id, "created")
+    org_doc.pop("_id", None)
+    organization_directory.add(org_doc)
+    response_cache.invalidate("organizations")
+    return {"message": "Organization registered successfully", "organization_id": org_id}
+
+@router.get("/api/organizations")
+async def get_organizations(request: Request, skip: int = 0, limit: int = 20, org_type: Optional[str] = None, 
+                           country: Optional[str] = None):
+    cache_key = response_cache.key(request)
+    cached_response = response_cache.lookup(request, cache_key)
+    if cached_response:
+        return cached_response
+    
+    query = {}
+    if org_type:
+        query["organization_type"] = org_type
+    if country:
+        query["country"] = {"$regex": country, "$options": "i"}
+    
+    orgs_cursor = organizations_collection.find(query).skip(skip).limit(limit)
+    organizations = []
+    
+    for org in orgs_cursor:
+        org_data = {
+            "organization_id": org["organization_id"],
+            "name": org["name"],
+            "description": org["description"],
+            "organization_type": org["organization_type"],
+            "country": org["country"],
+            "website": org.get("website", ""),
+            "size": org.get("size", ""),
+            "founded_year": org.get("founded_year"),
+            "verified": org.get("verified", False)
+        }
+        organizations.append(org_data)
+    
+    return response_cache.store(request, cache_key, {"organizations": organizations}, tags=["organizations"])
+
+# Job endpoints
+def build_job_doc(job: JobPost, org: dict, posted_by: str) -> dict:
+    return {
+        "job_id": str(uuid.uuid4()),
+        "organization_id": org["organization_id"],
+        "posted_by": posted_by,
+        "title": job.title,
+        "description": job.description,
+        "requirements": job.requirements,
+        "job_type": job.job_type,
+        "job_category": job.job_category,
+        "location_type": job.location_type,
+        "location": job.location,
+        "salary_range": job.salary_range,
+        "deadline": job.deadline,
+        "skills_required": job.skills_required,
+        "experience_level": job.experience_level,
+        "benefits": job.benefits,
+        "active": True,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+
+@router.post("/api/jobs")
+async def create_job(job: JobPost, current_user: dict = Depends(get_current_user)):
+    # Check if user has an organization
+    org = organization_directory.get_by_owner(current_user["user_id"])
+    if not org:
+        raise HTTPException(status_code=400, detail="You must register an organization first")
+    
+    job_doc = build_job_doc(job, org, current_user["user_id"])
+    job_id = job_doc["job_id"]
+    
+    jobs_collection.insert_one(job_doc)
+    record_change("job", job_id, "created")
+    invalidate_entity("job", job_id)
+    deadline_scheduler.schedule("job", job_id, job_doc["deadline"])
+    return {"message": "Job posted successfully", "job_id": job_id}
+
+# Bulk job import
+MAX_BULK_JOBS = 5000
+JOB_IMPORT_CHUNK_SIZE = 500
+JOB_LIST_FIELDS = ["requirements", "skills_required"]
+
+# A CSV row that cannot be mapped onto the header; reported as invalid
+class MalformedImportRow:
+    def __init__(self, message: str):
+        self.message = message
+
+def iter_job_import_rows(body: bytes, content_type: str):
+    if content_type.startswith("text/csv"):
+        try:
+            text = body.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+        reader = csv.DictReader(io.StringIO(text))
+        for row in reader:
+            # DictReader files surplus cells under a None key
+            if None in row:
+                yield MalformedImportRow(f"Line {reader.line_num} has {len(row[None])} more cells than the header")
+                continue
+            # List columns are ";"-separated; empty cells fall back to model defaults
+            for field in JOB_LIST_FIELDS:
+                if field in row:
+                    row[field] = [item.strip() for item in (row[field] or "").split(";") if item.strip()]
+            yield {field: value for field, value in row.items() if value != ""}
+        return
+    
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or CSV")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of jobs")
+    yield from rows
+
+# Parses the whole upload up front, so an oversized or malformed one is
+# rejected before any job is inserted
+def read_job_import_rows(body: bytes, content_type: str) -> list:
+    try:
+        rows = list(itertools.islice(iter_job_import_rows(body, content_type), MAX_BULK_JOBS + 1))
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
+    if len(rows) > MAX_BULK_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_JOBS} jobs per import")
+    return rows
+
+# Returns the validated job, or the "invalid" result to report for the row
+def validate_job_import_row(row_number: int, row) -> Tuple[Optional[JobPost], Optional[dict]]:
+    if isinstance(row, MalformedImportRow):
+        return None, {"row": row_number, "status": "invalid", "errors": [{"field": "", "message": row.message}]}
+    try:
+        return JobPost.model_validate(row), None
+    except ValidationError as e:
+        return None, {
+            "row": row_number,
+            "status": "invalid",
+            "errors": [
+                {"field": ".".join(str(part) for part in error["loc"]), "message": error["msg"]}
+                for error in e.errors()
+            ]
+        }
+
+@router.post("/api/jobs/bulk", dependencies=[Depends(rate_limit("bulk"))])
+async def bulk_import_jobs(request: Request, current_user: dict = Depends(get_current_user)):
+    # Look the organization up once for the whole import
+    org = organization_directory.get_by_owner(current_user["user_id"])
+    if not org:
+        raise HTTPException(status_code=400, detail="You must register an organization first")
+    
+    body = await request.body()
+    results = []
+    chunk = []
+    
+    def flush(chunk):
+        try:
+            jobs_collection.insert_many([job_doc for _, job_doc in chunk], ordered=False)
+            failed = {}
+        except BulkWriteError as e:
+            failed = {error["index"]: error["errmsg"] for error in e.details.get("writeErrors", [])}
+        
+        for index, (row_number, job_doc) in enumerate(chunk):
+            if index in failed:
+                results.append({"row": row_number, "status": "failed", "errors": [failed[index]]})
+            else:
+                results.append({"row": row_number, "status": "created", "job_id": job_doc["job_id"]})
+                deadline_scheduler.schedule("job", job_doc["job_id"], job_doc["deadline"])
+        record_changes("job", [job_doc["job_id"] for index, (_, job_doc) in enumerate(chunk) if index not in failed], "created")
+    
+    rows = read_job_import_rows(body, request.headers.get("content-type", ""))
+    
+    # Validate row by row and insert valid rows in chunks
+    for row_number, row in enumerate(rows):
+        job, invalid = validate_job_import_row(row_number, row)
+        if invalid:
+            results.append(invalid)
+            continue
+        
+        chunk.append((row_number, build_job_doc(job, org, current_user["user_id"])))
+        if len(chunk) >= JOB_IMPORT_CHUNK_SIZE:
+            flush(chunk)
+            chunk = []
+    
+    if chunk:
+        flush(chunk)
+    
+    results.sort(key=lambda result: result["row"])
+    created_count = sum(1 for result in results if result["status"] == "created")
+    return {
+        "message": f"Imported {created_count} of {len(results)} jobs",
+        "created_count": created_count,
+        "failed_count": len(results) - created_count,
+        "results": results
+    }
+
+@router.get("/api/jobs")
+async def get_jobs(skip: int = 0, limit: int = 20, job_type: Optional[str] = None,
+                  job_category: Optional[str] = None, location: Optional[str] = None,
+                  skills: Optional[str] = None, fields: Optional[str] = None,
+                  current_user: dict = Depends(get_current_user)):
+    selected = JOB_CARD_SHAPE.select(fields)
+    
+    query = {"active": True}
+    if job_type:
+        query["job_type"] = job_type
+    if job_category:
+        query["job_category"] = job_category
+    if location:
+        query["location"] = {"$regex": location, "$options": "i"}
+    if skills:
+        query["skills_required"] = {"$regex": skills, "$options": "i"}
+    
+    with RoutedReads("jobs", current_user["user_id"]) as reads:
+        jobs_page = list(
+            reads.collection(jobs_collection).find(query, JOB_CARD_SHAPE.projection(selected), session=reads.session)
+            .skip(skip).limit(limit).sort("created_at", -1)
+        )
+    jobs = []
+    
+    for job in jobs_page:
+        job_data = JOB_CARD_SHAPE.render(job, selected)
+        
+        # Get organization info
+        if "organization_name" in selected or "organization_type" in selected:
+            org = organization_directory.get(job["organization_id"])
+            if "organization_name" in selected:
+                job_data["organization_name"] = org["name"] if org else "Unknown"
+            if "organization_type" in selected:
+                job_data["organization_type"] = org["organization_type"] if org else "Unknown"
+        
+        jobs.append(job_data)
+    
+    return {"jobs": jobs}
+
+@router.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    cache_key = response_cache.key(request)
+    cached_response = response_cache.lookup(request, cache_key)
+    if cached_response:
+        return cached_response
+    
+    job = job_cache.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # Get organization info
+    org = organization_directory.get(job["organization_id"])
+    
+    job_data = {
+        "job_id": job["job_id"],
+        "title": job["title"],
+        "description": job["description"],
+        "requirements": job["requirements"],
+        "job_type": job["job_type"],
+        "job_category": job["job_category"],
+        "location_type": job["location_type"],
+        "location": job["location"],
+        "salary_range": job.get("salary_range", ""),
+        "deadline": job.get("deadline"),
+        "skills_required": job["skills_required"],
+        "experience_level": job.get("experience_level", ""),
+        "benefits": job.get("benefits", ""),
+        "created_at": job["created_at"],
+        "organization_name": org["name"] if org else "Unknown",
+        "organization_type": org["organization_type"] if org else "Unknown",
+        "organization_description": org["description"] if org else "",
+        "organization_website": org.get("website", "") if org else ""
+    }
+    
+    return response_cache.store(request, cache_key, job_data, tags=[f"job:{job_id}"])
+
+@router.get("/api/jobs/recommended")
+async def get_recommended_jobs(current_user: dict = Depends(get_current_user)):
+    # Get user skills
+    user_skills = current_user.get("skills", [])
+    if not user_skills:
+        return {"jobs": []}
+    
+    # Find jobs that match user skills
+    jobs_cursor = jobs_collection.find({
+        "active": True,
+        "skills_required": {"$in": user_skills}
+    }).sort("created_at", -1).limit(10)
+    
+    jobs = []
+    for job in jobs_cursor:
+        org = organization_directory.get(job["organization_id"])
+        
+        # Calculate match score
+        matching_skills = set(user_skills) & set(job["skills_required"])
+        match_score = len(matching_skills) / len(job["skills_required"]) * 100
+        
+        job_data = {
+            "job_id": job["job_id"],
+            "title": job["title"],
+            "description": job["description"],
+            "job_type": job["job_type"],
+            "job_category": job["job_category"],
+            "location": job["location"],
+            "skills_required": job["skills_required"],
+            "matching_skills": list(matching_skills),
+            "match_score": round(match_score, 1),
+            "organization_name": org["name"] if org else "Unknown",
+            "created_at": job["created_at"]
+        }
+        jobs.append(job_data)
+    
+    # Sort by match score
+    jobs.sort(key=lambda x: x["match_score"], reverse=True)
+    
+    return {"jobs": jobs}
+
+# Application endpoints
+@router.post("/api/jobs/{job_id}/apply")
+async def apply_job(job_id: str, application: JobApplication, current_user: dict = Depends(get_current_user)):
+    # Check if job exists
+    job = job_cache.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    # The cached job can lag the deadline scheduler, so check the deadline too
+    deadline = to_naive_utc(job.get("deadline"))
+    if not job.get("active") or (deadline is not None and deadline <= datetime.utcnow()):
+        raise HTTPException(status_code=400, detail="This job is no longer accepting applications")
+    
+    # One application per user and job, enforced by a unique index
+    application_id = str(uuid.uuid4())
+    application_doc = {
+        "application_id": application_id,
+        "job_id": job_id,
+        "applicant_id": current_user["user_id"],
+        "cover_letter": application.cover_letter,
+        "portfolio_links": application.portfolio_links,
+        "status": ApplicationStatus.APPLIED,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    
+    try:
+        applications_collection.insert_one(application_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="You have already applied for this job")
+    record_change("application", application_id, "created")
+    return {"message": "Application submitted successfully", "application_id": application_id}
+
+@router.get("/api/applications")
+async def get_user_applications(current_user: dict = Depends(get_current_user)):
+    applications_cursor = applications_collection.find({
+        "applicant_id": current_user["user_id"]
+    }).sort("created_at", -1)
+    
+    applications = []
+    for app in applications_cursor:
+        # Get job info
+        job = job_cache.get(app["job_id"])
+        org = organization_directory.get(job["organization_id"]) if job else None
+        
+        app_data = {
+            "application_id": app["application_id"],
+            "job_id": app["job_id"],
+            "job_title": job["title"] if job else "Unknown",
+            "organization_name": org["name"] if org else "Unknown",
+            "status": app["status"],
+            "applied_at": app["created_at"],
+            "cover_letter": app.get("cover_letter", ""),
+            "portfolio_links": app.get("portfolio_links", "")
+        }
+        applications.append(app_data)
+    
+    return {"applications": applications}
+
+@router.get("/api/organization/applications")
+async def get_organization_applications(skip: int = 0, limit: int = 50, job_id: Optional[str] = None,
+                                        status: Optional[ApplicationStatus] = None,
+                                        current_user: dict = Depends(get_current_user)):
+    # Get user's organization
+    org = organization_directory.get_by_owner(current_user["user_id"])
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    # Get all jobs for this organization
+    job_titles = {
+        job["job_id"]: job["title"]
+        for job in jobs_collection.find({"organization_id": org["organization_id"]}, {"job_id": 1, "title": 1})
+    }
+    if job_id and job_id not in job_titles:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job_ids = [job_id] if job_id else list(job_titles)
+    
+    # Per-status counts for every job in the pipeline, in one aggregation
+    pipeline_counts = {
+        pipeline_job_id: {"job_id": pipeline_job_id, "job_title": job_titles[pipeline_job_id], "total": 0, "counts": {}}
+        for pipeline_job_id in job_ids
+    }
+    for row in applications_collection.aggregate([
+        {"$match": {"job_id": {"$in": job_ids}}},
+        {"$group": {"_id": {"job_id": "$job_id", "status": "$status"}, "count": {"$sum": 1}}}
+    ]):
+        job_counts = pipeline_counts[row["_id"]["job_id"]]
+        job_counts["counts"][row["_id"]["status"]] = row["count"]
+        job_counts["total"] += row["count"]
+    
+    query = {"job_id": {"$in": job_ids}}
+    if status:
+        query["status"] = status
+        total = sum(job_counts["counts"].get(status, 0) for job_counts in pipeline_counts.values())
+    else:
+        total = sum(job_counts["total"] for job_counts in pipeline_counts.values())
+    
+    applications_page = list(
+        applications_collection.find(query).sort("created_at", -1).skip(skip).limit(limit)
+    )
+    
+    # Hydrate applicants for the page with one query
+    applicants = get_users_by_ids(
+        (app["applicant_id"] for app in applications_page),
+        fields=("full_name", "email", "country", "skills")
+    )
+    
+    applications = []
+    for app in applications_page:
+        applicant = applicants.get(app["applicant_id"])
+        
+        app_data = {
+            "application_id": app["application_id"],
+            "job_id": app["job_id"],
+            "job_title": job_titles.get(app["job_id"], "Unknown"),
+            "applicant_name": applicant["full_name"] if applicant else "Unknown",
+            "applicant_email": applicant["email"] if applicant else "Unknown",
+            "applicant_country": applicant["country"] if applicant else "Unknown",
+            "applicant_skills": applicant.get("skills", []) if applicant else [],
+            "status": app["status"],
+            "applied_at": app["created_at"],
+            "cover_letter": app.get("cover_letter", ""),
+            "portfolio_links": app.get("portfolio_links", "")
+        }
+        applications.append(app_data)
+    
+    return {
+        "applications": applications,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "status_counts": list(pipeline_counts.values())
+    }
+
+def application_status_activity(owner: dict, org: dict, application: dict, job: dict, status: ApplicationStatus) -> dict:
+    return build_activity("application_status_changed", owner["user_id"], org["name"], "application", application["application_id"], {
+        "job_id": application["job_id"],
+        "job_title": job["title"] if job else None,
+        "status": status
+    })
+
+def application_status_notification(org: dict, application: dict, job: dict, status: ApplicationStatus) -> dict:
+    job_title = job["title"] if job else "a job"
+    return notification_event(application["applicant_id"], "application_status", f"Your application for {job_title} is now {ApplicationStatus(status).value}", {
+        "application_id": application["application_id"],
+        "job_id": application["job_id"],
+        "organization_name": org["name"],
+        "status": status
+    })
+
+@router.put("/api/applications/{application_id}/status")
+async def update_application_status(application_id: str, status: ApplicationStatus, current_user: dict = Depends(get_current_user)):
+    # Get application
+    application = applications_collection.find_one({"application_id": application_id})
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    
+    # Check if user owns the organization that posted the job
+    job = jobs_collection.find_one({"job_id": application["job_id"]})
+    org = organization_directory.get(job["organization_id"])
+    
+    if org["owner_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to update this application")
+    
+    applications_collection.update_one(
+        {"application_id": application_id},
+        {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+    )
+    
+    if application["status"] != status:
+        publish_activities([(application_status_activity(current_user, org, application, job, status), [application["applicant_id"]])])
+        enqueue_notifications([application_status_notification(org, application, job, status)])
+        record_change("application", application_id, "updated", ["status"])
+    
+    return {"message": "Application status updated successfully"}
+
+MAX_BULK_APPLICATION_UPDATES = 1000
+
+@router.put("/api/applications/bulk-status", dependencies=[Depends(rate_limit("bulk"))])
+async def bulk_update_application_status(update: BulkApplicationStatusUpdate, current_user: dict = Depends(get_current_user)):
+    application_ids = list(dict.fromkeys(update.application_ids))
+    if len(application_ids) > MAX_BULK_APPLICATION_UPDATES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_APPLICATION_UPDATES} applications per request")
+    
+    org = organization_directory.get_by_owner(current_user["user_id"])
+    if not org:
+        raise HTTPException(status_code=403, detail="Not authorized to update these applications")
+    
+    jobs = {job["job_id"]: job for job in jobs_collection.find({"organization_id": org["organization_id"]}, {"_id": 0, "job_id": 1, "title": 1})}
+    
+    # Authorize the whole batch in one query: only applications to this org's jobs match
+    authorized_applications = list(applications_collection.find(
+        {"application_id": {"$in": application_ids}, "job_id": {"$in": list(jobs)}},
+        {"_id": 0, "application_id": 1, "applicant_id": 1, "job_id": 1, "status": 1}
+    ))
+    authorized_ids = [application["application_id"] for application in authorized_applications]
+    
+    updated_count = 0
+    if authorized_ids:
+        now = datetime.utcnow()
+        result = applications_collection.bulk_write([
+            UpdateOne(
+                {"application_id": application_id},
+                {"$set": {"status": update.status, "updated_at": now}}
+            )
+            for application_id in authorized_ids
+        ], ordered=False)
+        updated_count = result.modified_count
+        
+        changed = [application for application in authorized_applications if application["status"] != update.status]
+        publish_activities([
+            (application_status_activity(current_user, org, application, jobs.get(application["job_id"]), update.status), [application["applicant_id"]])
+            for application in changed
+        ])
+        enqueue_notifications([
+            application_status_notification(org, application, jobs.get(application["job_id"]), update.status)
+            for application in changed
+        ])
+        record_changes("application", [application["application_id"] for application in changed], "updated", ["status"])
+    
+    authorized = set(authorized_ids)
+    return {
+        "message": "Application statuses updated successfully",
+        "updated_count": updated_count,
+        "rejected_ids": [application_id for application_id in application_ids if application_id not in authorized]
+    }
+
+# Export endpoints
+@router.get("/api/export/organization/applications", dependencies=[Depends(rate_limit("bulk"))])
+async def export_organization_applications(job_id: Optional[str] = None, status: Optional[ApplicationStatus] = None,
+                                           format: ExportFormat = ExportFormat.NDJSON,
+                                           current_user: dict = Depends(get_current_user)):
+    org = organization_directory.get_by_owner(current_user["user_id"])
+    if not org:
+        raise HTTPException(status_code=404, detail="Organization not found")
+    
+    job_titles = {
+        job["job_id"]: job["title"]
+        for job in jobs_collection.find({"organization_id": org["organization_id"]}, {"job_id": 1, "title": 1})
+    }
+    if job_id and job_id not in job_titles:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    query = {"job_id": {"$in": [job_id] if job_id else list(job_titles)}}
+    if status:
+        query["status"] = status
+    
+    def hydrate(applications):
+        applicants = get_users_by_ids(
+            (application["applicant_id"] for application in applications),
+            fields=("full_name", "email", "country")
+        )
+        for application in applications:
+            applicant = applicants.get(application["applicant_id"], {})
+            application["job_title"] = job_titles.get(application["job_id"], "Unknown")
+            application["applicant_name"] = applicant.get("full_name", "Unknown")
+            application["applicant_email"] = applicant.get("email", "")
+            application["applicant_country"] = applicant.get("country", "")
+        return applications
+    
+    cursor = applications_collection.find(query, {"_id": 0}).sort("created_at", -1)
+    columns = [
+        "application_id", "job_id", "job_title", "applicant_id", "applicant_name", "applicant_email",
+        "applicant_country", "status", "created_at", "updated_at", "cover_letter", "portfolio_links"
+    ]
+    return export_response(iter_export_batches(cursor, hydrate), columns, format, "applications")
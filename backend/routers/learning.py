@@ -0,0 +1,780 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from datetime import datetime
+import uuid
+import hmac
+import hashlib
+import json
+from collections import OrderedDict
+from typing import List, Optional
+
+from config import CERTIFICATE_CACHE_SIZE, CERTIFICATE_SIGNING_KEY, MENTOR_CAPACITY
+from database import RoutedReads, certificates_collection, course_catalog_collection, course_lessons_collection, course_modules_collection, course_reviews_collection, courses_collection, enrollments_collection, get_users_by_ids, learning_progress_collection, mentor_index_collection, mentorships_collection, run_in_transaction, users_collection
+from models import CertificateType, Course, CourseLesson, CourseModule, CourseReview, CourseStatus, EnrollmentStatus, ExportFormat, LessonProgressBatch, MentorshipRequest, MentorshipStatus
+from auth import get_current_user, rate_limit
+from middleware import CustomJSONResponse
+from caching import course_cache, invalidate_entity, response_cache
+from read_models import refresh_course_catalog_entry
+from notifications import enqueue_notifications, notification_event
+from outbox import record_change
+from exports import export_response, iter_export_batches
+
+# Learning: courses, progress, certificates and mentorship
+router = APIRouter()
+
+# Educational Platform Endpoints
+@router.post("/api/courses")
+async def create_course(course: Course, current_user: dict = Depends(get_current_user)):
+    course_id = str(uuid.uuid4())
+    course_doc = {
+        "course_id": course_id,
+        "instructor_id": current_user["user_id"],
+        "title": course.title,
+        "description": course.description,
+        "category": course.category,
+        "level": course.level,
+        "duration_hours": course.duration_hours,
+        "price": course.price,
+        "thumbnail_url": course.thumbnail_url,
+        "learning_objectives": course.learning_objectives,
+        "prerequisites": course.prerequisites,
+        "skills_gained": course.skills_gained,
+        "certificate_type": course.certificate_type,
+        "status": CourseStatus.DRAFT,
+        "enrollment_count": 0,
+        "average_rating": 0.0,
+        "review_count": 0,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    
+    courses_collection.insert_one(course_doc)
+    record_change("course", course_id, "created")
+    refresh_course_catalog_entry(course_id)
+    invalidate_entity("course", course_id)
+    return {"message": "Course created successfully", "course_id": course_id}
+
+@router.get("/api/courses")
+async def get_courses(skip: int = 0, limit: int = 20, category: Optional[str] = None,
+                     level: Optional[str] = None, free_only: Optional[bool] = None,
+                     current_user: dict = Depends(get_current_user)):
+    query = {"status": CourseStatus.PUBLISHED}
+    if category:
+        query["category"] = category
+    if level:
+        query["level"] = level
+    if free_only:
+        query["price"] = 0.0
+    
+    with RoutedReads("courses", current_user["user_id"]) as reads:
+        # Course cards come straight from the catalog read model
+        courses = list(
+            reads.collection(course_catalog_collection).find(query, {"_id": 0, "instructor_id": 0, "status": 0}, session=reads.session)
+            .sort("created_at", -1).skip(skip).limit(limit)
+        )
+        
+        # Resolve the caller's enrollments for the whole page in one query
+        enrollments = {
+            enrollment["course_id"]: enrollment
+            for enrollment in reads.collection(enrollments_collection).find(
+                {
+                    "student_id": current_user["user_id"],
+                    "course_id": {"$in": [course["course_id"] for course in courses]}
+                },
+                {"_id": 0, "course_id": 1, "status": 1},
+                session=reads.session
+            )
+        }
+    
+    for course in courses:
+        enrollment = enrollments.get(course["course_id"])
+        course["is_enrolled"] = bool(enrollment)
+        course["enrollment_status"] = enrollment.get("status") if enrollment else None
+    
+    return {"courses": courses}
+
+@router.get("/api/courses/{course_id}")
+async def get_course(course_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    # The response carries the caller's enrollment and progress, so entries are per user
+    cache_key = response_cache.key(request, current_user["user_id"])
+    cached_response = response_cache.lookup(request, cache_key)
+    if cached_response:
+        return cached_response
+    
+    course = course_cache.get(course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    
+    # Get instructor info
+    instructor = users_collection.find_one({"user_id": course["instructor_id"]})
+    
+    # Get course modules
+    modules = list(course_modules_collection.find({
+        "course_id": course_id
+    }).sort("order_index", 1))
+    
+    for module in modules:
+        # Get lessons for each module
+        lessons = list(course_lessons_collection.find({
+            "module_id": module["module_id"]
+        }).sort("order_index", 1))
+        module["lessons"] = lessons
+    
+    # Check if current user is enrolled
+    enrollment = enrollments_collection.find_one({
+        "course_id": course_id,
+        "student_id": current_user["user_id"]
+    })
+    
+    # Get recent reviews
+    reviews = list(course_reviews_collection.find({
+        "course_id": course_id
+    }).sort("created_at", -1).limit(5))
+    
+    for review in reviews:
+        reviewer = users_collection.find_one({"user_id": review["reviewer_id"]})
+        review["reviewer_name"] = reviewer["full_name"] if reviewer else "Anonymous"
+        review["reviewer_country"] = reviewer["country"] if reviewer else ""
+    
+    course_data = {
+        "course_id": course["course_id"],
+        "title": course["title"],
+        "description": course["description"],
+        "category": course["category"],
+        "level": course["level"],
+        "duration_hours": course["duration_hours"],
+        "price": course["price"],
+        "thumbnail_url": course.get("thumbnail_url", ""),
+        "learning_objectives": course["learning_objectives"],
+        "prerequisites": course.get("prerequisites", []),
+        "skills_gained": course["skills_gained"],
+        "certificate_type": course["certificate_type"],
+        "enrollment_count": course.get("enrollment_count", 0),
+        "average_rating": course.get("average_rating", 0.0),
+        "review_count": course.get("review_count", 0),
+        "created_at": course["created_at"],
+        "instructor_id": course["instructor_id"],
+        "instructor_name": instructor["full_name"] if instructor else "Unknown",
+        "instructor_country": instructor["country"] if instructor else "Unknown",
+        "instructor_bio": instructor.get("bio", "") if instructor else "",
+        "is_enrolled": bool(enrollment),
+        "enrollment_status": enrollment.get("status") if enrollment else None,
+        "progress_percentage": enrollment.get("progress_percentage", 0) if enrollment else 0,
+        "modules": modules,
+        "recent_reviews": reviews
+    }
+    
+    return response_cache.store(
+        request, cache_key, course_data,
+        tags=[f"course:{course_id}", f"course:{course_id}:{current_user['user_id']}"],
+        private=True
+    )
+
+@router.post("/api/courses/{course_id}/enroll")
+async def enroll_in_course(course_id: str, current_user: dict = Depends(get_current_user)):
+    # Check if course exists
+    course = course_cache.get(course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    
+    # Create enrollment (one per student and course, enforced by a unique index)
+    enrollment_id = str(uuid.uuid4())
+    enrollment_doc = {
+        "enrollment_id": enrollment_id,
+        "course_id": course_id,
+        "student_id": current_user["user_id"],
+        "status": EnrollmentStatus.ACTIVE,
+        "progress_percentage": 0,
+        "enrolled_at": datetime.utcnow(),
+        "last_accessed": datetime.utcnow()
+    }
+    
+    def record_enrollment(session):
+        enrollments_collection.insert_one(enrollment_doc, session=session)
+        
+        # Update course enrollment count
+        courses_collection.update_one(
+            {"course_id": course_id},
+            {"$inc": {"enrollment_count": 1}},
+            session=session
+        )
+        record_change("course", course_id, "updated", ["enrollment_count"], session=session)
+    
+    try:
+        run_in_transaction(record_enrollment)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already enrolled in this course")
+    refresh_course_catalog_entry(course_id)
+    invalidate_entity("course", course_id)
+    
+    return {"message": "Successfully enrolled in course", "enrollment_id": enrollment_id}
+
+@router.get("/api/courses/my-courses")
+async def get_my_courses(current_user: dict = Depends(get_current_user)):
+    # Get user's enrollments
+    enrollments_cursor = enrollments_collection.find({
+        "student_id": current_user["user_id"]
+    }).sort("enrolled_at", -1)
+    
+    courses = []
+    for enrollment in enrollments_cursor:
+        # Get course info
+        course = course_cache.get(enrollment["course_id"])
+        if course:
+            instructor = users_collection.find_one({"user_id": course["instructor_id"]})
+            
+            course_data = {
+                "course_id": course["course_id"],
+                "title": course["title"],
+                "category": course["category"],
+                "level": course["level"],
+                "duration_hours": course["duration_hours"],
+                "thumbnail_url": course.get("thumbnail_url", ""),
+                "instructor_name": instructor["full_name"] if instructor else "Unknown",
+                "enrollment_status": enrollment["status"],
+                "progress_percentage": enrollment.get("progress_percentage", 0),
+                "enrolled_at": enrollment["enrolled_at"],
+                "last_accessed": enrollment.get("last_accessed")
+            }
+            courses.append(course_data)
+    
+    return {"courses": courses}
+
+@router.post("/api/courses/{course_id}/review")
+async def add_course_review(course_id: str, review: CourseReview, current_user: dict = Depends(get_current_user)):
+    # Check if course exists
+    course = course_cache.get(course_id)
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    
+    # Check if user is enrolled
+    enrollment = enrollments_collection.find_one({
+        "course_id": course_id,
+        "student_id": current_user["user_id"]
+    })
+    
+    if not enrollment:
+        raise HTTPException(status_code=400, detail="You must be enrolled to review this course")
+    
+    # One review per user and course, enforced by a unique index
+    review_id = str(uuid.uuid4())
+    review_doc = {
+        "review_id": review_id,
+        "course_id": course_id,
+        "reviewer_id": current_user["user_id"],
+        "rating": review.rating,
+        "review_text": review.review_text,
+        "created_at": datetime.utcnow()
+    }
+    
+    def record_review(session):
+        course_reviews_collection.insert_one(review_doc, session=session)
+        
+        # Update course average rating from a running total. Courses rated
+        # before rating_total existed seed it from their average and count.
+        courses_collection.update_one(
+            {"course_id": course_id},
+            [
+                {"$set": {
+                    "rating_total": {"$add": [
+                        {"$ifNull": ["$rating_total", {"$multiply": [
+                            {"$ifNull": ["$average_rating", 0]},
+                            {"$ifNull": ["$review_count", 0]}
+                        ]}]},
+                        review.rating
+                    ]},
+                    "review_count": {"$add": [{"$ifNull": ["$review_count", 0]}, 1]}
+                }},
+                {"$set": {"average_rating": {"$divide": ["$rating_total", "$review_count"]}}}
+            ],
+            session=session
+        )
+        record_change("course", course_id, "updated", ["rating_total", "review_count", "average_rating"], session=session)
+    
+    try:
+        run_in_transaction(record_review)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="You have already reviewed this course")
+    refresh_course_catalog_entry(course_id)
+    invalidate_entity("course", course_id)
+    
+    return {"message": "Review added successfully", "review_id": review_id}
+
+# Course content endpoints
+@router.post("/api/courses/{course_id}/modules")
+async def add_course_module(course_id: str, module: CourseModule, current_user: dict = Depends(get_current_user)):
+    course = course_cache.get(course_id)
+    if not course or course["instructor_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to edit this course")
+    
+    module_id = str(uuid.uuid4())
+    module_doc = {
+        "module_id": module_id,
+        "course_id": course_id,
+        "title": module.title,
+        "description": module.description,
+        "order_index": module.order_index,
+        "duration_minutes": module.duration_minutes,
+        "created_at": datetime.utcnow()
+    }
+    
+    course_modules_collection.insert_one(module_doc)
+    invalidate_entity("course", course_id)
+    return {"message": "Module added successfully", "module_id": module_id}
+
+@router.post("/api/courses/{course_id}/lessons")
+async def add_course_lesson(course_id: str, lesson: CourseLesson, current_user: dict = Depends(get_current_user)):
+    course = course_cache.get(course_id)
+    if not course or course["instructor_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to edit this course")
+    
+    if not course_modules_collection.find_one({"module_id": lesson.module_id, "course_id": course_id}):
+        raise HTTPException(status_code=404, detail="Module not found")
+    
+    lesson_id = str(uuid.uuid4())
+    lesson_doc = {
+        "lesson_id": lesson_id,
+        "module_id": lesson.module_id,
+        "course_id": course_id,
+        "title": lesson.title,
+        "description": lesson.description,
+        "content": lesson.content,
+        "lesson_type": lesson.lesson_type,
+        "content_url": lesson.content_url,
+        "order_index": lesson.order_index,
+        "duration_minutes": lesson.duration_minutes,
+        "created_at": datetime.utcnow()
+    }
+    
+    # Each lesson owns a fixed bit in the per-enrollment completion bitset. The
+    # count and the lesson commit together, so a failed insert cannot leave a
+    # counted bit without a lesson.
+    def create_lesson(session):
+        course = courses_collection.find_one_and_update(
+            {"course_id": course_id},
+            {"$inc": {"lesson_count": 1}},
+            projection={"lesson_count": 1},
+            return_document=ReturnDocument.AFTER,
+            session=session
+        )
+        course_lessons_collection.insert_one({**lesson_doc, "bit_index": course["lesson_count"] - 1}, session=session)
+        record_change("course", course_id, "updated", ["lesson_count"], session=session)
+    
+    run_in_transaction(create_lesson)
+    invalidate_entity("course", course_id)
+    return {"message": "Lesson added successfully", "lesson_id": lesson_id}
+
+# Learning progress endpoints
+MAX_PROGRESS_EVENTS = 500
+PROGRESS_UPDATE_RETRIES = 5
+
+def set_lesson_bits(bitset: bytes, bit_indexes: List[int]):
+    bits = bytearray(bitset)
+    newly_set = []
+    for bit_index in bit_indexes:
+        byte_index, mask = bit_index >> 3, 1 << (bit_index & 7)
+        if byte_index >= len(bits):
+            bits.extend(b"\x00" * (byte_index + 1 - len(bits)))
+        if not bits[byte_index] & mask:
+            bits[byte_index] |= mask
+            newly_set.append(bit_index)
+    return bytes(bits), newly_set
+
+def iter_lesson_bits(bitset: bytes):
+    for byte_index, byte in enumerate(bitset):
+        while byte:
+            low_bit = byte & -byte
+            yield (byte_index << 3) + low_bit.bit_length() - 1
+            byte ^= low_bit
+
+def calculate_progress_percentage(completed_count: int, total_lessons: int) -> float:
+    if not total_lessons:
+        return 0
+    return min(round(completed_count / total_lessons * 100, 1), 100)
+
+# Read fresh: the cached course can predate lessons added since, and
+# completion must not be decided against a stale count
+def current_lesson_count(course_id: str) -> int:
+    course = courses_collection.find_one({"course_id": course_id}, {"_id": 0, "lesson_count": 1})
+    return course.get("lesson_count", 0) if course else 0
+
+@router.post("/api/courses/{course_id}/progress")
+async def record_lesson_progress(course_id: str, batch: LessonProgressBatch, current_user: dict = Depends(get_current_user)):
+    if len(batch.events) > MAX_PROGRESS_EVENTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_PROGRESS_EVENTS} events per request")
+    
+    enrollment = enrollments_collection.find_one({
+        "course_id": course_id,
+        "student_id": current_user["user_id"]
+    })
+    if not enrollment:
+        raise HTTPException(status_code=400, detail="You must be enrolled to record progress")
+    
+    total_lessons = current_lesson_count(course_id)
+    
+    # Resolve every lesson in the batch with one query
+    lesson_ids = list({event.lesson_id for event in batch.events})
+    lessons = {
+        lesson["lesson_id"]: lesson["bit_index"]
+        for lesson in course_lessons_collection.find(
+            {"course_id": course_id, "lesson_id": {"$in": lesson_ids}, "bit_index": {"$exists": True}},
+            {"_id": 0, "lesson_id": 1, "bit_index": 1}
+        )
+    }
+    unknown_lessons = [lesson_id for lesson_id in lesson_ids if lesson_id not in lessons]
+    
+    # Optimistic read-modify-write of the completion bitset
+    for _ in range(PROGRESS_UPDATE_RETRIES):
+        progress = learning_progress_collection.find_one({"enrollment_id": enrollment["enrollment_id"]})
+        bitset = progress["completed_lessons"] if progress else b""
+        completed_count = progress.get("completed_count", 0) if progress else 0
+        
+        bitset, newly_set = set_lesson_bits(bitset, list(lessons.values()))
+        if not newly_set:
+            break
+        
+        completed_count += len(newly_set)
+        update = {
+            "completed_lessons": bitset,
+            "completed_count": completed_count,
+            "updated_at": datetime.utcnow()
+        }
+        
+        if progress:
+            result = learning_progress_collection.update_one(
+                {"enrollment_id": enrollment["enrollment_id"], "version": progress.get("version", 0)},
+                {"$set": update, "$inc": {"version": 1}}
+            )
+            if result.modified_count:
+                break
+        else:
+            try:
+                learning_progress_collection.insert_one({
+                    "enrollment_id": enrollment["enrollment_id"],
+                    "course_id": course_id,
+                    "student_id": current_user["user_id"],
+                    "version": 1,
+                    "created_at": datetime.utcnow(),
+                    **update
+                })
+                break
+            except DuplicateKeyError:
+                continue
+    else:
+        raise HTTPException(status_code=409, detail="Progress was updated concurrently, please retry")
+    
+    progress_percentage = calculate_progress_percentage(completed_count, total_lessons)
+    # Compared on counts: the rounded percentage reaches 100 a lesson early on large courses
+    completed = total_lessons > 0 and completed_count >= total_lessons
+    enrollment_update = {
+        "progress_percentage": progress_percentage,
+        "last_accessed": datetime.utcnow()
+    }
+    if completed and enrollment["status"] == EnrollmentStatus.ACTIVE:
+        enrollment_update["status"] = EnrollmentStatus.COMPLETED
+        enrollment_update["completed_at"] = datetime.utcnow()
+    
+    enrollments_collection.update_one(
+        {"enrollment_id": enrollment["enrollment_id"]},
+        {"$set": enrollment_update}
+    )
+    response_cache.invalidate(f"course:{course_id}:{current_user['user_id']}")
+    
+    certificate_id = None
+    if completed:
+        certificate_id = issue_certificate(enrollment)["certificate_id"]
+    
+    return {
+        "certificate_id": certificate_id,
+        "progress_percentage": progress_percentage,
+        "completed_lessons": completed_count,
+        "total_lessons": total_lessons,
+        "newly_completed": [lesson_id for lesson_id, bit_index in lessons.items() if bit_index in newly_set],
+        "unknown_lessons": unknown_lessons
+    }
+
+@router.get("/api/courses/{course_id}/progress")
+async def get_lesson_progress(course_id: str, current_user: dict = Depends(get_current_user)):
+    enrollment = enrollments_collection.find_one({
+        "course_id": course_id,
+        "student_id": current_user["user_id"]
+    })
+    if not enrollment:
+        raise HTTPException(status_code=404, detail="Enrollment not found")
+    
+    # Same fresh read as record_lesson_progress, so both agree on completion
+    total_lessons = current_lesson_count(course_id)
+    
+    progress = learning_progress_collection.find_one({"enrollment_id": enrollment["enrollment_id"]})
+    completed_bits = list(iter_lesson_bits(progress["completed_lessons"])) if progress else []
+    
+    completed_lesson_ids = [
+        lesson["lesson_id"]
+        for lesson in course_lessons_collection.find(
+            {"course_id": course_id, "bit_index": {"$in": completed_bits}},
+            {"_id": 0, "lesson_id": 1}
+        )
+    ] if completed_bits else []
+    
+    return {
+        "enrollment_id": enrollment["enrollment_id"],
+        "status": enrollment["status"],
+        "progress_percentage": calculate_progress_percentage(len(completed_bits), total_lessons),
+        "completed_lessons": len(completed_bits),
+        "total_lessons": total_lessons,
+        "completed_lesson_ids": completed_lesson_ids,
+        "last_accessed": enrollment.get("last_accessed")
+    }
+
+# Certificate endpoints
+CERTIFICATE_SIGNED_FIELDS = [
+    "certificate_id", "certificate_type", "course_id", "course_title",
+    "student_id", "student_name", "instructor_name", "skills_gained", "issued_at"
+]
+
+def sign_certificate(certificate: dict) -> str:
+    payload = {field: certificate.get(field) for field in CERTIFICATE_SIGNED_FIELDS}
+    message = json.dumps(jsonable_encoder(payload), sort_keys=True, separators=(",", ":"))
+    return hmac.new(CERTIFICATE_SIGNING_KEY.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+def issue_certificate(enrollment: dict) -> dict:
+    # One certificate per enrollment; the unique index makes issuance idempotent
+    existing_certificate = certificates_collection.find_one({"enrollment_id": enrollment["enrollment_id"]})
+    if existing_certificate:
+        return existing_certificate
+    
+    course = course_cache.get(enrollment["course_id"])
+    if not course:
+        raise HTTPException(status_code=404, detail="Course not found")
+    
+    student = users_collection.find_one({"user_id": enrollment["student_id"]}, {"full_name": 1})
+    instructor = users_collection.find_one({"user_id": course["instructor_id"]}, {"full_name": 1})
+    
+    # Mongo stores milliseconds; truncate so the signature survives a round trip
+    issued_at = datetime.utcnow()
+    issued_at = issued_at.replace(microsecond=issued_at.microsecond // 1000 * 1000)
+    
+    certificate_doc = {
+        "certificate_id": str(uuid.uuid4()),
+        "enrollment_id": enrollment["enrollment_id"],
+        "certificate_type": course.get("certificate_type", CertificateType.COMPLETION),
+        "course_id": course["course_id"],
+        "course_title": course["title"],
+        "student_id": enrollment["student_id"],
+        "student_name": student["full_name"] if student else "Unknown",
+        "instructor_name": instructor["full_name"] if instructor else "Unknown",
+        "skills_gained": course.get("skills_gained", []),
+        "issued_at": issued_at
+    }
+    certificate_doc["signature"] = sign_certificate(certificate_doc)
+    
+    try:
+        certificates_collection.insert_one(certificate_doc)
+    except DuplicateKeyError:
+        return certificates_collection.find_one({"enrollment_id": enrollment["enrollment_id"]})
+    
+    return certificate_doc
+
+# Certificates never change once issued, so rendered verification bodies are
+# cached for the life of the process and served with an immutable Cache-Control.
+certificate_verification_cache = OrderedDict()
+
+def render_certificate_verification(certificate: dict) -> bytes:
+    verification = {
+        field: certificate.get(field) for field in CERTIFICATE_SIGNED_FIELDS
+    }
+    verification["signature"] = certificate["signature"]
+    verification["valid"] = hmac.compare_digest(certificate["signature"], sign_certificate(certificate))
+    return CustomJSONResponse(verification).body
+
+@router.get("/api/certificates/{certificate_id}/verify")
+async def verify_certificate(certificate_id: str):
+    body = certificate_verification_cache.get(certificate_id)
+    if body is None:
+        certificate = certificates_collection.find_one({"certificate_id": certificate_id}, {"_id": 0})
+        if not certificate:
+            raise HTTPException(status_code=404, detail="Certificate not found")
+        
+        body = render_certificate_verification(certificate)
+        certificate_verification_cache[certificate_id] = body
+        if len(certificate_verification_cache) > CERTIFICATE_CACHE_SIZE:
+            certificate_verification_cache.popitem(last=False)
+    else:
+        certificate_verification_cache.move_to_end(certificate_id)
+    
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "ETag": f'"{certificate_id}"'
+        }
+    )
+
+@router.get("/api/certificates/my")
+async def get_my_certificates(current_user: dict = Depends(get_current_user)):
+    certificates = list(certificates_collection.find(
+        {"student_id": current_user["user_id"]},
+        {"_id": 0}
+    ).sort("issued_at", -1))
+    
+    return {"certificates": certificates}
+
+# Mentor endpoints
+@router.get("/api/mentors", dependencies=[Depends(rate_limit("search"))])
+async def get_mentors(skill_area: Optional[str] = None, language: Optional[str] = None,
+                      available_only: bool = False, skip: int = 0, limit: int = 20,
+                      current_user: dict = Depends(get_current_user)):
+    query = {"user_id": {"$ne": current_user["user_id"]}}
+    if skill_area:
+        query["skill_keys"] = skill_area.strip().lower()
+    if language:
+        query["language_keys"] = language.strip().lower()
+    if available_only:
+        query["active_mentorships"] = {"$lt": MENTOR_CAPACITY}
+    
+    # Rank by spare capacity: mentors with the fewest active mentorships first
+    mentors_cursor = mentor_index_collection.find(
+        query,
+        {"_id": 0, "skill_keys": 0, "language_keys": 0, "updated_at": 0}
+    ).sort([("active_mentorships", 1), ("full_name", 1)]).skip(skip).limit(limit + 1)
+    
+    mentors = list(mentors_cursor)
+    has_more = len(mentors) > limit
+    mentors = mentors[:limit]
+    
+    for mentor in mentors:
+        mentor["available_slots"] = max(MENTOR_CAPACITY - mentor.get("active_mentorships", 0), 0)
+    
+    return {"mentors": mentors, "has_more": has_more}
+
+@router.post("/api/mentorship/request")
+async def request_mentorship(request: MentorshipRequest, current_user: dict = Depends(get_current_user)):
+    # Check if mentor exists
+    mentor = users_collection.find_one({"user_id": request.mentor_id})
+    if not mentor:
+        raise HTTPException(status_code=404, detail="Mentor not found")
+    
+    # Check if mentorship already exists
+    existing_mentorship = mentorships_collection.find_one({
+        "mentor_id": request.mentor_id,
+        "mentee_id": current_user["user_id"],
+        "status": {"$in": ["pending", "active"]}
+    })
+    
+    if existing_mentorship:
+        raise HTTPException(status_code=400, detail="Mentorship request already exists")
+    
+    mentorship_id = str(uuid.uuid4())
+    mentorship_doc = {
+        "mentorship_id": mentorship_id,
+        "mentor_id": request.mentor_id,
+        "mentee_id": current_user["user_id"],
+        "skill_area": request.skill_area,
+        "goals": request.goals,
+        "duration_weeks": request.duration_weeks,
+        "message": request.message,
+        "status": MentorshipStatus.PENDING,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    
+    mentorships_collection.insert_one(mentorship_doc)
+    record_change("mentorship", mentorship_id, "created")
+    return {"message": "Mentorship request sent successfully", "mentorship_id": mentorship_id}
+
+@router.get("/api/mentorship/my-mentorships")
+async def get_my_mentorships(current_user: dict = Depends(get_current_user)):
+    # Get mentorships where user is mentor
+    as_mentor = list(mentorships_collection.find({
+        "mentor_id": current_user["user_id"]
+    }).sort("created_at", -1))
+    
+    # Get mentorships where user is mentee
+    as_mentee = list(mentorships_collection.find({
+        "mentee_id": current_user["user_id"]
+    }).sort("created_at", -1))
+    
+    # Populate user data
+    for mentorship in as_mentor:
+        mentee = users_collection.find_one({"user_id": mentorship["mentee_id"]})
+        mentorship["mentee_name"] = mentee["full_name"] if mentee else "Unknown"
+        mentorship["mentee_country"] = mentee["country"] if mentee else "Unknown"
+    
+    for mentorship in as_mentee:
+        mentor = users_collection.find_one({"user_id": mentorship["mentor_id"]})
+        mentorship["mentor_name"] = mentor["full_name"] if mentor else "Unknown"
+        mentorship["mentor_country"] = mentor["country"] if mentor else "Unknown"
+    
+    return {
+        "as_mentor": as_mentor,
+        "as_mentee": as_mentee
+    }
+
+@router.put("/api/mentorship/{mentorship_id}/status")
+async def update_mentorship_status(mentorship_id: str, status: MentorshipStatus, current_user: dict = Depends(get_current_user)):
+    mentorship = mentorships_collection.find_one({"mentorship_id": mentorship_id})
+    if not mentorship:
+        raise HTTPException(status_code=404, detail="Mentorship not found")
+    
+    # Only mentor can accept/reject, both can complete/cancel
+    if status in ["active"] and mentorship["mentor_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Only mentor can accept requests")
+    
+    if mentorship["mentor_id"] != current_user["user_id"] and mentorship["mentee_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    # Transition only from the status we read, so the mentor counter stays exact
+    result = mentorships_collection.update_one(
+        {"mentorship_id": mentorship_id, "status": mentorship["status"]},
+        {"$set": {"status": status, "updated_at": datetime.utcnow()}}
+    )
+    if not result.modified_count and mentorship["status"] != status:
+        raise HTTPException(status_code=409, detail="Mentorship status changed, please retry")
+    
+    was_active = mentorship["status"] == MentorshipStatus.ACTIVE
+    is_active = status == MentorshipStatus.ACTIVE
+    if result.modified_count and was_active != is_active:
+        mentor_index_collection.update_one(
+            {"user_id": mentorship["mentor_id"]},
+            {"$inc": {"active_mentorships": 1 if is_active else -1}}
+        )
+    
+    # Record the change and tell the other side of the mentorship
+    if result.modified_count:
+        record_change("mentorship", mentorship_id, "updated", ["status"])
+        recipient_id = mentorship["mentee_id"] if current_user["user_id"] == mentorship["mentor_id"] else mentorship["mentor_id"]
+        enqueue_notifications([notification_event(
+            recipient_id, "mentorship_status",
+            f"{current_user['full_name']} set your {mentorship['skill_area']} mentorship to {MentorshipStatus(status).value}",
+            {"mentorship_id": mentorship_id, "status": status, "updated_by": current_user["user_id"]}
+        )])
+    
+    return {"message": "Mentorship status updated successfully"}
+
+# Export endpoints
+@router.get("/api/export/courses/{course_id}/enrollments", dependencies=[Depends(rate_limit("bulk"))])
+async def export_course_enrollments(course_id: str, format: ExportFormat = ExportFormat.NDJSON,
+                                    current_user: dict = Depends(get_current_user)):
+    course = course_cache.get(course_id)
+    if not course or course["instructor_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=403, detail="Not authorized to export this course")
+    
+    def hydrate(enrollments):
+        students = get_users_by_ids(enrollment["student_id"] for enrollment in enrollments)
+        for enrollment in enrollments:
+            student = students.get(enrollment["student_id"], {})
+            enrollment["student_name"] = student.get("full_name", "Unknown")
+            enrollment["student_country"] = student.get("country", "")
+        return enrollments
+    
+    cursor = enrollments_collection.find({"course_id": course_id}, {"_id": 0}).sort("enrolled_at", 1)
+    columns = [
+        "enrollment_id", "student_id", "student_name", "student_country", "status",
+        "progress_percentage", "enrolled_at", "completed_at", "last_accessed"
+    ]
+    return export_response(iter_export_batches(cursor, hydrate), columns, format, f"enrollments-{course_id}")
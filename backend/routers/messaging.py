@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from datetime import datetime
+import uuid
+
+from database import connections_collection, messages_collection
+from models import Message
+from auth import get_current_user, rate_limit
+from notifications import enqueue_notifications, notification_event
+
+# Messaging between connected users
+router = APIRouter()
+
+# Message endpoints (existing)
+@router.post("/api/messages", dependencies=[Depends(rate_limit("messaging"))])
+async def send_message(message: Message, current_user: dict = Depends(get_current_user)):
+    # Check if users are connected
+    connection = connections_collection.find_one({
+        "$or": [
+            {"requester_id": current_user["user_id"], "target_id": message.recipient_id, "status": "accepted"},
+            {"requester_id": message.recipient_id, "target_id": current_user["user_id"], "status": "accepted"}
+        ]
+    })
+    
+    if not connection:
+        raise HTTPException(status_code=403, detail="You can only message connected users")
+    
+    message_doc = {
+        "message_id": str(uuid.uuid4()),
+        "sender_id": current_user["user_id"],
+        "recipient_id": message.recipient_id,
+        "content": message.content,
+        "created_at": datetime.utcnow(),
+        "read": False
+    }
+    
+    messages_collection.insert_one(message_doc)
+    enqueue_notifications([notification_event(
+        message.recipient_id, "message", f"New message from {current_user['full_name']}",
+        {"message_id": message_doc["message_id"], "sender_id": current_user["user_id"], "preview": message.content[:100]}
+    )])
+    return {"message": "Message sent"}
+
+@router.get("/api/messages/{other_user_id}", dependencies=[Depends(rate_limit("messaging"))])
+async def get_messages(other_user_id: str, current_user: dict = Depends(get_current_user)):
+    # Get messages between current user and other user
+    messages_cursor = messages_collection.find({
+        "$or": [
+            {"sender_id": current_user["user_id"], "recipient_id": other_user_id},
+            {"sender_id": other_user_id, "recipient_id": current_user["user_id"]}
+        ]
+    }).sort("created_at", 1)
+    
+    messages = []
+    for message in messages_cursor:
+        message_data = {
+            "message_id": message["message_id"],
+            "sender_id": message["sender_id"],
+            "recipient_id": message["recipient_id"],
+            "content": message["content"],
+            "created_at": message["created_at"],
+            "read": message.get("read", False)
+        }
+        messages.append(message_data)
+    
+    return {"messages": messages}
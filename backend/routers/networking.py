@@ -0,0 +1,369 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pymongo.errors import DuplicateKeyError
+
+from datetime import datetime, timedelta
+import uuid
+from typing import Optional
+
+from config import ACCESS_TOKEN_EXPIRE_MINUTES
+from database import RoutedReads, connections_collection, endorsement_counts_collection, endorsements_collection, get_users_by_ids, run_in_transaction, users_collection
+from models import ConnectionRequest, SkillEndorsement, Token, UserLogin, UserProfile, UserRegister
+from auth import create_access_token, get_current_user, get_password_hash, rate_limit, verify_password
+from shapes import USER_CARD_SHAPE
+from caching import response_cache
+from feed import build_activity, increment_connection_count, publish_activities, register_connection
+from read_models import refresh_mentor_index_entry
+from notifications import enqueue_notifications, notification_event
+from outbox import record_change
+
+# Networking: accounts, profiles, connections and skill endorsements
+router = APIRouter()
+
+@router.post("/api/register", response_model=Token, dependencies=[Depends(rate_limit("auth"))])
+async def register(user: UserRegister):
+    # Check if user already exists
+    if users_collection.find_one({"email": user.email}):
+        raise HTTPException(status_code=400, detail="Email already registered")
+    
+    # Create new user
+    user_id = str(uuid.uuid4())
+    hashed_password = get_password_hash(user.password)
+    
+    user_doc = {
+        "user_id": user_id,
+        "email": user.email,
+        "hashed_password": hashed_password,
+        "full_name": user.full_name,
+        "country": user.country,
+        "age": user.age,
+        "bio": "",
+        "skills": [],
+        "interests": [],
+        "education": "",
+        "goals": "",
+        "current_projects": "",
+        "languages": [],
+        "phone": "",
+        "linkedin": "",
+        "work_experience": "",
+        "portfolio_url": "",
+        "availability": "",
+        "profile_image": "",
+        "connection_count": 0,
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow()
+    }
+    
+    users_collection.insert_one(user_doc)
+    record_change("user", user_id, "created")
+    
+    # Create access token
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user_id}, expires_delta=access_token_expires
+    )
+    
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.post("/api/login", response_model=Token, dependencies=[Depends(rate_limit("auth"))])
+async def login(user: UserLogin):
+    db_user = users_collection.find_one({"email": user.email})
+    if not db_user or not verify_password(user.password, db_user["hashed_password"]):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": db_user["user_id"]}, expires_delta=access_token_expires
+    )
+    
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/api/profile")
+async def get_profile(current_user: dict = Depends(get_current_user)):
+    user_profile = {
+        "user_id": current_user["user_id"],
+        "email": current_user["email"],
+        "full_name": current_user["full_name"],
+        "country": current_user["country"],
+        "age": current_user["age"],
+        "bio": current_user.get("bio", ""),
+        "skills": current_user.get("skills", []),
+        "interests": current_user.get("interests", []),
+        "education": current_user.get("education", ""),
+        "goals": current_user.get("goals", ""),
+        "current_projects": current_user.get("current_projects", ""),
+        "languages": current_user.get("languages", []),
+        "phone": current_user.get("phone", ""),
+        "linkedin": current_user.get("linkedin", ""),
+        "work_experience": current_user.get("work_experience", ""),
+        "portfolio_url": current_user.get("portfolio_url", ""),
+        "availability": current_user.get("availability", ""),
+        "profile_image": current_user.get("profile_image", "")
+    }
+    return user_profile
+
+@router.put("/api/profile")
+async def update_profile(profile: UserProfile, current_user: dict = Depends(get_current_user)):
+    update_data = profile.dict()
+    update_data["updated_at"] = datetime.utcnow()
+    
+    users_collection.update_one(
+        {"user_id": current_user["user_id"]},
+        {"$set": update_data}
+    )
+    
+    # Catalog cards and project creator names follow through the outbox
+    record_change("user", current_user["user_id"], "updated", list(update_data))
+    refresh_mentor_index_entry({**current_user, **update_data})
+    
+    return {"message": "Profile updated successfully"}
+
+@router.get("/api/users", dependencies=[Depends(rate_limit("search"))])
+async def get_users(skip: int = 0, limit: int = 20, country: Optional[str] = None, 
+                   skill: Optional[str] = None, fields: Optional[str] = None,
+                   current_user: dict = Depends(get_current_user)):
+    selected = USER_CARD_SHAPE.select(fields)
+    
+    # Build query
+    query = {"user_id": {"$ne": current_user["user_id"]}}
+    if country:
+        query["country"] = {"$regex": country, "$options": "i"}
+    if skill:
+        query["skills"] = {"$regex": skill, "$options": "i"}
+    
+    # Get users
+    with RoutedReads("users", current_user["user_id"]) as reads:
+        users_cursor = reads.collection(users_collection).find(
+            query, USER_CARD_SHAPE.projection(selected), session=reads.session
+        ).skip(skip).limit(limit)
+        users = [USER_CARD_SHAPE.render(user, selected) for user in users_cursor]
+    
+    return {"users": users}
+
+@router.get("/api/user/{user_id}")
+async def get_user(user_id: str, current_user: dict = Depends(get_current_user)):
+    user = users_collection.find_one({"user_id": user_id})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    user_data = {
+        "user_id": user["user_id"],
+        "full_name": user["full_name"],
+        "country": user["country"],
+        "age": user["age"],
+        "bio": user.get("bio", ""),
+        "skills": user.get("skills", []),
+        "interests": user.get("interests", []),
+        "education": user.get("education", ""),
+        "goals": user.get("goals", ""),
+        "current_projects": user.get("current_projects", ""),
+        "languages": user.get("languages", []),
+        "work_experience": user.get("work_experience", ""),
+        "portfolio_url": user.get("portfolio_url", ""),
+        "availability": user.get("availability", ""),
+        "profile_image": user.get("profile_image", "")
+    }
+    
+    return user_data
+
+# Connection endpoints (existing)
+@router.post("/api/connect")
+async def send_connection_request(connection: ConnectionRequest, current_user: dict = Depends(get_current_user)):
+    # Check if connection already exists
+    existing_connection = connections_collection.find_one({
+        "$or": [
+            {"requester_id": current_user["user_id"], "target_id": connection.target_user_id},
+            {"requester_id": connection.target_user_id, "target_id": current_user["user_id"]}
+        ]
+    })
+    
+    if existing_connection:
+        raise HTTPException(status_code=400, detail="Connection already exists")
+    
+    # Create connection request
+    connection_doc = {
+        "connection_id": str(uuid.uuid4()),
+        "requester_id": current_user["user_id"],
+        "target_id": connection.target_user_id,
+        "message": connection.message,
+        "status": "pending",
+        "created_at": datetime.utcnow()
+    }
+    
+    connections_collection.insert_one(connection_doc)
+    enqueue_notifications([notification_event(
+        connection.target_user_id, "connection_request", f"{current_user['full_name']} wants to connect with you",
+        {"connection_id": connection_doc["connection_id"], "requester_id": current_user["user_id"], "message": connection.message}
+    )])
+    return {"message": "Connection request sent"}
+
+@router.get("/api/connections")
+async def get_connections(current_user: dict = Depends(get_current_user)):
+    # Get pending requests received
+    pending_requests = list(connections_collection.find({
+        "target_id": current_user["user_id"],
+        "status": "pending"
+    }))
+    
+    # Get accepted connections
+    accepted_connections = list(connections_collection.find({
+        "$or": [
+            {"requester_id": current_user["user_id"], "status": "accepted"},
+            {"target_id": current_user["user_id"], "status": "accepted"}
+        ]
+    }))
+    
+    # Populate user data
+    for request in pending_requests:
+        requester = users_collection.find_one({"user_id": request["requester_id"]})
+        request["requester_name"] = requester["full_name"] if requester else "Unknown"
+        request["requester_country"] = requester["country"] if requester else "Unknown"
+    
+    for connection in accepted_connections:
+        # Determine the other user
+        other_user_id = connection["target_id"] if connection["requester_id"] == current_user["user_id"] else connection["requester_id"]
+        other_user = users_collection.find_one({"user_id": other_user_id})
+        connection["other_user_name"] = other_user["full_name"] if other_user else "Unknown"
+        connection["other_user_country"] = other_user["country"] if other_user else "Unknown"
+        connection["other_user_id"] = other_user_id
+    
+    return {
+        "pending_requests": pending_requests,
+        "connections": accepted_connections
+    }
+
+@router.post("/api/connection/{connection_id}/accept")
+async def accept_connection(connection_id: str, current_user: dict = Depends(get_current_user)):
+    connection = connections_collection.find_one({"connection_id": connection_id})
+    if not connection or connection["target_id"] != current_user["user_id"]:
+        raise HTTPException(status_code=404, detail="Connection request not found")
+    
+    accepted = connections_collection.update_one(
+        {"connection_id": connection_id, "status": "pending"},
+        {"$set": {"status": "accepted", "accepted_at": datetime.utcnow()}}
+    )
+    
+    # Count each connection once, even if the accept is repeated
+    if accepted.modified_count:
+        requester_count = increment_connection_count(connection["requester_id"])
+        target_count = increment_connection_count(connection["target_id"])
+        register_connection(connection["requester_id"], requester_count, connection["target_id"], target_count)
+        record_change("connection", connection_id, "updated", ["status"])
+        enqueue_notifications([notification_event(
+            connection["requester_id"], "connection_accepted", f"{current_user['full_name']} accepted your connection request",
+            {"connection_id": connection_id, "user_id": current_user["user_id"]}
+        )])
+    
+    return {"message": "Connection accepted"}
+
+# Skill endorsement endpoints
+@router.post("/api/endorse")
+async def endorse_skill(endorsement: SkillEndorsement, current_user: dict = Depends(get_current_user)):
+    # Check if users are connected
+    connection = connections_collection.find_one({
+        "$or": [
+            {"requester_id": current_user["user_id"], "target_id": endorsement.user_id, "status": "accepted"},
+            {"requester_id": endorsement.user_id, "target_id": current_user["user_id"], "status": "accepted"}
+        ]
+    })
+    
+    if not connection:
+        raise HTTPException(status_code=403, detail="You can only endorse skills of connected users")
+    
+    # One endorsement per endorser, user and skill, enforced by a unique index
+    endorsement_id = str(uuid.uuid4())
+    endorsement_doc = {
+        "endorsement_id": endorsement_id,
+        "endorser_id": current_user["user_id"],
+        "user_id": endorsement.user_id,
+        "skill": endorsement.skill,
+        "endorsement_message": endorsement.endorsement_message,
+        "created_at": datetime.utcnow()
+    }
+    
+    def record_endorsement(session):
+        endorsements_collection.insert_one(endorsement_doc, session=session)
+        
+        # Maintain the per-user, per-skill aggregate
+        endorsement_counts_collection.update_one(
+            {"user_id": endorsement.user_id, "skill": endorsement.skill},
+            {
+                "$inc": {"count": 1},
+                "$set": {"last_endorsed_at": endorsement_doc["created_at"]}
+            },
+            upsert=True,
+            session=session
+        )
+        record_change("user", endorsement.user_id, "updated", ["endorsements"], session=session)
+    
+    try:
+        run_in_transaction(record_endorsement)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="You have already endorsed this skill")
+    
+    publish_activities([(
+        build_activity("endorsement_received", current_user["user_id"], current_user["full_name"], "skill",
+                       endorsement.skill, {"skill": endorsement.skill, "message": endorsement.endorsement_message}),
+        [endorsement.user_id]
+    )])
+    response_cache.invalidate(f"endorsements:{endorsement.user_id}")
+    
+    return {"message": "Skill endorsed successfully"}
+
+@router.get("/api/endorsements/{user_id}/summary")
+async def get_user_endorsement_summary(user_id: str, request: Request, limit: int = 10):
+    cache_key = response_cache.key(request)
+    cached_response = response_cache.lookup(request, cache_key)
+    if cached_response:
+        return cached_response
+    
+    skill_counts = list(endorsement_counts_collection.find(
+        {"user_id": user_id},
+        {"_id": 0, "skill": 1, "count": 1}
+    ).sort("count", -1))
+    
+    summary = {
+        "user_id": user_id,
+        "total_endorsements": sum(skill_count["count"] for skill_count in skill_counts),
+        "skill_count": len(skill_counts),
+        "top_skills": skill_counts[:limit]
+    }
+    return response_cache.store(request, cache_key, summary, tags=[f"endorsements:{user_id}"])
+
+@router.get("/api/endorsements/{user_id}")
+async def get_user_endorsements(user_id: str, request: Request, skip: int = 0, limit: int = 20,
+                                skill: Optional[str] = None):
+    cache_key = response_cache.key(request)
+    cached_response = response_cache.lookup(request, cache_key)
+    if cached_response:
+        return cached_response
+    
+    query = {"user_id": user_id}
+    if skill:
+        query["skill"] = skill
+    
+    endorsements_page = list(
+        endorsements_collection.find(query).sort("created_at", -1).skip(skip).limit(limit)
+    )
+    
+    # Hydrate all endorsers on the page with one query
+    endorsers = get_users_by_ids(endorsement["endorser_id"] for endorsement in endorsements_page)
+    
+    endorsements = []
+    for endorsement in endorsements_page:
+        endorser = endorsers.get(endorsement["endorser_id"])
+        endorsement_data = {
+            "endorsement_id": endorsement["endorsement_id"],
+            "skill": endorsement["skill"],
+            "endorsement_message": endorsement.get("endorsement_message", ""),
+            "endorser_name": endorser["full_name"] if endorser else "Unknown",
+            "endorser_country": endorser["country"] if endorser else "Unknown",
+            "created_at": endorsement["created_at"]
+        }
+        endorsements.append(endorsement_data)
+    
+    return response_cache.store(request, cache_key, {"endorsements": endorsements}, tags=[f"endorsements:{user_id}"])
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from datetime import datetime
+
+from database import notification_counters_collection, notifications_collection
+from models import NotificationReadRequest
+from auth import get_current_user
+from notifications import unread_count
+
+# Notification center
+router = APIRouter()
+
+MAX_NOTIFICATION_PAGE_SIZE = 50
+
+@router.get("/api/notifications")
+async def get_notifications(skip: int = 0, limit: int = 20, unread_only: bool = False, current_user: dict = Depends(get_current_user)):
+    if limit < 1 or limit > MAX_NOTIFICATION_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_NOTIFICATION_PAGE_SIZE}")
+    
+    query = {"user_id": current_user["user_id"]}
+    if unread_only:
+        query["read"] = False
+    notifications = list(
+        notifications_collection.find(query, {"_id": 0, "user_id": 0}).sort("updated_at", -1).skip(skip).limit(limit)
+    )
+    
+    return {
+        "notifications": notifications,
+        "unread_count": unread_count(current_user["user_id"])
+    }
+
+@router.get("/api/notifications/unread-count")
+async def get_unread_count(current_user: dict = Depends(get_current_user)):
+    return {"unread_count": unread_count(current_user["user_id"])}
+
+@router.post("/api/notifications/read")
+async def mark_notifications_read(request: NotificationReadRequest, current_user: dict = Depends(get_current_user)):
+    query = {"user_id": current_user["user_id"], "read": False}
+    if request.notification_ids is not None:
+        query["notification_id"] = {"$in": request.notification_ids}
+    
+    result = notifications_collection.update_many(query, {"$set": {"read": True, "read_at": datetime.utcnow()}})
+    if result.modified_count:
+        notification_counters_collection.update_one(
+            {"user_id": current_user["user_id"]},
+            {"$inc": {"unread": -result.modified_count}}
+        )
+    
+    return {"marked_read": result.modified_count}
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+
+from database import pool_metrics
+from auth import require_metrics_token
+from middleware import compression_stats, idempotency_stats, load_stats
+from caching import entity_caches, organization_directory, response_cache
+from notifications import notification_dispatcher
+from outbox import outbox_worker
+
+# Health and metrics
+router = APIRouter()
+
+@router.get("/api/health")
+async def health_check():
+    return {"status": "healthy", "service": "AfriCore API"}
+
+@router.get("/api/metrics", dependencies=[Depends(require_metrics_token)])
+async def get_metrics():
+    return {
+        "entity_caches": {name: cache.stats() for name, cache in entity_caches.items()},
+        "organization_directory": {"entries": len(organization_directory.by_id)},
+        "response_cache": response_cache.stats(),
+        "load": load_stats,
+        "idempotency": idempotency_stats,
+        "notifications": notification_dispatcher.stats,
+        "outbox": outbox_worker.status(),
+        # Pools are listed without their server addresses
+        "mongo_pool": list(pool_metrics.stats().values()),
+        "compression": {
+            route: {
+                **route_stats,
+                "compression_ratio": round(route_stats["bytes_in"] / route_stats["bytes_out"], 2) if route_stats["bytes_out"] else None
+            }
+            for route, route_stats in compression_stats.items()
+        }
+    }
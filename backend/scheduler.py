@@ -0,0 +1,159 @@
+from pymongo.errors import PyMongoError
+
+from datetime import datetime, timezone
+import asyncio
+import heapq
+import time
+import uuid
+from typing import List, Optional
+import logging
+
+from config import DEADLINE_BATCH_SIZE, DEADLINE_MAX_SLEEP_SECONDS, DEADLINE_RELOAD_SECONDS
+from database import jobs_collection, policies_collection, projects_collection
+from models import PolicyStatus, ProjectStatus
+from caching import invalidate_entity
+from feed import publish_policy_outcomes
+
+logger = logging.getLogger(__name__)
+
+# Deadline scheduler
+# Min-heap of upcoming job, project and policy deadlines, loaded at startup and
+# fed by the create endpoints. A background task sleeps until the next deadline
+# and expires everything that is due in batches, so expired rows drop out of
+# the active list queries. The heap is reloaded periodically to pick up
+# entities created by other workers; the updates are idempotent.
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def days_left(deadline: Optional[datetime]) -> int:
+    if not deadline:
+        return 0
+    return max((to_naive_utc(deadline) - datetime.utcnow()).days, 0)
+
+class DeadlineScheduler:
+    def __init__(self):
+        self.heap = []
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.loaded_at = 0.0
+    
+    def load(self):
+        heap = []
+        for job in jobs_collection.find({"active": True, "deadline": {"$ne": None}}, {"job_id": 1, "deadline": 1}):
+            heap.append((to_naive_utc(job["deadline"]), "job", job["job_id"]))
+        for project in projects_collection.find(
+            {"status": {"$in": ["pending_approval", "active", "funded"]}, "deadline": {"$ne": None}},
+            {"project_id": 1, "deadline": 1}
+        ):
+            heap.append((to_naive_utc(project["deadline"]), "project", project["project_id"]))
+        for policy in policies_collection.find(
+            {"status": "open_for_feedback", "feedback_deadline": {"$ne": None}},
+            {"policy_id": 1, "feedback_deadline": 1}
+        ):
+            heap.append((to_naive_utc(policy["feedback_deadline"]), "policy", policy["policy_id"]))
+        
+        heapq.heapify(heap)
+        self.heap = heap
+        self.loaded_at = time.monotonic()
+        logger.info(f"Deadline scheduler loaded {len(heap)} upcoming deadlines")
+    
+    def schedule(self, kind: str, entity_id: str, deadline: Optional[datetime]):
+        if deadline is None:
+            return
+        entry = (to_naive_utc(deadline), kind, entity_id)
+        heapq.heappush(self.heap, entry)
+        if self.heap[0] == entry:
+            self.wakeup.set()
+    
+    def start(self):
+        self.load()
+        self.task = asyncio.create_task(self.run())
+    
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+    
+    async def run(self):
+        while True:
+            try:
+                if time.monotonic() - self.loaded_at > DEADLINE_RELOAD_SECONDS:
+                    self.load()
+                self.expire_due()
+            except PyMongoError as e:
+                logger.error(f"Deadline scheduler failed: {e}")
+            
+            timeout = DEADLINE_MAX_SLEEP_SECONDS
+            if self.heap:
+                timeout = min(timeout, max((self.heap[0][0] - datetime.utcnow()).total_seconds(), 0))
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    def expire_due(self):
+        now = datetime.utcnow()
+        due = {}
+        while self.heap and self.heap[0][0] <= now:
+            _, kind, entity_id = heapq.heappop(self.heap)
+            due.setdefault(kind, set()).add(entity_id)
+        
+        for kind, entity_ids in due.items():
+            entity_ids = list(entity_ids)
+            for start in range(0, len(entity_ids), DEADLINE_BATCH_SIZE):
+                batch = entity_ids[start:start + DEADLINE_BATCH_SIZE]
+                self.expire(kind, batch, now)
+                for entity_id in batch:
+                    invalidate_entity(kind, entity_id)
+    
+    @staticmethod
+    def expire(kind: str, entity_ids: List[str], now: datetime):
+        if kind == "job":
+            jobs_collection.update_many(
+                {"job_id": {"$in": entity_ids}, "active": True, "deadline": {"$lte": now}},
+                {"$set": {"active": False, "expired_at": now, "updated_at": now}}
+            )
+        elif kind == "project":
+            due = {"project_id": {"$in": entity_ids}, "deadline": {"$lte": now}}
+            # Never approved, or a fixed goal that was not reached: cancel
+            projects_collection.update_many(
+                {**due, "status": "pending_approval"},
+                {"$set": {"status": ProjectStatus.CANCELLED, "updated_at": now}}
+            )
+            projects_collection.update_many(
+                {
+                    **due,
+                    "status": "active",
+                    "funding_goal_type": "fixed",
+                    "$expr": {"$lt": ["$current_funding", "$funding_goal"]}
+                },
+                {"$set": {"status": ProjectStatus.CANCELLED, "updated_at": now}}
+            )
+            # Flexible goals keep what they raised, and reached fixed goals stop
+            # taking contributions: either way the funding window is closed
+            projects_collection.update_many(
+                {**due, "status": {"$in": ["active", "funded"]}},
+                {"$set": {"status": ProjectStatus.CLOSED, "updated_at": now}}
+            )
+        elif kind == "policy":
+            # Tag the rows this batch closed, so exactly those get an outcome
+            # activity even when several workers expire the same deadlines
+            expiry_batch_id = str(uuid.uuid4())
+            policies_collection.update_many(
+                {"policy_id": {"$in": entity_ids}, "status": "open_for_feedback", "feedback_deadline": {"$lte": now}},
+                {"$set": {
+                    "status": PolicyStatus.UNDER_REVIEW,
+                    "feedback_closed": True,
+                    "expiry_batch_id": expiry_batch_id,
+                    "updated_at": now
+                }}
+            )
+            publish_policy_outcomes(list(policies_collection.find({"expiry_batch_id": expiry_batch_id})))
+
+deadline_scheduler = DeadlineScheduler()
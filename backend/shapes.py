@@ -0,0 +1,92 @@
+from fastapi import HTTPException
+
+from typing import List, Optional
+
+# Response shapes
+# Declares the fields a list endpoint returns: stored fields with their
+# defaults, plus computed fields and the stored fields they are derived from.
+# Mongo is asked only for what the selected fields need, and clients can pass
+# ?fields=a,b,c for a sparse fieldset.
+class ResponseShape:
+    def __init__(self, id_field: str, fields: dict, computed: Optional[dict] = None):
+        self.id_field = id_field
+        self.fields = {id_field: None, **fields}
+        self.computed = computed or {}
+    
+    def select(self, fields: Optional[str]) -> List[str]:
+        if not fields:
+            return list(self.fields) + list(self.computed)
+        
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in self.fields and field not in self.computed]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return [self.id_field] + [field for field in requested if field != self.id_field]
+    
+    def projection(self, selected: List[str]) -> dict:
+        projection = {"_id": 0}
+        for field in selected:
+            for source in self.computed.get(field, [field]):
+                projection[source] = 1
+        return projection
+    
+    def render(self, doc: dict, selected: List[str]) -> dict:
+        return {field: doc.get(field, self.fields[field]) for field in selected if field in self.fields}
+
+USER_CARD_SHAPE = ResponseShape("user_id", {
+    "full_name": "",
+    "country": "",
+    "age": None,
+    "bio": "",
+    "skills": [],
+    "interests": [],
+    "education": "",
+    "goals": "",
+    "current_projects": "",
+    "languages": [],
+    "work_experience": "",
+    "portfolio_url": "",
+    "availability": "",
+    "profile_image": ""
+})
+
+JOB_CARD_SHAPE = ResponseShape("job_id", {
+    "title": "",
+    "description": "",
+    "requirements": [],
+    "job_type": None,
+    "job_category": None,
+    "location_type": None,
+    "location": "",
+    "salary_range": "",
+    "deadline": None,
+    "skills_required": [],
+    "experience_level": "",
+    "benefits": "",
+    "created_at": None
+}, computed={
+    "organization_name": ["organization_id"],
+    "organization_type": ["organization_id"]
+})
+
+PROJECT_CARD_SHAPE = ResponseShape("project_id", {
+    "title": "",
+    "description": "",
+    "category": None,
+    "funding_goal": 0.0,
+    "current_funding": 0.0,
+    "funding_percentage": 0.0,
+    "contributor_count": 0,
+    "duration_months": 0,
+    "location": "",
+    "impact_description": "",
+    "images": [],
+    "status": None,
+    "featured": False,
+    "created_at": None,
+    "deadline": None
+}, computed={
+    "creator_name": ["creator_id", "creator_name"],
+    "creator_country": ["creator_id", "creator_country"],
+    "days_left": ["deadline"]
+})
@@ -0,0 +1,122 @@
+from pymongo.errors import DuplicateKeyError
+
+import copy
+
+# In-memory stand-in for the handful of collection methods the units under
+# test call. Filters support equality plus the operators those call sites use.
+def matches(document: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+        elif field == "$expr":
+            if not evaluate_expr(document, condition):
+                return False
+        elif not matches_condition(document.get(field), field in document, condition):
+            return False
+    return True
+
+def matches_condition(value, present: bool, condition) -> bool:
+    if not isinstance(condition, dict) or not any(key.startswith("$") for key in condition):
+        return present and value == condition
+    for operator, operand in condition.items():
+        if operator == "$in":
+            if not present or value not in operand:
+                return False
+        elif operator == "$ne":
+            if value == operand:
+                return False
+        elif operator == "$exists":
+            if present != operand:
+                return False
+        elif operator == "$not":
+            if matches_condition(value, present, operand):
+                return False
+        elif operator in ("$lt", "$lte", "$gt", "$gte"):
+            if not present or value is None or not compare(operator, value, operand):
+                return False
+        else:
+            raise NotImplementedError(operator)
+    return True
+
+def compare(operator: str, left, right) -> bool:
+    return {
+        "$lt": left < right,
+        "$lte": left <= right,
+        "$gt": left > right,
+        "$gte": left >= right
+    }[operator]
+
+def evaluate_expr(document: dict, expression: dict) -> bool:
+    operator, operands = next(iter(expression.items()))
+    left, right = [
+        document.get(operand[1:]) if isinstance(operand, str) and operand.startswith("$") else operand
+        for operand in operands
+    ]
+    return compare(operator, left, right)
+
+class Result:
+    def __init__(self, matched_count: int = 0, modified_count: int = 0, deleted_count: int = 0, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.deleted_count = deleted_count
+        self.upserted_id = upserted_id
+
+class FakeCollection:
+    def __init__(self, documents=(), unique=()):
+        self.documents = [copy.deepcopy(document) for document in documents]
+        self.unique = tuple(unique)
+    
+    def insert_one(self, document: dict):
+        if self.unique and any(all(existing.get(field) == document.get(field) for field in self.unique) for existing in self.documents):
+            raise DuplicateKeyError("E11000 duplicate key error")
+        self.documents.append(copy.deepcopy(document))
+    
+    def find(self, query: dict = None, projection: dict = None):
+        return [copy.deepcopy(document) for document in self.documents if matches(document, query or {})]
+    
+    def find_one(self, query: dict = None, projection: dict = None):
+        found = self.find(query)
+        return found[0] if found else None
+    
+    def find_one_and_update(self, query: dict, update: dict):
+        for document in self.documents:
+            if matches(document, query):
+                before = copy.deepcopy(document)
+                self.apply(document, update)
+                return before
+        return None
+    
+    def update_one(self, query: dict, update: dict):
+        for document in self.documents:
+            if matches(document, query):
+                self.apply(document, update)
+                return Result(matched_count=1, modified_count=1)
+        return Result()
+    
+    def update_many(self, query: dict, update: dict):
+        matched = [document for document in self.documents if matches(document, query)]
+        for document in matched:
+            self.apply(document, update)
+        return Result(matched_count=len(matched), modified_count=len(matched))
+    
+    def delete_one(self, query: dict):
+        for index, document in enumerate(self.documents):
+            if matches(document, query):
+                del self.documents[index]
+                return Result(deleted_count=1)
+        return Result()
+    
+    @staticmethod
+    def apply(document: dict, update: dict):
+        for operator, fields in update.items():
+            if operator == "$set":
+                document.update(copy.deepcopy(fields))
+            elif operator == "$unset":
+                for field in fields:
+                    document.pop(field, None)
+            elif operator == "$inc":
+                for field, amount in fields.items():
+                    document[field] = document.get(field, 0) + amount
+            else:
+                raise NotImplementedError(operator)
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("fastapi")
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+
+from starlette.requests import Request
+import asyncio
+import gzip
+
+from middleware import CompressionMiddleware, decoded_etag, encoded_etag
+from caching import ResponseCache
+
+ETAG = '"abc123"'
+BODY = b'{"items": "' + b"x" * 4096 + b'"}'
+
+def request(headers: dict = None):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/api/jobs/1",
+        "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    })
+
+def get(app, accept_encoding: str):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/api/jobs/1",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())]
+    }
+    sent = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(app(scope, receive, send))
+    return dict(sent[0]["headers"]), b"".join(message.get("body", b"") for message in sent[1:])
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(BODY)).encode()),
+        (b"etag", ETAG.encode())
+    ]})
+    await send({"type": "http.response.body", "body": BODY})
+
+def test_encoded_etag_round_trips():
+    assert encoded_etag(ETAG, "gzip") == '"abc123-gzip"'
+    assert decoded_etag(encoded_etag(ETAG, "br")) == ETAG
+    assert decoded_etag(ETAG) == ETAG
+
+def test_compressed_body_gets_its_own_etag():
+    app = CompressionMiddleware(endpoint, stats={})
+    
+    headers, body = get(app, "gzip")
+    
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"etag"] == b'"abc123-gzip"'
+    assert gzip.decompress(body) == BODY
+
+def test_uncompressed_body_keeps_the_etag():
+    app = CompressionMiddleware(endpoint, stats={})
+    
+    headers, body = get(app, "identity")
+    
+    assert headers[b"etag"] == ETAG.encode()
+    assert body == BODY
+
+def test_response_cache_revalidates_an_encoded_etag():
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    key = ("/api/jobs/1", (), None)
+    etag = cache.store(request(), key, {"job": 1}, tags=["job:1"]).headers["etag"]
+    
+    revalidated = cache.lookup(request({"If-None-Match": encoded_etag(etag, "gzip")}), key)
+    
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == encoded_etag(etag, "gzip")
+    assert cache.lookup(request({"If-None-Match": '"other-gzip"'}), key).status_code == 200
@@ -0,0 +1,152 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("fastapi")
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+
+from datetime import datetime, timedelta
+import asyncio
+import json
+
+import middleware
+from middleware import IdempotencyMiddleware
+from tests.fake_mongo import FakeCollection
+
+class Endpoint:
+    def __init__(self, status: int = 201):
+        self.status = status
+        self.calls = 0
+    
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        message = await receive()
+        body = json.dumps({"call": self.calls, "echo": message["body"].decode()}).encode()
+        await send({"type": "http.response.start", "status": self.status, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+def post(app, body: bytes = b'{"title": "x"}', key: str = "key-1"):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/jobs",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode()), (b"content-type", b"application/json")],
+        "client": ("203.0.113.7", 50000)
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+    
+    async def send(message):
+        sent.append(message)
+    
+    asyncio.run(app(scope, receive, send))
+    start = sent[0]
+    return start["status"], dict(start["headers"]), b"".join(message.get("body", b"") for message in sent[1:])
+
+@pytest.fixture
+def keys(monkeypatch):
+    collection = FakeCollection(unique=("key", "caller", "path"))
+    monkeypatch.setattr(middleware, "idempotency_keys_collection", collection)
+    return collection
+
+def test_completed_response_is_replayed(keys):
+    endpoint = Endpoint()
+    app = IdempotencyMiddleware(endpoint, stats={})
+    
+    first = post(app)
+    replayed = post(app)
+    
+    assert endpoint.calls == 1
+    assert keys.documents[0]["state"] == "completed"
+    assert replayed[0] == first[0] == 201
+    assert replayed[2] == first[2]
+    assert replayed[1][b"idempotent-replayed"] == b"true"
+    assert app.stats["claimed"] == 1 and app.stats["replayed"] == 1
+
+def test_reused_key_with_a_different_body_is_rejected(keys):
+    endpoint = Endpoint()
+    app = IdempotencyMiddleware(endpoint, stats={})
+    
+    post(app)
+    status, _, _ = post(app, body=b'{"title": "y"}')
+    
+    assert status == 422
+    assert endpoint.calls == 1
+
+def test_retry_of_a_live_claim_for_the_same_request_conflicts(keys):
+    endpoint = Endpoint()
+    app = IdempotencyMiddleware(endpoint, stats={})
+    post(app)
+    keys.documents[0]["state"] = "in_progress"
+    keys.documents[0]["lease_expires_at"] = datetime.utcnow() + timedelta(seconds=60)
+    
+    status, headers, _ = post(app)
+    
+    assert status == 409
+    assert headers[b"retry-after"] == b"1"
+    assert endpoint.calls == 1
+
+@pytest.mark.parametrize("status", [500, 503, 408, 409, 429])
+def test_failed_or_retryable_response_releases_the_key(keys, status):
+    endpoint = Endpoint(status)
+    app = IdempotencyMiddleware(endpoint, stats={})
+    
+    assert post(app)[0] == status
+    assert keys.documents == []
+    
+    endpoint.status = 201
+    assert post(app)[0] == 201
+    assert endpoint.calls == 2
+    assert keys.documents[0]["state"] == "completed"
+
+def test_client_error_is_stored(keys):
+    endpoint = Endpoint(400)
+    app = IdempotencyMiddleware(endpoint, stats={})
+    
+    post(app)
+    status, _, _ = post(app)
+    
+    assert status == 400
+    assert endpoint.calls == 1
+
+def test_exception_releases_the_key(keys):
+    async def failing(scope, receive, send):
+        raise RuntimeError("boom")
+    app = IdempotencyMiddleware(failing, stats={})
+    
+    with pytest.raises(RuntimeError):
+        post(app)
+    assert keys.documents == []
+    assert app.stats["released"] == 1
+
+def test_abandoned_claim_is_taken_over(keys):
+    endpoint = Endpoint()
+    app = IdempotencyMiddleware(endpoint, stats={})
+    post(app)
+    abandoned = keys.documents[0]
+    abandoned.update({"state": "in_progress", "claim_id": "dead-worker", "lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+    
+    status, headers, _ = post(app)
+    
+    assert status == 201
+    assert b"idempotent-replayed" not in headers
+    assert endpoint.calls == 2
+    assert app.stats["taken_over"] == 1
+    assert keys.documents[0]["state"] == "completed"
+    assert keys.documents[0]["claim_id"] != "dead-worker"
+
+def test_superseded_claim_can_no_longer_release_the_key(keys):
+    app = IdempotencyMiddleware(Endpoint(), stats={})
+    record_id = {"key": "key-1", "caller": "ip:203.0.113.7", "path": "/api/jobs"}
+    stale_claim = app.claim(record_id, "hash")
+    keys.documents[0]["lease_expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+    current_claim = app.claim(record_id, "hash")
+    
+    app.release(stale_claim)
+    
+    assert current_claim["claim_id"] != stale_claim["claim_id"]
+    assert keys.documents[0]["claim_id"] == current_claim["claim_id"]
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("fastapi")
+pytest.importorskip("pydantic")
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+
+from fastapi import HTTPException
+
+from routers.jobs import MAX_BULK_JOBS, read_job_import_rows, validate_job_import_row
+
+HEADER = "title,description,requirements,job_type,job_category,location_type,location,skills_required\n"
+VALID = "Engineer,Build things,Python;SQL,full_time,technology,remote,Lagos,Python\n"
+
+def test_csv_row_with_extra_cells_is_reported_invalid():
+    rows = read_job_import_rows((HEADER + VALID + "Analyst,Crunch numbers,Excel,full_time,technology,remote,Accra,Excel,EXTRA\n").encode(), "text/csv")
+    
+    job, invalid = validate_job_import_row(0, rows[0])
+    assert invalid is None
+    assert job.requirements == ["Python", "SQL"]
+    
+    job, invalid = validate_job_import_row(1, rows[1])
+    assert job is None
+    assert invalid["status"] == "invalid"
+    assert invalid["row"] == 1
+    assert "Line 3" in invalid["errors"][0]["message"]
+
+def test_json_row_that_is_not_an_object_is_reported_invalid():
+    rows = read_job_import_rows(b'["not a job"]', "application/json")
+    
+    job, invalid = validate_job_import_row(0, rows[0])
+    assert job is None
+    assert invalid["status"] == "invalid"
+
+def test_oversized_import_is_rejected_before_validation():
+    with pytest.raises(HTTPException) as error:
+        read_job_import_rows((HEADER + VALID * (MAX_BULK_JOBS + 1)).encode(), "text/csv")
+    assert error.value.status_code == 400
+
+def test_non_utf8_csv_is_rejected():
+    with pytest.raises(HTTPException) as error:
+        read_job_import_rows(HEADER.encode() + b"\xff\xfe\n", "text/csv")
+    assert error.value.status_code == 400
@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("starlette")
+
+from datetime import datetime, timedelta
+
+from config import OUTBOX_GAP_TIMEOUT_SECONDS
+from outbox import OutboxWorker, changed_ids
+
+def change(seq: int, age_seconds: float = 0, entity: str = "project", entity_id: str = "p1", operation: str = "updated", fields=()):
+    return {
+        "seq": seq,
+        "entity": entity,
+        "entity_id": entity_id,
+        "operation": operation,
+        "fields": list(fields),
+        "sequenced_at": datetime.utcnow() - timedelta(seconds=age_seconds)
+    }
+
+def test_contiguous_returns_an_unbroken_run():
+    worker = OutboxWorker()
+    changes = [change(4), change(5), change(6)]
+    
+    assert worker.contiguous(3, changes) == changes
+    assert worker.stats["skipped_seqs"] == 0
+
+def test_contiguous_stops_at_a_recent_hole():
+    worker = OutboxWorker()
+    changes = [change(4), change(5), change(8)]
+    
+    assert worker.contiguous(3, changes) == changes[:2]
+    assert worker.stats["skipped_seqs"] == 0
+
+def test_contiguous_waits_for_a_hole_right_after_the_checkpoint():
+    worker = OutboxWorker()
+    
+    assert worker.contiguous(3, [change(5), change(6)]) == []
+
+def test_contiguous_skips_a_hole_older_than_the_gap_timeout():
+    worker = OutboxWorker()
+    stale = OUTBOX_GAP_TIMEOUT_SECONDS + 1
+    changes = [change(4, stale), change(7, stale), change(8)]
+    
+    assert worker.contiguous(3, changes) == changes
+    assert worker.stats["skipped_seqs"] == 2
+
+def test_contiguous_skips_old_holes_but_stops_at_a_newer_one():
+    worker = OutboxWorker()
+    stale = OUTBOX_GAP_TIMEOUT_SECONDS + 1
+    changes = [change(5, stale), change(6, stale), change(9)]
+    
+    assert worker.contiguous(3, changes) == changes[:2]
+    assert worker.stats["skipped_seqs"] == 1
+
+def test_changed_ids_filters_updates_by_field():
+    changes = [
+        change(1, entity_id="p1", fields=["title"]),
+        change(2, entity_id="p2", fields=["current_funding"]),
+        change(3, entity_id="p3", operation="created"),
+        change(4, entity="user", entity_id="u1", fields=["title"])
+    ]
+    
+    assert sorted(changed_ids(changes, "project", ["title"])) == ["p1", "p3"]
+    assert sorted(changed_ids(changes, "project")) == ["p1", "p2", "p3"]
@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("fastapi")
+pytest.importorskip("pydantic")
+
+from datetime import datetime, timedelta
+
+import scheduler
+from scheduler import DeadlineScheduler
+from tests.fake_mongo import FakeCollection
+
+NOW = datetime(2026, 10, 19, 12, 0)
+PAST = NOW - timedelta(hours=1)
+FUTURE = NOW + timedelta(hours=1)
+
+def project(project_id: str, status: str, deadline: datetime = PAST, goal_type: str = "fixed", current: float = 0, goal: float = 1000):
+    return {
+        "project_id": project_id,
+        "status": status,
+        "deadline": deadline,
+        "funding_goal_type": goal_type,
+        "current_funding": current,
+        "funding_goal": goal
+    }
+
+def statuses(collection: FakeCollection, id_field: str) -> dict:
+    return {document[id_field]: document["status"] for document in collection.documents}
+
+@pytest.fixture
+def projects(monkeypatch):
+    collection = FakeCollection([
+        project("pending", "pending_approval"),
+        project("short", "active", current=400),
+        project("reached", "active", current=1000),
+        project("funded", "funded", current=1200),
+        project("flexible", "active", goal_type="flexible", current=50),
+        project("not_due", "active", deadline=FUTURE),
+        project("completed", "completed")
+    ])
+    monkeypatch.setattr(scheduler, "projects_collection", collection)
+    return collection
+
+def test_expire_projects_cancels_or_closes_by_outcome(projects):
+    DeadlineScheduler.expire("project", [document["project_id"] for document in projects.documents], NOW)
+    
+    assert statuses(projects, "project_id") == {
+        "pending": "cancelled",
+        "short": "cancelled",
+        "reached": "closed",
+        "funded": "closed",
+        "flexible": "closed",
+        "not_due": "active",
+        "completed": "completed"
+    }
+
+def test_expire_projects_only_touches_the_batch(projects):
+    DeadlineScheduler.expire("project", ["short"], NOW)
+    
+    assert statuses(projects, "project_id")["short"] == "cancelled"
+    assert statuses(projects, "project_id")["reached"] == "active"
+
+def test_expire_projects_is_idempotent(projects):
+    DeadlineScheduler.expire("project", ["reached", "short"], NOW)
+    DeadlineScheduler.expire("project", ["reached", "short"], NOW)
+    
+    assert statuses(projects, "project_id")["reached"] == "closed"
+    assert statuses(projects, "project_id")["short"] == "cancelled"
+
+def test_expire_jobs_deactivates_due_jobs(monkeypatch):
+    jobs = FakeCollection([
+        {"job_id": "due", "active": True, "deadline": PAST},
+        {"job_id": "later", "active": True, "deadline": FUTURE}
+    ])
+    monkeypatch.setattr(scheduler, "jobs_collection", jobs)
+    
+    DeadlineScheduler.expire("job", ["due", "later"], NOW)
+    
+    assert {document["job_id"]: document["active"] for document in jobs.documents} == {"due": False, "later": True}
+    assert jobs.documents[0]["expired_at"] == NOW
+
+def test_expire_policies_publishes_outcomes_once(monkeypatch):
+    policies = FakeCollection([
+        {"policy_id": "due", "status": "open_for_feedback", "feedback_deadline": PAST},
+        {"policy_id": "later", "status": "open_for_feedback", "feedback_deadline": FUTURE}
+    ])
+    published = []
+    monkeypatch.setattr(scheduler, "policies_collection", policies)
+    monkeypatch.setattr(scheduler, "publish_policy_outcomes", lambda closed: published.append([policy["policy_id"] for policy in closed]))
+    
+    DeadlineScheduler.expire("policy", ["due", "later"], NOW)
+    DeadlineScheduler.expire("policy", ["due", "later"], NOW)
+    
+    assert statuses(policies, "policy_id") == {"due": "under_review", "later": "open_for_feedback"}
+    assert published == [["due"], []]